@@ -0,0 +1,75 @@
+"""
+요청마다 AsyncIOMotorClient 를 새로 만드는 방식과 공유 커넥션 풀 방식의 지연 시간 비교 벤치마크
+
+실행 (MONGODB_USERNAME, MONGODB_PASSWORD, MONGODB_HOST 환경 변수 필요):
+    python -m app.benchmark.database_pool --requests 2000 --concurrency 50
+"""
+import json
+import time
+import asyncio
+import argparse
+from app.microweather.database import Database
+from app.benchmark.stats import summarize
+
+QUERIES_PER_REQUEST = 5  # WeatherService.get_weather 의 asyncio.gather 분기 수
+
+
+async def _query(database: Database) -> None:
+    await database.nowcast.find_one({"nx": 60, "ny": 127}, sort=[("tm", -1)])
+
+
+async def _per_query_client() -> None:
+    """
+    기존 방식: 분기마다 클라이언트를 생성하고 종료
+    """
+    async def branch() -> None:
+        async with Database() as database:
+            await _query(database)
+
+    await asyncio.gather(*(branch() for _ in range(QUERIES_PER_REQUEST)))
+
+
+async def _pooled_client(database: Database) -> None:
+    """
+    변경 방식: 하나의 커넥션 풀을 공유
+    """
+    await asyncio.gather(*(_query(database) for _ in range(QUERIES_PER_REQUEST)))
+
+
+async def _run(mode: str, requests: int, concurrency: int) -> dict:
+    semaphore: asyncio.Semaphore = asyncio.Semaphore(concurrency)
+    samples: list[float] = []
+    database: Database | None = Database() if mode == "pooled" else None
+
+    async def one() -> None:
+        async with semaphore:
+            start: float = time.perf_counter()
+            if database is None:
+                await _per_query_client()
+            else:
+                await _pooled_client(database)
+            samples.append(time.perf_counter() - start)
+
+    started: float = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed: float = time.perf_counter() - started
+    if database is not None:
+        database.close()
+    return summarize(samples, elapsed)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    result: dict = {
+        mode: await _run(mode, args.requests, args.concurrency)
+        for mode in ("per_query", "pooled")
+    }
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,96 @@
+"""
+응답 직렬화·압축 단계의 요청당 CPU 시간 비교 (모델 검증 + JSON 직렬화 + GZipMiddleware 방식 vs 미리 인코딩한 조각 연결)
+
+실행:
+    python -m app.benchmark.encoding --requests 20000 --cells 500
+"""
+import io
+import json
+import gzip
+import time
+import brotli
+import argparse
+import numpy as np
+from datetime import datetime, timedelta
+from fastapi.encoders import jsonable_encoder
+from app.microweather.encoding import ResponseEncoder
+from app.microweather.models import WeatherModel, NowcastModel, ForecastModel, ParticulateMatterModel
+
+
+def _cell_data(cells: int, seed: int = 0) -> list[tuple[dict, NowcastModel, list[ForecastModel], ParticulateMatterModel]]:
+    rng: np.random.Generator = np.random.default_rng(seed)
+    tm: datetime = datetime.now().replace(minute=0, second=0, microsecond=0)
+    data: list = []
+    for index in range(cells):
+        grid_coord: dict = {"grid_x": 1 + index % 149, "grid_y": 1 + index // 149}
+        nowcast: NowcastModel = NowcastModel(datetime=tm, PTY=0, REH=float(rng.integers(20, 95)), RN1=0, T1H=float(rng.normal(15, 8)))
+        forecast: list[ForecastModel] = [
+            ForecastModel(datetime=tm + timedelta(hours=hour), LGT=0, PTY=0, RN1=0, SKY=float(rng.integers(1, 5)), T1H=float(rng.normal(15, 8)))
+            for hour in range(1, 7)
+        ]
+        particulate_matter: ParticulateMatterModel = ParticulateMatterModel(
+            datetime=tm, station_name=f"측정소{index % 600}", pm10Value=int(rng.integers(5, 120)), pm10Grade=2,
+            pm25Value=int(rng.integers(3, 80)), pm25Grade=2,
+        )
+        data.append((grid_coord, nowcast, forecast, particulate_matter))
+    return data
+
+
+def _legacy(address: str, is_sunrise: bool, nowcast: NowcastModel, forecast: list[ForecastModel], particulate_matter: ParticulateMatterModel, encoding: str) -> bytes:
+    """
+    기존 방식: WeatherModel 생성·검증, FastAPI 기본 직렬화, 응답마다 압축 (GZipMiddleware compresslevel=9)
+    """
+    model: WeatherModel = WeatherModel(
+        address=address, is_sunrise=is_sunrise, nowcast=nowcast, forecast=forecast, particulate_matter=particulate_matter
+    )
+    body: bytes = json.dumps(jsonable_encoder(model), ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+    if encoding == "gzip":
+        buffer: io.BytesIO = io.BytesIO()
+        with gzip.GzipFile(mode="wb", fileobj=buffer, compresslevel=9) as file:
+            file.write(body)
+        return buffer.getvalue()
+    if encoding == "br":
+        return brotli.compress(body, quality=9)
+    return body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--cells", type=int, default=500)
+    parser.add_argument("--addresses-per-cell", type=int, default=3)
+    args = parser.parse_args()
+
+    data: list = _cell_data(args.cells)
+    rng: np.random.Generator = np.random.default_rng(1)
+    picks: np.ndarray = rng.integers(0, args.cells, args.requests)
+    address_picks: np.ndarray = rng.integers(0, args.addresses_per_cell, args.requests)
+    results: dict = {}
+
+    for encoding in ("identity", "gzip", "br"):
+        response_encoder: ResponseEncoder = ResponseEncoder()
+        row: dict = {}
+        for name in ("legacy", "encoded"):
+            size: int = 0
+            start: float = time.process_time()
+            for pick, address_pick in zip(picks.tolist(), address_picks.tolist()):
+                grid_coord, nowcast, forecast, particulate_matter = data[pick]
+                address: str = f"동 {pick}-{address_pick}"
+                if name == "legacy":
+                    body: bytes = _legacy(address, True, nowcast, forecast, particulate_matter, encoding)
+                else:
+                    body = response_encoder.encode_weather(
+                        address=address, is_sunrise=True, grid_coord=grid_coord, nowcast=nowcast,
+                        forecast=forecast, particulate_matter=particulate_matter, encoding=encoding,
+                    )
+                size += len(body)
+            elapsed: float = time.process_time() - start
+            row[name] = {"cpu_us_per_request": elapsed / args.requests * 1e6, "mean_bytes": size / args.requests}
+        row["speedup"] = row["legacy"]["cpu_us_per_request"] / row["encoded"]["cpu_us_per_request"]
+        results[encoding] = row
+
+    print(json.dumps({"parameters": vars(args), "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
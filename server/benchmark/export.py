@@ -0,0 +1,78 @@
+"""
+지도 화면 영역 격자 값 조회 비교: 격자마다 초단기실황·예보 조회 vs 경계 상자 일괄 내보내기(JSON, 바이너리)
+
+모두 같은 격자 파일(gridfile.py)을 읽으므로 MongoDB 조회 비용은 포함하지 않음 (격자마다 조회하는 경로의 하한)
+
+실행:
+    python -m app.benchmark.export
+"""
+import os
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import numpy as np
+from datetime import datetime, timedelta
+from app.microweather import export
+from app.microweather.database import Database
+from app.microweather.gridfile import GridFile
+from app.microweather.service import WeatherService
+from app.microweather.snapshot import GridFileWriter
+from app.benchmark.fake_database import FakeMongoClient, seed
+
+VIEWPORTS: dict[str, tuple[float, float, float, float]] = {
+    "seoul": (37.42, 126.76, 37.70, 127.18),
+    "capital_area": (36.9, 126.0, 38.3, 127.9),
+    "country": (33.0, 124.5, 38.7, 131.0),
+}
+
+
+async def _per_cell(database: Database, grid_file: GridFile, grid_x_range: tuple[int, int], grid_y_range: tuple[int, int]) -> float:
+    start: float = time.perf_counter()
+    for grid_x in range(grid_x_range[0], grid_x_range[1] + 1):
+        for grid_y in range(grid_y_range[0], grid_y_range[1] + 1):
+            service: WeatherService = WeatherService(
+                database=database, latitude=37.5666, longitude=126.9784,
+                grid_coord={"grid_x": grid_x, "grid_y": grid_y}, grid_file=grid_file,
+            )
+            await service.run_stage("nowcast")
+            await service.run_stage("forecast")
+    return time.perf_counter() - start
+
+
+def _export(grid_file: GridFile, grid_x_range: tuple[int, int], grid_y_range: tuple[int, int], output_format: str) -> dict:
+    start: float = time.perf_counter()
+    grid_export: export.GridExport = export.GridExport(
+        grid_file, grid_x_range, grid_y_range, export.parse_export_fields(export.DEFAULT_EXPORT_FIELDS)
+    )
+    chunks: list[bytes] = list(grid_export.iter_binary() if output_format == "binary" else grid_export.iter_json())
+    return {"ms": (time.perf_counter() - start) * 1000, "bytes": sum(len(chunk) for chunk in chunks), "chunks": len(chunks)}
+
+
+async def run() -> dict:
+    database: Database = Database(client=FakeMongoClient())
+    await seed(database, hours=1, now=datetime.now() + timedelta(hours=1))
+    results: dict = {}
+    with tempfile.TemporaryDirectory() as directory:
+        path: str = os.path.join(directory, "grid.npy")
+        await GridFileWriter(database, path).refresh()
+        grid_file: GridFile = GridFile(path)
+        for name, bounding_box in VIEWPORTS.items():
+            grid_x_range, grid_y_range = export.to_grid_range(*bounding_box)
+            results[name] = {
+                "cells": int(np.prod([grid_x_range[1] - grid_x_range[0] + 1, grid_y_range[1] - grid_y_range[0] + 1])),
+                "per_cell_ms": await _per_cell(database, grid_file, grid_x_range, grid_y_range) * 1000,
+                "json": _export(grid_file, grid_x_range, grid_y_range, "json"),
+                "binary": _export(grid_file, grid_x_range, grid_y_range, "binary"),
+            }
+    return results
+
+
+def main() -> None:
+    argparse.ArgumentParser().parse_args()
+    print(json.dumps(asyncio.run(run()), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,473 @@
+"""
+벤치마크용 메모리 MongoDB 대체 구현
+
+WeatherService, 인덱스/뷰 로딩에서 사용하는 Motor API 일부만 구현
+(find/find_one/aggregate/insert_many/count/distinct/delete_many/replace_one/bulk_write(UpdateOne), $in/$nin/$ne/$gt(e)/$lt(e)/$or/$geoIntersects/$near, $sort/$group/$match/$limit/$project, 시간별 요약 조회용 집계 식 일부)
+"""
+import bson
+import math
+import asyncio
+import hashlib
+import shapely
+import numpy as np
+from typing import Any
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.results import BulkWriteResult, DeleteResult, UpdateResult
+from datetime import datetime, timedelta
+from app.microweather import grid
+from app.microweather.database import Database
+
+
+def _get(document: dict, path: str) -> Any:
+    value: Any = document
+    for key in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def _evaluate(expression: Any, document: dict, variables: dict | None = None) -> Any:
+    variables = variables or {}
+    if expression == "$$ROOT":
+        return document
+    if isinstance(expression, str) and expression.startswith("$$"):
+        return variables[expression[2:]]
+    if isinstance(expression, str) and expression.startswith("$"):
+        return _get(document, expression[1:])
+    if isinstance(expression, list):
+        return [_evaluate(item, document, variables) for item in expression]
+    if isinstance(expression, dict) and len(expression) == 1 and next(iter(expression)) in _OPERATORS:
+        (operator, argument), = expression.items()
+        return _OPERATORS[operator](argument, document, variables)
+    if isinstance(expression, dict):
+        return {key: _evaluate(value, document, variables) for key, value in expression.items()}
+    return expression
+
+
+def _compare(argument: list, document: dict, variables: dict, compare) -> bool:
+    left, right = _evaluate(argument, document, variables)
+    return compare(left, right)
+
+
+def _index_of_array(argument: list, document: dict, variables: dict) -> int:
+    array, value, *bounds = _evaluate(argument, document, variables)
+    start: int = bounds[0] if bounds else 0
+    return next((index for index in range(start, len(array or [])) if array[index] == value), -1)
+
+
+def _array_elem_at(argument: list, document: dict, variables: dict) -> Any:
+    array, index = _evaluate(argument, document, variables)
+    return array[index] if array is not None and -len(array) <= index < len(array) else None
+
+
+# 집계 식 연산자 (이력 조회의 시간별 요약 격자 값 추출에 필요한 것만)
+_OPERATORS: dict[str, Any] = {
+    "$let": lambda argument, document, variables: _evaluate(
+        argument["in"], document, variables | {name: _evaluate(value, document, variables) for name, value in argument["vars"].items()}
+    ),
+    "$cond": lambda argument, document, variables: _evaluate(
+        argument[1] if _evaluate(argument[0], document, variables) else argument[2], document, variables
+    ),
+    "$and": lambda argument, document, variables: all(_evaluate(item, document, variables) for item in argument),
+    "$eq": lambda argument, document, variables: _compare(argument, document, variables, lambda left, right: left == right),
+    "$gte": lambda argument, document, variables: _compare(argument, document, variables, lambda left, right: left >= right),
+    "$max": lambda argument, document, variables: max(_evaluate(argument, document, variables)),
+    "$indexOfArray": _index_of_array,
+    "$arrayElemAt": _array_elem_at,
+}
+
+
+def _distance(coordinates: list[float], point: list[float]) -> float:
+    longitude_1, latitude_1 = map(math.radians, coordinates)
+    longitude_2, latitude_2 = map(math.radians, point)
+    return (
+        math.sin((latitude_2 - latitude_1) / 2) ** 2
+        + math.cos(latitude_1) * math.cos(latitude_2) * math.sin((longitude_2 - longitude_1) / 2) ** 2
+    )
+
+
+def _sort_key(value: Any) -> tuple:
+    return (value is not None, value if value is not None else 0)
+
+
+class FakeCursor:
+    def __init__(self, documents: list[dict], latency: float) -> None:
+        self.documents: list[dict] = documents
+        self.latency: float = latency
+
+    async def to_list(self, length: int | None = None) -> list[dict]:
+        await asyncio.sleep(self.latency)
+        return self.documents if length is None else self.documents[:length]
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        await asyncio.sleep(self.latency)
+        for document in self.documents:
+            yield document
+
+
+class FakeCollection:
+    def __init__(self, name: str, latency: float = 0.0, index_fields: tuple[str, ...] = ()) -> None:
+        """
+        :param name: str
+        :param latency: float 연산마다 추가할 지연 시간(초), 네트워크 왕복 시간 흉내
+        :param index_fields: tuple[str, ...] 동등 조건 조회를 빠르게 하기 위한 해시 인덱스 필드
+        """
+        self.name: str = name
+        self.latency: float = latency
+        self.index_fields: tuple[str, ...] = index_fields
+        self.documents: list[dict] = []
+        self.reads: int = 0  # find/find_one/aggregate 호출 수 (요청당 DB 왕복 수 측정용)
+        self._index: dict[tuple, list[dict]] = {}
+        self._shapes: dict[ObjectId, shapely.Geometry] = {}
+
+    async def insert_many(self, documents: list[dict]) -> None:
+        for document in documents:
+            document.setdefault("_id", ObjectId())
+            self.documents.append(document)
+            if self.index_fields:
+                self._index.setdefault(tuple(document.get(field) for field in self.index_fields), []).append(document)
+
+    async def insert_one(self, document: dict) -> None:
+        await self.insert_many([document])
+
+    async def distinct(self, key: str, filter: dict | None = None) -> list:
+        await asyncio.sleep(self.latency)
+        values: list = []
+        for document in self._filter(filter):
+            value: Any = _get(document, key)
+            if value not in values:
+                values.append(value)
+        return values
+
+    async def delete_many(self, filter: dict) -> DeleteResult:
+        await asyncio.sleep(self.latency)
+        deleted: list[dict] = self._filter(filter)
+        deleted_ids: set[ObjectId] = {document["_id"] for document in deleted}
+        self.documents = [document for document in self.documents if document["_id"] not in deleted_ids]
+        for key, documents in list(self._index.items()):
+            self._index[key] = [document for document in documents if document["_id"] not in deleted_ids]
+        return DeleteResult({"n": len(deleted)}, acknowledged=True)
+
+    async def replace_one(self, filter: dict, replacement: dict, upsert: bool = False) -> UpdateResult:
+        await asyncio.sleep(self.latency)
+        matched: list[dict] = self._filter(filter)[:1]
+        if matched:
+            replacement["_id"] = matched[0]["_id"]
+            await self.delete_many({"_id": matched[0]["_id"]})
+        elif not upsert:
+            return UpdateResult({"n": 0, "nModified": 0}, acknowledged=True)
+        await self.insert_one(replacement)
+        return UpdateResult({"n": 1, "nModified": len(matched)}, acknowledged=True)
+
+    async def bulk_write(self, operations: list[UpdateOne], ordered: bool = True) -> BulkWriteResult:
+        await asyncio.sleep(self.latency)
+        upserted: int = 0
+        modified: int = 0
+        for operation in operations:
+            matched: list[dict] = self._filter(operation._filter)[:1]
+            if matched:
+                matched[0].update(operation._doc["$set"])
+                modified += 1
+            elif operation._upsert:
+                await self.insert_one({**operation._filter, **operation._doc["$set"]})
+                upserted += 1
+        return BulkWriteResult(
+            {"nUpserted": upserted, "nModified": modified, "nMatched": modified, "upserted": [None] * upserted}, acknowledged=True
+        )
+
+    async def estimated_document_count(self) -> int:
+        return len(self.documents)
+
+    async def count_documents(self, filter: dict) -> int:
+        return len(self._filter(filter))
+
+    def _candidates(self, filter: dict) -> list[dict]:
+        if self.index_fields and all(field in filter for field in self.index_fields):
+            values: list = [filter[field] for field in self.index_fields]
+            if all(not isinstance(value, dict) for value in values):
+                return self._index.get(tuple(values), [])
+            if len(values) == 1 and isinstance(values[0], dict) and list(values[0]) == ["$in"]:
+                return [document for value in values[0]["$in"] for document in self._index.get((value,), [])]
+        if self.index_fields and list(filter) == ["$or"] and all(
+            all(field in sub_filter and not isinstance(sub_filter[field], dict) for field in self.index_fields)
+            for sub_filter in filter["$or"]
+        ):
+            # 분기마다 인덱스를 사용하는 MongoDB 와 같이 동등 조건 분기의 인덱스 키만 조회
+            keys: dict[tuple, None] = dict.fromkeys(tuple(sub_filter[field] for field in self.index_fields) for sub_filter in filter["$or"])
+            return [document for key in keys for document in self._index.get(key, [])]
+        return self.documents
+
+    def _contains(self, document: dict, field: str, point: list[float]) -> bool:
+        shape: shapely.Geometry | None = self._shapes.get(document["_id"])
+        if shape is None:
+            shape = shapely.geometry.shape(_get(document, field))
+            shapely.prepare(shape)
+            self._shapes[document["_id"]] = shape
+        return shape.intersects(shapely.Point(point))
+
+    def _match(self, document: dict, filter: dict) -> bool:
+        for key, condition in filter.items():
+            if key == "$or":
+                if not any(self._match(document, sub_filter) for sub_filter in condition):
+                    return False
+                continue
+            value: Any = _get(document, key)
+            if isinstance(condition, dict) and condition and all(operator.startswith("$") for operator in condition):
+                for operator, argument in condition.items():
+                    if operator == "$in" and value not in argument:
+                        return False
+                    if operator == "$nin" and value in argument:
+                        return False
+                    if operator == "$ne" and value == argument:
+                        return False
+                    if operator in ("$gt", "$gte", "$lt", "$lte") and value is None:
+                        return False
+                    if operator == "$gt" and not value > argument:
+                        return False
+                    if operator == "$gte" and not value >= argument:
+                        return False
+                    if operator == "$lt" and not value < argument:
+                        return False
+                    if operator == "$lte" and not value <= argument:
+                        return False
+                    if operator == "$geoIntersects" and not self._contains(document, key, argument["$geometry"]["coordinates"]):
+                        return False
+            elif value != condition:
+                return False
+        return True
+
+    def _filter(self, filter: dict | None) -> list[dict]:
+        filter = filter or {}
+        documents: list[dict] = [document for document in self._candidates(filter) if self._match(document, filter)]
+        for key, condition in filter.items():
+            if isinstance(condition, dict) and "$near" in condition:
+                point: list[float] = condition["$near"]["$geometry"]["coordinates"]
+                documents.sort(key=lambda document: _distance(_get(document, key)["coordinates"], point))
+        return documents
+
+    @staticmethod
+    def _sort(documents: list[dict], sort: list[tuple[str, int]] | dict | None) -> list[dict]:
+        items: list[tuple[str, int]] = list(sort.items()) if isinstance(sort, dict) else list(sort or [])
+        for key, direction in reversed(items):
+            documents = sorted(documents, key=lambda document: _sort_key(_get(document, key)), reverse=direction < 0)
+        return documents
+
+    @staticmethod
+    def _project(document: dict, projection: dict | None) -> dict:
+        if not projection:
+            return document
+        included: list[str] = [key for key, value in projection.items() if value and key != "_id"]
+        if included:
+            result: dict = {key: document[key] for key in included if key in document}
+            if projection.get("_id", 1):
+                result["_id"] = document["_id"]
+            return result
+        return {key: value for key, value in document.items() if projection.get(key, 1)}
+
+    def find(self, filter: dict | None = None, projection: dict | None = None, sort: list | None = None, **kwargs) -> FakeCursor:
+        self.reads += 1
+        documents: list[dict] = self._sort(self._filter(filter), sort)
+        return FakeCursor([self._project(document, projection) for document in documents], self.latency)
+
+    async def find_one(self, filter: dict | None = None, projection: dict | None = None, sort: list | None = None, **kwargs) -> dict | None:
+        documents: list[dict] = await self.find(filter, projection=projection, sort=sort).to_list(length=1)
+        return documents[0] if documents else None
+
+    def aggregate(self, pipeline: list[dict], **kwargs) -> FakeCursor:
+        self.reads += 1
+        documents: list[dict] = self.documents
+        for stage in pipeline:
+            (operator, argument), = stage.items()
+            if operator == "$match":
+                documents = self._filter(argument) if documents is self.documents else [
+                    document for document in documents if self._match(document, argument)
+                ]
+            elif operator == "$sort":
+                documents = self._sort(documents, argument)
+            elif operator == "$limit":
+                documents = documents[:argument]
+            elif operator == "$group":
+                documents = self._group(documents, argument)
+            elif operator == "$project":
+                documents = [self._project_expression(document, argument) for document in documents]
+            else:
+                raise NotImplementedError(operator)
+        return FakeCursor(list(documents), self.latency)
+
+    @staticmethod
+    def _project_expression(document: dict, projection: dict) -> dict:
+        result: dict = {"_id": document["_id"]} if projection.get("_id", 1) else {}
+        for key, value in projection.items():
+            if key == "_id":
+                continue
+            if value == 1 or value is True:
+                if key in document:
+                    result[key] = document[key]
+            else:
+                result[key] = _evaluate(value, document)
+        return result
+
+    @staticmethod
+    def _group(documents: list[dict], specification: dict) -> list[dict]:
+        groups: dict[str, dict] = {}
+        values: dict[str, dict[str, list]] = {}
+        for document in documents:
+            key: Any = _evaluate(specification["_id"], document)
+            hashable: str = repr(key)
+            if hashable not in groups:
+                groups[hashable] = {"_id": key}
+                values[hashable] = {field: [] for field in specification if field != "_id"}
+            for field, accumulator in specification.items():
+                if field != "_id":
+                    (_, expression), = accumulator.items()
+                    values[hashable][field].append(_evaluate(expression, document))
+
+        for hashable, group in groups.items():
+            for field, accumulator in specification.items():
+                if field == "_id":
+                    continue
+                (operator, _), = accumulator.items()
+                items: list = values[hashable][field]
+                present: list = [item for item in items if item is not None]
+                group[field] = {
+                    "$first": lambda: items[0],
+                    "$last": lambda: items[-1],
+                    "$max": lambda: max(present) if present else None,
+                    "$min": lambda: min(present) if present else None,
+                    "$sum": lambda: sum(present),
+                    "$avg": lambda: sum(present) / len(present) if present else None,
+                    "$push": lambda: items,
+                }[operator]()
+        return list(groups.values())
+
+
+class FakeMongoDatabase:
+    def __init__(self, latency: float) -> None:
+        self.latency: float = latency
+        self.collections: dict[str, FakeCollection] = {}
+
+    async def command(self, name: str, *args, **kwargs) -> dict:
+        await asyncio.sleep(self.latency)
+        if name == "dbHash":
+            hashes: dict[str, str] = {}
+            for collection_name in kwargs.get("collections", list(self.collections)):
+                documents: list[dict] = sorted(self[collection_name].documents, key=lambda document: document["_id"])
+                hashes[collection_name] = hashlib.md5(b"".join(bson.encode(document) for document in documents)).hexdigest()
+            return {"collections": hashes, "ok": 1.0}
+        return {"ok": 1.0}
+
+    def __getitem__(self, name: str) -> FakeCollection:
+        if name not in self.collections:
+            index_fields: tuple[str, ...] = {
+                "nowcast": ("nx", "ny"),
+                "forecast": ("nx", "ny"),
+                "pm_data": ("station_name",),
+                "snapshot": ("nx", "ny"),
+                "nowcast_archive": ("nx", "ny"),
+            }.get(name, ())
+            self.collections[name] = FakeCollection(name, latency=self.latency, index_fields=index_fields)
+        return self.collections[name]
+
+
+class FakeMongoClient:
+    def __init__(self, latency: float = 0.0) -> None:
+        """
+        AsyncIOMotorClient 대신 Database(client=...) 에 전달하는 메모리 클라이언트
+        :param latency: float 연산마다 추가할 지연 시간(초)
+        """
+        self.databases: dict[str, FakeMongoDatabase] = {}
+        self.latency: float = latency
+
+    def __getitem__(self, name: str) -> FakeMongoDatabase:
+        if name not in self.databases:
+            self.databases[name] = FakeMongoDatabase(self.latency)
+        return self.databases[name]
+
+    def close(self) -> None:
+        pass
+
+
+async def seed(
+    database: Database,
+    hours: int = 3,
+    pm_hours: int = 24,
+    stations: int = 600,
+    now: datetime | None = None,
+    seed: int = 0,
+) -> None:
+    """
+    전체 격자의 초단기실황/예보, 읍면동 폴리곤(격자 단위 사각형), 측정소와 측정 데이터를 생성하는 함수
+    :param database: Database (FakeMongoClient 로 생성)
+    :param hours: int 격자별로 저장할 과거 초단기실황 발표 수 (초단기예보는 최대 3)
+    :param pm_hours: int 측정소별로 저장할 과거 측정 데이터 수
+    :param stations: int 측정소 수
+    :param now: datetime 기준 시각
+    :param seed: int 난수 시드
+    """
+    rng: np.random.Generator = np.random.default_rng(seed)
+    now = now or datetime.now()
+    latest: datetime = now.replace(minute=0, second=0, microsecond=0) - timedelta(hours=1)
+    cells: list[tuple[int, int]] = [(x, y) for x in range(1, grid.GRID_NX + 1) for y in range(1, grid.GRID_NY + 1)]
+
+    nowcasts: list[dict] = []
+    forecasts: list[dict] = []
+    for hour in range(hours):
+        tm: datetime = latest - timedelta(hours=hour)
+        for grid_x, grid_y in cells:
+            nowcasts.append({
+                "nx": grid_x, "ny": grid_y, "tm": tm,
+                "PTY": 0.0, "REH": float(rng.integers(20, 100)), "RN1": 0.0, "T1H": float(rng.normal(15, 8)),
+            })
+        if hour < min(hours, 3):
+            for grid_x, grid_y in cells:
+                forecasts.append({
+                    "nx": grid_x, "ny": grid_y, "tm": tm,
+                    "items": [
+                        {"effective_time": tm + timedelta(hours=step), "LGT": 0.0, "PTY": 0.0, "RN1": 0.0, "SKY": 1.0, "T1H": 15.0}
+                        for step in range(1, 7)
+                    ],
+                })
+    await database.nowcast.insert_many(nowcasts)
+    await database.forecast.insert_many(forecasts)
+
+    # 읍면동 폴리곤: 격자 4x4 묶음마다 위경도 사각형 하나
+    locations: list[dict] = []
+    for latitude in np.arange(33.0, 38.6, 0.2):
+        for longitude in np.arange(124.5, 132.0, 0.2):
+            ring: list[list[float]] = [
+                [longitude, latitude], [longitude + 0.2, latitude], [longitude + 0.2, latitude + 0.2],
+                [longitude, latitude + 0.2], [longitude, latitude],
+            ]
+            locations.append({
+                "location": f"동 {latitude:.1f} {longitude:.1f}",
+                "geometry": {"type": "Polygon", "coordinates": [[[float(x), float(y)] for x, y in ring]]},
+            })
+    await database.location.insert_many(locations)
+
+    station_latitudes: np.ndarray = rng.uniform(33.1, 38.45, stations)
+    station_longitudes: np.ndarray = rng.uniform(125.07, 131.87, stations)
+    await database.pm_station.insert_many([
+        {
+            "station_name": f"측정소{index}",
+            "geometry": {"type": "Point", "coordinates": [float(station_longitudes[index]), float(station_latitudes[index])]},
+        }
+        for index in range(stations)
+    ])
+    await database.pm_data.insert_many([
+        {
+            "station_name": f"측정소{index}",
+            "tm": latest - timedelta(hours=hour),
+            "dataTime": latest - timedelta(hours=hour),
+            "pm10Value": None if rng.random() < 0.1 else int(rng.integers(5, 150)),
+            "pm10Grade1h": int(rng.integers(1, 5)),
+            "pm25Value": None if rng.random() < 0.1 else int(rng.integers(2, 80)),
+            "pm25Grade1h": int(rng.integers(1, 5)),
+        }
+        for index in range(stations)
+        for hour in range(pm_hours)
+    ])
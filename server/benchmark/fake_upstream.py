@@ -0,0 +1,134 @@
+"""
+기상청 동네예보 / 에어코리아 API 대체 서버 (httpx.MockTransport 핸들러, 네트워크 없이 수집·직접 조회 경로 실행용)
+
+getUltraSrtNcst/getUltraSrtFcst/getCtprvnRltmMesureDnsty/getMsrstnList 의 JSON 응답 형식과 pageNo/numOfRows/totalCount 페이지 나눔,
+5xx 응답·비정상 resultCode·읽기 시간 초과·응답 지연을 재현
+"""
+import json
+import random
+import asyncio
+import httpx
+from collections import Counter
+from datetime import datetime, timedelta
+
+
+class FakeUpstream:
+    def __init__(
+        self,
+        stations: int = 1500,
+        failures: int = 0,
+        timeouts: int = 0,
+        result_code: str = "00",
+        latency: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        """
+        :param stations: int 측정소 수 (에어코리아 목록 API 의 totalCount)
+        :param failures: int 처음 failures 번 요청은 500 응답 (timeouts 이후부터 셈)
+        :param timeouts: int 처음 timeouts 번 요청은 httpx.ReadTimeout
+        :param result_code: str 응답 resultCode ("00" 이 아니면 모든 요청이 비정상 응답 코드)
+        :param latency: float 응답마다 추가할 지연 시간(초)
+        :param seed: int 관측·예보 값 난수 시드
+        """
+        self.stations: int = stations
+        self.failures: int = failures
+        self.timeouts: int = timeouts
+        self.result_code: str = result_code
+        self.latency: float = latency
+        self.seed: int = seed
+        self.calls: int = 0
+        self.requests: Counter[str] = Counter()
+
+    def client(self, timeout: float = 10.0) -> httpx.AsyncClient:
+        """
+        대체 서버로 요청을 보내는 HTTP 클라이언트 (IngestionService.create_client 대신 사용)
+        """
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handle), timeout=timeout)
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        operation: str = request.url.path.rsplit("/", 1)[-1]
+        self.requests[operation] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.calls <= self.timeouts:
+            raise httpx.ReadTimeout("대체 서버 읽기 시간 초과", request=request)
+        if self.calls <= self.timeouts + self.failures:
+            return httpx.Response(500, text="Internal Server Error")
+
+        params: dict[str, str] = dict(request.url.params)
+        if self.result_code != "00":
+            return self._response({}, result_code=self.result_code)
+        if operation == "getUltraSrtNcst":
+            return self._response(self._kma_body(self._nowcast_items(params)))
+        if operation == "getUltraSrtFcst":
+            return self._response(self._kma_body(self._forecast_items(params)))
+        if operation == "getCtprvnRltmMesureDnsty":
+            return self._response(self._page(self._pm_item, params))
+        if operation == "getMsrstnList":
+            return self._response(self._page(self._station_item, params))
+        return httpx.Response(404, text="Not Found")
+
+    @staticmethod
+    def _response(body: dict, result_code: str = "00") -> httpx.Response:
+        header: dict = {"resultCode": result_code, "resultMsg": "NORMAL_SERVICE" if result_code == "00" else "ERROR"}
+        return httpx.Response(200, content=json.dumps({"response": {"header": header, "body": body}}, ensure_ascii=False).encode())
+
+    @staticmethod
+    def _kma_body(items: list[dict]) -> dict:
+        return {"dataType": "JSON", "items": {"item": items}, "pageNo": 1, "numOfRows": len(items), "totalCount": len(items)}
+
+    def _page(self, make_item, params: dict[str, str]) -> dict:
+        page_no: int = int(params.get("pageNo", "1"))
+        num_of_rows: int = int(params.get("numOfRows", "10"))
+        indexes: range = range((page_no - 1) * num_of_rows, min(page_no * num_of_rows, self.stations))
+        return {"items": [make_item(index) for index in indexes], "pageNo": page_no, "numOfRows": num_of_rows, "totalCount": self.stations}
+
+    def _rng(self, *key) -> random.Random:
+        return random.Random(repr((self.seed,) + key))
+
+    def _nowcast_items(self, params: dict[str, str]) -> list[dict]:
+        rng: random.Random = self._rng(params["nx"], params["ny"], params["base_date"], params["base_time"])
+        values: dict[str, str] = {
+            "PTY": "0", "REH": str(rng.randrange(20, 100)), "RN1": "강수없음", "T1H": f"{rng.gauss(15, 8):.1f}", "WSD": f"{rng.uniform(0, 10):.1f}",
+        }
+        return [
+            {"baseDate": params["base_date"], "baseTime": params["base_time"], "category": category, "nx": int(params["nx"]),
+             "ny": int(params["ny"]), "obsrValue": value}
+            for category, value in values.items()
+        ]
+
+    def _forecast_items(self, params: dict[str, str]) -> list[dict]:
+        rng: random.Random = self._rng(params["nx"], params["ny"], params["base_date"], params["base_time"], "forecast")
+        base_time: datetime = datetime.strptime(params["base_date"] + params["base_time"], "%Y%m%d%H%M")
+        items: list[dict] = []
+        for hour in range(1, 7):
+            effective_time: datetime = base_time.replace(minute=0) + timedelta(hours=hour)
+            values: dict[str, str] = {
+                "LGT": "0", "PTY": "0", "RN1": "강수없음", "SKY": str(rng.choice((1, 3, 4))), "T1H": str(rng.randrange(0, 30)), "REH": "60",
+            }
+            items.extend(
+                {"baseDate": params["base_date"], "baseTime": params["base_time"], "category": category,
+                 "fcstDate": effective_time.strftime("%Y%m%d"), "fcstTime": effective_time.strftime("%H%M"),
+                 "fcstValue": value, "nx": int(params["nx"]), "ny": int(params["ny"])}
+                for category, value in values.items()
+            )
+        return items
+
+    def _pm_item(self, index: int) -> dict:
+        rng: random.Random = self._rng(index, "pm")
+        data_time: datetime = datetime.now().replace(minute=0, second=0, microsecond=0)
+        # 일부 측정소는 점검 중("-") 으로 응답
+        pm10: str = "-" if index % 17 == 0 else str(rng.randrange(5, 120))
+        return {
+            "stationName": f"측정소{index}", "dataTime": data_time.strftime("%Y-%m-%d %H:%M"),
+            "pm10Value": pm10, "pm10Grade1h": "-" if pm10 == "-" else str(rng.randrange(1, 5)),
+            "pm25Value": str(rng.randrange(1, 80)), "pm25Grade1h": str(rng.randrange(1, 5)),
+        }
+
+    def _station_item(self, index: int) -> dict:
+        rng: random.Random = self._rng(index, "station")
+        return {
+            "stationName": f"측정소{index}", "addr": f"주소 {index}",
+            "dmX": f"{rng.uniform(33.2, 38.4):.6f}", "dmY": f"{rng.uniform(126.0, 129.5):.6f}",
+        }
@@ -0,0 +1,111 @@
+"""
+MongoDB 에 격자 데이터가 없을 때 기상청 API 직접 조회(fallback.py) 경로를 대체 API 서버(fake_upstream.py)로 실행
+
+- 정상: 없는 격자도 응답하고 조회한 문서를 저장해 다음 요청은 MongoDB 에서 처리하는지, 같은 격자 동시 요청은 API 를 한 번만 호출하는지
+- 재시도: 시간 초과 한 번 후 재시도로 응답하는지
+- 실패: 계속되는 시간 초과·5xx·비정상 resultCode 는 503, fallback 이 없으면 404 인지
+
+main.py 와 같은 재시도 설정(retries=1)을 사용하며, 기대한 결과와 다르면 종료 코드 1
+
+실행:
+    python -m app.benchmark.fallback
+"""
+import sys
+import json
+import asyncio
+import argparse
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+from app.microweather import sun
+from app.microweather.database import Database
+from app.microweather.fallback import UpstreamFallback
+from app.microweather.ingestion import IngestionService
+from app.microweather.service import WeatherService
+from app.benchmark.fake_database import FakeMongoClient, seed
+from app.benchmark.fake_upstream import FakeUpstream
+
+LATITUDE: float = 37.5666
+LONGITUDE: float = 126.9784
+
+
+async def _database() -> tuple[Database, tuple[int, int]]:
+    """
+    격자 하나의 초단기실황·예보만 비운 가짜 DB
+    """
+    database: Database = Database(client=FakeMongoClient())
+    await seed(database, hours=1, now=datetime.now() + timedelta(hours=1))
+    cell: tuple[int, int] = tuple(WeatherService.get_grid_coordinates(latitude=LATITUDE, longitude=LONGITUDE).values())
+    await database.nowcast.delete_many({"nx": cell[0], "ny": cell[1]})
+    await database.forecast.delete_many({"nx": cell[0], "ny": cell[1]})
+    return database, cell
+
+
+def _fallback(database: Database, upstream: FakeUpstream) -> UpstreamFallback:
+    return UpstreamFallback(IngestionService(
+        database=database, client=upstream.client(timeout=3), service_key="benchmark", concurrency=10, retries=1, backoff=0.01,
+    ))
+
+
+async def _request(database: Database, upstream_fallback: UpstreamFallback | None) -> int:
+    service: WeatherService = WeatherService(
+        database=database, latitude=LATITUDE, longitude=LONGITUDE, upstream_fallback=upstream_fallback
+    )
+    try:
+        await service.get_weather()
+    except HTTPException as e:
+        return e.status_code
+    return 200
+
+
+async def _success(concurrency: int) -> dict:
+    database, cell = await _database()
+    upstream: FakeUpstream = FakeUpstream(latency=0.05)
+    upstream_fallback: UpstreamFallback = _fallback(database, upstream)
+    statuses: list[int] = await asyncio.gather(*(_request(database, upstream_fallback) for _ in range(concurrency)))
+    first_calls: int = upstream.calls
+    stored: int = await database.nowcast.count_documents({"nx": cell[0], "ny": cell[1]})
+    again: int = await _request(database, upstream_fallback)
+    return {
+        "statuses": sorted(set(statuses)),
+        "upstream_calls": first_calls,
+        "stored_nowcast": stored,
+        "upstream_calls_after_stored": upstream.calls - first_calls,
+        "fallback": upstream_fallback.stats(),
+        "ok": set(statuses) == {200} and first_calls == 2 and stored == 1 and again == 200 and upstream.calls == first_calls,
+    }
+
+
+async def _status(upstream: FakeUpstream | None, expected: int) -> dict:
+    database, _ = await _database()
+    status: int = await _request(database, _fallback(database, upstream) if upstream is not None else None)
+    return {"status": status, "upstream_calls": upstream.calls if upstream is not None else 0, "ok": status == expected}
+
+
+async def run(concurrency: int) -> dict:
+    return {
+        "success": await _success(concurrency),
+        "retry_after_timeout": await _status(FakeUpstream(timeouts=1), 200),
+        "timeout": await _status(FakeUpstream(timeouts=10 ** 6), 503),
+        "server_error": await _status(FakeUpstream(failures=10 ** 6), 503),
+        "result_code": await _status(FakeUpstream(result_code="03"), 503),
+        "disabled": await _status(None, 404),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=20, help="같은 격자 동시 요청 수")
+    args = parser.parse_args()
+
+    async def start() -> dict:
+        await sun.build_table(datetime.now().date())
+        return await run(args.concurrency)
+
+    results: dict = asyncio.run(start())
+    print(json.dumps({"parameters": vars(args)} | results, indent=2, default=str))
+    if not all(result["ok"] for result in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
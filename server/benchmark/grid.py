@@ -0,0 +1,122 @@
+"""
+위경도 -> 기상청 격자 변환 마이크로벤치마크 (1 ~ 1,000,000 지점)
+측정 전에 임의 지점에서 to_grid / to_grid_batch 결과가 기존 convertCoordToGrid (기상청 참조 공식) 와 같은지 확인
+
+실행:
+    python -m app.benchmark.grid --samples 100000
+"""
+import sys
+import json
+import math
+import time
+import argparse
+import numpy as np
+from app.microweather import grid
+
+SIZES: tuple[int, ...] = (1, 10, 100, 1_000, 10_000, 100_000, 1_000_000)
+SCALAR_LIMIT: int = 100_000  # 이보다 큰 입력은 스칼라 반복 측정을 생략
+
+
+def _reference_to_grid(latitude: float, longitude: float) -> tuple[int, int]:
+    """
+    기존 old_server/apps/location.py 의 convertCoordToGrid 를 그대로 옮긴 기준 구현 (호출마다 투영 상수를 다시 계산)
+    """
+    degree: float = math.pi / 180.0
+    re: float = 6371.00877 / 5.0
+    slat1: float = 30.0 * degree
+    slat2: float = 60.0 * degree
+    olon: float = 126.0 * degree
+    olat: float = 38.0 * degree
+
+    sn: float = math.tan(math.pi * 0.25 + slat2 * 0.5) / math.tan(math.pi * 0.25 + slat1 * 0.5)
+    sn = math.log(math.cos(slat1) / math.cos(slat2)) / math.log(sn)
+    sf: float = math.tan(math.pi * 0.25 + slat1 * 0.5)
+    sf = (math.pow(sf, sn) * math.cos(slat1)) / sn
+    ro: float = math.tan(math.pi * 0.25 + olat * 0.5)
+    ro = (re * sf) / math.pow(ro, sn)
+
+    ra: float = math.tan(math.pi * 0.25 + latitude * degree * 0.5)
+    ra = (re * sf) / math.pow(ra, sn)
+    theta: float = longitude * degree - olon
+    if theta > math.pi:
+        theta -= 2.0 * math.pi
+    if theta < -math.pi:
+        theta += 2.0 * math.pi
+    theta *= sn
+    return math.floor(ra * math.sin(theta) + 43 + 0.5), math.floor(ro - ra * math.cos(theta) + 136 + 0.5)
+
+
+def _check(rng: np.random.Generator, samples: int) -> dict:
+    """
+    서비스 영역(격자 범위를 조금 넘는 위경도 포함) 임의 지점에서 to_grid, to_grid_batch 와 기준 구현의 결과를 비교
+    """
+    latitudes: np.ndarray = rng.uniform(32.0, 39.5, samples)
+    longitudes: np.ndarray = rng.uniform(124.0, 132.5, samples)
+    expected: list[tuple[int, int]] = [_reference_to_grid(latitude, longitude) for latitude, longitude in zip(latitudes.tolist(), longitudes.tolist())]
+    scalar: list[tuple[int, int]] = [grid.to_grid(latitude, longitude) for latitude, longitude in zip(latitudes.tolist(), longitudes.tolist())]
+    batch_x, batch_y = grid.to_grid_batch(latitudes, longitudes)
+    batch: list[tuple[int, int]] = list(zip(batch_x.tolist(), batch_y.tolist()))
+    return {
+        "samples": samples,
+        "scalar_mismatches": sum(a != b for a, b in zip(scalar, expected)),
+        "batch_mismatches": sum(a != b for a, b in zip(batch, expected)),
+    }
+
+
+def _legacy_transformer(latitude: float, longitude: float) -> tuple[int, int]:
+    """
+    기존 방식: 요청마다 pyproj Transformer 를 생성
+    """
+    from pyproj import Proj, Transformer
+    params: dict = {"proj": "lcc", "lat_1": 30.0, "lat_2": 60.0, "lat_0": 38.0, "lon_0": 126.0, "datum": "WGS84", "units": "m"}
+    x_meters, y_meters = Transformer.from_proj("EPSG:4326", Proj(params), always_xy=True).transform(longitude, latitude)
+    return int((x_meters / 5000) + 43), int((y_meters / 5000) + 136)
+
+
+def _measure(function, repeat: int = 3) -> float:
+    best: float = float("inf")
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--samples", type=int, default=100_000)
+    args = parser.parse_args()
+
+    rng: np.random.Generator = np.random.default_rng(0)
+    check: dict = _check(rng, args.samples)
+    if check["scalar_mismatches"] or check["batch_mismatches"]:
+        print(json.dumps({"check": check}, indent=2))
+        sys.exit(1)
+
+    results: list[dict] = []
+
+    try:
+        import pyproj  # noqa: F401
+        legacy_seconds: float | None = _measure(lambda: [_legacy_transformer(37.5665, 126.978) for _ in range(100)]) / 100
+    except ImportError:
+        legacy_seconds = None
+
+    for size in SIZES:
+        latitudes: np.ndarray = rng.uniform(33.1, 38.45, size)
+        longitudes: np.ndarray = rng.uniform(125.06666667, 131.87222222, size)
+        row: dict = {"points": size}
+
+        if size <= SCALAR_LIMIT:
+            pairs: list[tuple[float, float]] = list(zip(latitudes.tolist(), longitudes.tolist()))
+            row["scalar_s"] = _measure(lambda: [grid.to_grid(latitude, longitude) for latitude, longitude in pairs])
+        row["batch_s"] = _measure(lambda: grid.to_grid_batch(latitudes, longitudes))
+        if legacy_seconds is not None:
+            row["legacy_transformer_s_estimated"] = legacy_seconds * size
+        row["batch_points_per_s"] = size / row["batch_s"] if row["batch_s"] > 0 else None
+        results.append(row)
+
+    print(json.dumps({"check": check, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+격자 데이터(초단기실황·예보) 조회 경로 비교: MongoDB 조회 vs 워커 간 공유 메모리 매핑 격자 파일
+
+워커를 여러 개 띄우면 프로세스별 격자 캐시는 워커마다 따로 채워지므로, 캐시가 비어 있는 워커의 조회 경로(MongoDB)와
+수집 프로세스가 쓴 격자 파일 조회 경로를 비교함 (가짜 DB 의 연산마다 --latency 초를 더함)
+
+실행:
+    python -m app.benchmark.gridfile --requests 2000 --latency 0.001
+"""
+import os
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+from app.microweather import grid
+from app.microweather.database import Database
+from app.microweather.gridfile import GridFile
+from app.microweather.service import WeatherService
+from app.microweather.snapshot import GridFileWriter
+from app.benchmark.stats import summarize
+from app.benchmark.suite import _coordinates
+from app.benchmark.fake_database import FakeMongoClient, seed
+
+
+async def _bench(database: Database, grid_file: GridFile | None, cells: list[tuple[int, int]]) -> dict:
+    samples: list[float] = []
+    started: float = time.perf_counter()
+    for grid_x, grid_y in cells:
+        service: WeatherService = WeatherService(
+            database=database, latitude=37.5666, longitude=126.9784,
+            grid_coord={"grid_x": grid_x, "grid_y": grid_y}, grid_file=grid_file,
+        )
+        start: float = time.perf_counter()
+        await asyncio.gather(service.run_stage("nowcast"), service.run_stage("forecast"))
+        samples.append(time.perf_counter() - start)
+    return summarize(samples, time.perf_counter() - started)
+
+
+async def run(requests: int, latency: float) -> dict:
+    database: Database = Database(client=FakeMongoClient(latency=latency))
+    # 최신 발표분으로 판단되도록 현재 정시 발표분까지 생성
+    await seed(database, hours=3, now=datetime.now() + timedelta(hours=1))
+    cells: list[tuple[int, int]] = [grid.to_grid(latitude=latitude, longitude=longitude) for latitude, longitude in _coordinates(requests)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path: str = os.path.join(directory, "grid.npy")
+        written: dict = await GridFileWriter(database, path).refresh()
+        grid_file: GridFile = GridFile(path)
+        result: dict = {
+            "grid_file_write": written | {"bytes": os.path.getsize(path)},
+            "mongodb": await _bench(database, None, cells),
+            "grid_file": await _bench(database, grid_file, cells),
+        }
+        result["grid_file_stats"] = grid_file.stats()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.001)
+    args = parser.parse_args()
+    print(json.dumps({"parameters": vars(args)} | asyncio.run(run(args.requests, args.latency)), indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
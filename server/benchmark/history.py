@@ -0,0 +1,97 @@
+"""
+격자 하나의 긴 기간 초단기실황 이력 조회 비교: 시각별 문서 to_list vs 날짜별 열 단위 보관 문서 스트리밍
+
+두 경로 모두 같은 NDJSON 본문을 끝까지 만들며, 조회 시간과 tracemalloc 최대 메모리, 읽은 문서 수, 보관 문서 크기를 비교
+가짜 DB 는 격자 (nx, ny) 해시 인덱스 뒤에서 필터·정렬하므로 문서 수가 조회 비용에 그대로 드러남
+
+실행:
+    python -m app.benchmark.history --days 90 --cells 20
+"""
+import json
+import time
+import random
+import asyncio
+import argparse
+import tracemalloc
+from datetime import date, datetime, timedelta
+from app.microweather import history
+from app.microweather.database import Database
+from app.microweather.ingestion import NOWCAST_CATEGORIES
+from app.benchmark.fake_database import FakeMongoClient
+
+
+async def _to_list(database: Database, grid_x: int, grid_y: int, start: datetime, end: datetime) -> int:
+    documents: list[dict] = await database.nowcast.find(
+        {"nx": grid_x, "ny": grid_y, "tm": {"$gte": start, "$lt": end}}, projection={"_id": 0}, sort=[("tm", 1)]
+    ).to_list(length=None)
+
+    async def rows():
+        for document in documents:
+            yield {"datetime": document["tm"]} | {category: document[category] for category in NOWCAST_CATEGORIES}
+
+    return len(b"".join([chunk async for chunk in history.to_ndjson(rows(), chunk_rows=len(documents))]))
+
+
+async def _stream(database: Database, grid_x: int, grid_y: int, start: datetime, end: datetime) -> int:
+    size: int = 0
+    async for chunk in history.to_ndjson(history.iter_history(database, grid_x, grid_y, start, end)):
+        size += len(chunk)
+    return size
+
+
+async def _measure(function, *args) -> dict:
+    tracemalloc.start()
+    start: float = time.perf_counter()
+    size: int = await function(*args)
+    seconds: float = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"ms": seconds * 1000, "peak_kb": peak / 1024, "bytes": size}
+
+
+async def run(days: int, cells: int) -> dict:
+    rng: random.Random = random.Random(0)
+    database: Database = Database(client=FakeMongoClient())
+    grid_cells: list[tuple[int, int]] = [(50 + index % 10, 120 + index // 10) for index in range(cells)]
+    first_day: datetime = datetime(2024, 1, 1)
+    await database.nowcast.insert_many([
+        {
+            "nx": grid_x, "ny": grid_y, "tm": first_day + timedelta(hours=hour),
+            "PTY": 0.0, "REH": float(rng.randrange(20, 100)), "RN1": 0.0, "T1H": round(rng.gauss(15, 8), 1),
+        }
+        for hour in range(days * 24)
+        for grid_x, grid_y in grid_cells
+    ])
+
+    archive_start: float = time.perf_counter()
+    archiver: history.HistoryArchiver = history.HistoryArchiver(database)
+    for offset in range(days):
+        await archiver.archive_day(date(2024, 1, 1) + timedelta(days=offset))
+    archive_seconds: float = time.perf_counter() - archive_start
+    archived_bytes: int = sum(len(document["data"]) for document in database.nowcast_archive.documents)
+
+    grid_x, grid_y = grid_cells[0]
+    end: datetime = first_day + timedelta(days=days)
+    to_list: dict = await _measure(_to_list, database, grid_x, grid_y, first_day, end) | {"documents_read": days * 24}
+    stream: dict = await _measure(_stream, database, grid_x, grid_y, first_day, end) | {"documents_read": days}
+    return {
+        "archive": {
+            "seconds": archive_seconds,
+            "documents": len(database.nowcast_archive.documents),
+            "bytes_per_cell_day": archived_bytes / len(database.nowcast_archive.documents),
+        },
+        "to_list": to_list,
+        "archive_stream": stream,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--cells", type=int, default=20)
+    args = parser.parse_args()
+    print(json.dumps({"parameters": vars(args)} | asyncio.run(run(args.days, args.cells)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+대체 API 서버(fake_upstream.py)와 가짜 DB 로 수집 경로 전체 실행
+
+- 페이지 나눔: 측정소 수가 페이지 크기(1000)를 넘어도 측정소 목록·미세먼지가 모두 저장되는지
+- 격자 수집: 초단기실황·예보를 격자마다 동시에 조회해 일괄 upsert 하는 시간과 요청 수
+- 재시도: 시간 초과·5xx 응답 후 재시도로 수집이 끝나는지
+- 비정상 응답 코드: 재시도 후 UpstreamError 로 실패하는지
+
+기대한 결과와 다르면 종료 코드 1
+
+실행:
+    python -m app.benchmark.ingestion --stations 2500 --cells 500
+"""
+import sys
+import json
+import time
+import asyncio
+import argparse
+from datetime import datetime
+from app.microweather import grid
+from app.microweather.database import Database
+from app.microweather.ingestion import IngestionService, UpstreamError
+from app.benchmark.fake_database import FakeMongoClient
+from app.benchmark.fake_upstream import FakeUpstream
+
+
+def _service(database: Database, upstream: FakeUpstream, **kwargs) -> IngestionService:
+    return IngestionService(database=database, client=upstream.client(), service_key="benchmark", **kwargs)
+
+
+async def _paging(stations: int) -> dict:
+    database: Database = Database(client=FakeMongoClient())
+    upstream: FakeUpstream = FakeUpstream(stations=stations)
+    service: IngestionService = _service(database, upstream)
+    station_result: dict = await service.ingest_stations()
+    pm_result: dict = await service.ingest_particulate_matter()
+    stored: int = await database.pm_station.count_documents({})
+    return {
+        "stations": station_result,
+        "particulate_matter": pm_result,
+        "requests": dict(upstream.requests),
+        "ok": stored == stations and pm_result["stations"] == stations,
+    }
+
+
+async def _cells(count: int, concurrency: int) -> dict:
+    database: Database = Database(client=FakeMongoClient())
+    upstream: FakeUpstream = FakeUpstream()
+    service: IngestionService = _service(database, upstream, concurrency=concurrency)
+    cells: list[tuple[int, int]] = [
+        (grid_x, grid_y) for grid_x in range(1, grid.GRID_NX + 1) for grid_y in range(1, grid.GRID_NY + 1)
+    ][:count]
+    now: datetime = datetime.now()
+
+    start: float = time.perf_counter()
+    nowcast: dict = await service.ingest_nowcast(cells, now=now)
+    forecast: dict = await service.ingest_forecast(cells, now=now)
+    seconds: float = time.perf_counter() - start
+    documents: list[dict] = await database.forecast.find({"nx": cells[0][0], "ny": cells[0][1]}).to_list(length=None)
+    return {
+        "nowcast": nowcast,
+        "forecast": forecast,
+        "seconds": seconds,
+        "requests": dict(upstream.requests),
+        "ok": nowcast["written"] == forecast["written"] == count and len(documents[0]["items"]) == 6,
+    }
+
+
+async def _retry() -> dict:
+    database: Database = Database(client=FakeMongoClient())
+    upstream: FakeUpstream = FakeUpstream(stations=10, timeouts=1, failures=2)
+    service: IngestionService = _service(database, upstream, retries=3, backoff=0.01)
+    result: dict = await service.ingest_particulate_matter()
+    return {"particulate_matter": result, "calls": upstream.calls, "ok": result["stations"] == 10 and upstream.calls == 4}
+
+
+async def _error_code() -> dict:
+    database: Database = Database(client=FakeMongoClient())
+    upstream: FakeUpstream = FakeUpstream(result_code="30")
+    service: IngestionService = _service(database, upstream, retries=1, backoff=0.01)
+    try:
+        await service.ingest_stations()
+    except UpstreamError as e:
+        return {"error": str(e), "calls": upstream.calls, "ok": upstream.calls == 2}
+    return {"error": None, "calls": upstream.calls, "ok": False}
+
+
+async def run(stations: int, cells: int, concurrency: int) -> dict:
+    return {
+        "paging": await _paging(stations),
+        "cells": await _cells(cells, concurrency),
+        "retry": await _retry(),
+        "error_code": await _error_code(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stations", type=int, default=2500)
+    parser.add_argument("--cells", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+    results: dict = asyncio.run(run(args.stations, args.cells, args.concurrency))
+    print(json.dumps({"parameters": vars(args)} | results, indent=2, default=str, ensure_ascii=False))
+    if not all(result["ok"] for result in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
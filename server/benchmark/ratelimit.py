@@ -0,0 +1,113 @@
+"""
+IP 별 요청 제한 / 차단 목록 조회의 요청당 처리 시간 측정 (추적 IP 수 1,000 ~ 3,000,000)
+
+실행:
+    python -m app.benchmark.ratelimit --clients 1000,100000,1000000,3000000
+"""
+import json
+import time
+import random
+import logging
+import argparse
+import tracemalloc
+from collections import defaultdict
+from app.microweather.ratelimit import RateLimiter, Blacklist
+
+LEGACY_LIMIT: int = 100_000  # 기존 방식은 차단 IP 목록 선형 탐색이 있어 이보다 큰 입력은 생략
+
+
+def _ips(count: int, seed: int = 0) -> list[str]:
+    rng: random.Random = random.Random(seed)
+    return [f"{rng.randrange(1, 224)}.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(256)}" for _ in range(count)]
+
+
+def _legacy_factory():
+    """
+    기존 방식: old_server/serverUtil.py 의 checkTempBlock (요청마다 리스트 재생성, 차단 IP 리스트 선형 탐색)
+    """
+    blocked_ip: list[str] = []
+    request_ip: defaultdict = defaultdict(list)
+
+    def check_temp_block(client_ip: str, now: float) -> bool:
+        if client_ip in blocked_ip:
+            if now - request_ip[client_ip][-1] >= 1800:
+                request_ip[client_ip] = []
+                blocked_ip.remove(client_ip)
+                return False
+            return True
+        request_ip[client_ip] = request_ip[client_ip] + [now]
+        if len(request_ip[client_ip]) >= 5 and now - request_ip[client_ip][0] <= 1:
+            blocked_ip.append(client_ip)
+            return True
+        if now - request_ip[client_ip][0] >= 1:
+            request_ip[client_ip] = []
+        return False
+
+    return check_temp_block
+
+
+def _measure(check, ips: list[str], requests: int) -> float:
+    """
+    추적 IP 를 모두 채운 뒤 (일부 IP 는 차단 상태) 무작위 IP 요청 requests 건의 요청당 처리 시간(ns)
+    """
+    now: float = 0.0
+    for ip in ips:
+        now += 1e-6
+        check(ip, now)
+    for ip in ips[: len(ips) // 100]:  # 1% 는 짧은 시간에 몰아서 요청해 차단 상태로 만듦
+        for _ in range(6):
+            check(ip, now)
+
+    rng: random.Random = random.Random(1)
+    picks: list[str] = [ips[rng.randrange(len(ips))] for _ in range(requests)]
+    start: float = time.perf_counter()
+    for ip in picks:
+        now += 1e-6
+        check(ip, now)
+    return (time.perf_counter() - start) / requests * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", default="1000,100000,1000000,3000000")
+    parser.add_argument("--requests", type=int, default=200_000)
+    parser.add_argument("--max-clients", type=int, default=1_000_000)
+    args = parser.parse_args()
+    logging.getLogger("microweather.ratelimit").setLevel(logging.ERROR)
+
+    blacklist: Blacklist = Blacklist([f"10.{i // 256}.{i % 256}.0/24" for i in range(10_000)] + _ips(100_000, seed=2))
+    results: list[dict] = []
+    for count in (int(value) for value in args.clients.split(",")):
+        ips: list[str] = _ips(count)
+        limiter: RateLimiter = RateLimiter(max_clients=args.max_clients)
+
+        limiter_ns: float = _measure(lambda ip, now: limiter.check(ip, now), ips, args.requests)
+
+        tracemalloc.start()
+        filled: RateLimiter = RateLimiter(max_clients=args.max_clients)
+        for index, ip in enumerate(ips):
+            filled.check(ip, index * 1e-6)
+        memory_mb: float = tracemalloc.get_traced_memory()[0] / 1e6
+        tracemalloc.stop()
+        del filled
+
+        row: dict = {
+            "distinct_ips": count,
+            "limiter_ns_per_request": limiter_ns,
+            "tracked_ips": len(limiter),
+            "evictions": limiter.evictions,
+            "limiter_memory_mb": memory_mb,
+        }
+        start: float = time.perf_counter()
+        for ip in ips[: args.requests]:
+            _ = ip in blacklist
+        row["blacklist_ns_per_request"] = (time.perf_counter() - start) / min(len(ips), args.requests) * 1e9
+        if count <= LEGACY_LIMIT:
+            row["legacy_ns_per_request"] = _measure(_legacy_factory(), ips, args.requests)
+        results.append(row)
+
+    print(json.dumps({"parameters": vars(args), "blacklist_entries": len(blacklist), "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
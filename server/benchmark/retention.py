@@ -0,0 +1,90 @@
+"""
+보관 기간 정리 유무에 따른 격자별 최신 초단기실황 조회 시간 비교 (이력이 쌓이는 동안 매시간 수집 + 정리)
+
+가짜 DB 는 격자 (nx, ny) 해시 인덱스 뒤에서 tm 정렬을 수행하므로 격자별 이력 길이가 조회 비용에 그대로 드러남
+(실제 MongoDB 에서는 {nx, ny, tm: -1} 인덱스 크기와 작업 집합이 메모리를 넘는지가 같은 역할)
+
+실행:
+    python -m app.benchmark.retention --cells 200 --hours 720 --checkpoints 24,168,336,720
+"""
+import json
+import time
+import random
+import asyncio
+import argparse
+from datetime import datetime, timedelta
+from app.microweather.database import Database
+from app.microweather.retention import RetentionPolicy
+from app.benchmark.stats import summarize
+from app.benchmark.fake_database import FakeMongoClient
+
+
+async def _lookup(database: Database, cells: list[tuple[int, int]], lookups: int) -> dict:
+    """
+    무작위 격자의 최신 초단기실황 조회 (WeatherService._load_nowcast 와 같은 쿼리) 지연 시간 요약
+    """
+    rng: random.Random = random.Random(1)
+    samples: list[float] = []
+    start: float = time.perf_counter()
+    for _ in range(lookups):
+        grid_x, grid_y = cells[rng.randrange(len(cells))]
+        lookup_start: float = time.perf_counter()
+        await database.nowcast.find_one({"nx": grid_x, "ny": grid_y}, sort=[("tm", -1)])
+        samples.append(time.perf_counter() - lookup_start)
+    return summarize(samples, time.perf_counter() - start)
+
+
+async def run(cells: int, hours: int, checkpoints: list[int], window_hours: int, lookups: int) -> dict:
+    rng: random.Random = random.Random(0)
+    grid_cells: list[tuple[int, int]] = [(1 + index % 149, 1 + index // 149) for index in range(cells)]
+    unbounded: Database = Database(client=FakeMongoClient())
+    retained: Database = Database(client=FakeMongoClient())
+    retention: RetentionPolicy = RetentionPolicy(windows={"nowcast": timedelta(hours=window_hours)}, rollup=True)
+
+    start_tm: datetime = datetime(2024, 1, 1)
+    results: list[dict] = []
+    prune_seconds: float = 0.0
+    for hour in range(1, hours + 1):
+        tm: datetime = start_tm + timedelta(hours=hour)
+        for database in (unbounded, retained):
+            await database.nowcast.insert_many([
+                {"nx": grid_x, "ny": grid_y, "tm": tm, "PTY": 0.0, "REH": float(rng.randrange(20, 100)), "RN1": 0.0, "T1H": rng.gauss(15, 8)}
+                for grid_x, grid_y in grid_cells
+            ])
+        prune_start: float = time.perf_counter()
+        await retention.prune(retained, now=tm)
+        prune_seconds += time.perf_counter() - prune_start
+
+        if hour in checkpoints:
+            results.append({
+                "history_hours": hour,
+                "unbounded": {
+                    "documents": await unbounded.nowcast.estimated_document_count(),
+                    "lookup": await _lookup(unbounded, grid_cells, lookups),
+                },
+                "retained": {
+                    "documents": await retained.nowcast.estimated_document_count(),
+                    "hourly_documents": await retained.nowcast_hourly.estimated_document_count(),
+                    "lookup": await _lookup(retained, grid_cells, lookups),
+                },
+                "prune_ms_per_hour": prune_seconds / hour * 1000,
+            })
+    return {"results": results}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cells", type=int, default=200)
+    parser.add_argument("--hours", type=int, default=720)
+    parser.add_argument("--checkpoints", default="24,168,336,720")
+    parser.add_argument("--window-hours", type=int, default=24)
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+
+    checkpoints: list[int] = [int(value) for value in args.checkpoints.split(",")]
+    result: dict = asyncio.run(run(args.cells, args.hours, checkpoints, args.window_hours, args.lookups))
+    print(json.dumps({"parameters": vars(args)} | result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+요청 처리 읽기 경로 비교: 기존 분산 조회(nowcast/forecast find_one, $near 측정소, pm_data 조회) vs 격자별 snapshot 한 번 조회
+
+두 경로 모두 주소는 메모리 읍면동 인덱스를 사용하고 격자 캐시는 사용하지 않음 (캐시에 없는 격자의 첫 요청 기준)
+가짜 DB 의 연산마다 --latency 초를 더해 네트워크 왕복 시간을 흉내냄
+
+실행:
+    python -m app.benchmark.snapshot --requests 500 --latency 0.001
+"""
+import json
+import time
+import asyncio
+import argparse
+from datetime import date, datetime, timedelta
+from app.microweather import sun, grid
+from app.microweather.address import AddressIndex
+from app.microweather.database import Database
+from app.microweather.service import WeatherService
+from app.microweather.snapshot import SnapshotBuilder
+from app.benchmark.stats import summarize
+from app.benchmark.suite import _coordinates
+from app.benchmark.fake_database import FakeMongoClient, seed
+
+
+def _reads(database: Database) -> int:
+    return sum(collection.reads for collection in database.database.collections.values())
+
+
+async def _bench(database: Database, address_index: AddressIndex, coordinates: list[tuple[float, float]], use_snapshot: bool) -> dict:
+    samples: list[float] = []
+    reads: int = _reads(database)
+    started: float = time.perf_counter()
+    for latitude, longitude in coordinates:
+        service: WeatherService = WeatherService(
+            database=database, latitude=latitude, longitude=longitude, address_index=address_index, use_snapshot=use_snapshot
+        )
+        start: float = time.perf_counter()
+        await service.get_weather()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples, time.perf_counter() - started) | {
+        "reads_per_request": (_reads(database) - reads) / len(coordinates)
+    }
+
+
+async def run(requests: int, latency: float) -> dict:
+    database: Database = Database(client=FakeMongoClient(latency=latency))
+    # 최신 발표분이 아닌 snapshot 은 사용하지 않으므로 현재 발표분까지 생성
+    await seed(database, hours=3, now=datetime.now() + timedelta(hours=1))
+    await sun.build_table(date.today())
+    address_index: AddressIndex = AddressIndex()
+    await address_index.load(database)
+
+    coordinates: list[tuple[float, float]] = _coordinates(requests)
+    cells: list[tuple[int, int]] = sorted({grid.to_grid(latitude=latitude, longitude=longitude) for latitude, longitude in coordinates})
+    build_start: float = time.perf_counter()
+    built: dict = await SnapshotBuilder(database).refresh(cells)
+    build_seconds: float = time.perf_counter() - build_start
+
+    return {
+        "snapshot_build": built | {"cells": len(cells), "seconds": build_seconds},
+        "fan_out": await _bench(database, address_index, coordinates, use_snapshot=False),
+        "snapshot": await _bench(database, address_index, coordinates, use_snapshot=True),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.001)
+    args = parser.parse_args()
+    print(json.dumps({"parameters": vars(args)} | asyncio.run(run(args.requests, args.latency)), indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
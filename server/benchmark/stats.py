@@ -0,0 +1,24 @@
+import statistics
+
+
+def summarize(samples: list[float], elapsed: float) -> dict:
+    """
+    측정된 지연 시간 목록(초)을 요약 통계로 변환하는 함수
+    :param samples: list[float] 요청별 지연 시간(초)
+    :param elapsed: float 전체 측정 시간(초)
+    :return: dict (ms 단위 p50/p95/p99, 평균, 초당 처리량)
+    """
+    ordered: list[float] = sorted(samples)
+
+    def percentile(q: float) -> float:
+        index: int = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+        return ordered[index] * 1000
+
+    return {
+        "count": len(ordered),
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "throughput_rps": len(ordered) / elapsed if elapsed > 0 else 0.0,
+    }
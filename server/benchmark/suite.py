@@ -0,0 +1,256 @@
+"""
+WeatherService 단계별 / FastAPI 앱 전체 벤치마크 (메모리 MongoDB 대체 구현 사용)
+
+실행:
+    python -m app.benchmark.suite --iterations 300 --concurrency 1,10,50 --latency-ms 1 --output bench.json
+
+결과는 JSON 으로 출력되며 --output 을 지정하면 파일로도 저장 (커밋 간 회귀 비교용)
+앱 측정은 /ready 이후 시작 준비 없이(WARMUP=0) 실행하며, startup 항목에 시작 준비 유무별 첫 빠른 요청까지 걸린 시간을 기록
+"""
+import os
+import sys
+import json
+import time
+import httpx
+import asyncio
+import argparse
+import platform
+import tempfile
+import subprocess
+import numpy as np
+from datetime import date, datetime
+from app.microweather import sun
+from app.microweather.cache import CellCache
+from app.microweather.database import Database
+from app.microweather.address import AddressIndex
+from app.microweather.station import StationIndex
+from app.microweather.service import WeatherService
+from app.microweather.particulate import ParticulateMatterView
+from app.microweather.release import NOWCAST_RELEASE_MINUTE, FORECAST_RELEASE_MINUTE
+from app.benchmark.stats import summarize
+from app.benchmark.fake_database import FakeMongoClient, seed
+
+# 앱 벤치마크는 모든 요청이 같은 클라이언트 IP 로 들어오므로 IP 별 요청 제한을 사실상 해제
+os.environ.setdefault("RATE_LIMIT_BURST", str(10 ** 9))
+os.environ.setdefault("LOG_DIR", os.path.join(tempfile.gettempdir(), "microweather-benchmark-log"))
+# 가짜 DB 는 자체 해시 인덱스만 있고 create_indexes/explain 을 지원하지 않음
+os.environ.setdefault("MONGODB_ENSURE_INDEXES", "0")
+os.environ.setdefault("MONGODB_INDEX_PLAN_CHECK", "off")
+# 시작 준비가 측정 요청과 경쟁하지 않도록 기본은 끄고, 시작 직후 지연은 bench_startup 에서 따로 측정
+os.environ.setdefault("WARMUP", "0")
+
+STAGES: tuple[str, ...] = (
+    "get_grid_coordinates",
+    "_is_sunrise",
+    "_get_address",
+    "_get_nowcast",
+    "_get_forecast",
+    "_get_particulate_matter",
+    "get_weather",
+)
+
+
+def _coordinates(count: int, seed: int = 0) -> list[tuple[float, float]]:
+    """
+    서비스 지원 영역 내부의 무작위 좌표 (격자 공유 효과를 보기 위해 도시 주변에 몰리도록 생성)
+    """
+    rng: np.random.Generator = np.random.default_rng(seed)
+    centers: np.ndarray = np.array([[37.5665, 126.9780], [35.1796, 129.0756], [35.8714, 128.6014], [37.4563, 126.7052], [36.3504, 127.3845]])
+    picks: np.ndarray = centers[rng.integers(0, len(centers), count)] + rng.normal(0, 0.02, (count, 2))
+    return [(float(latitude), float(longitude)) for latitude, longitude in picks]
+
+
+async def _resources(database: Database) -> dict:
+    """
+    lifespan 과 같은 방식으로 공유 자원을 준비
+    """
+    await sun.build_table(date.today())
+    address_index: AddressIndex = AddressIndex()
+    station_index: StationIndex = StationIndex()
+    particulate_matter_view: ParticulateMatterView = ParticulateMatterView()
+    await asyncio.gather(
+        address_index.load(database), station_index.load(database), particulate_matter_view.load(database)
+    )
+    return {
+        "nowcast_cache": CellCache(release_minute=NOWCAST_RELEASE_MINUTE),
+        "forecast_cache": CellCache(release_minute=FORECAST_RELEASE_MINUTE),
+        "address_index": address_index,
+        "station_index": station_index,
+        "particulate_matter_view": particulate_matter_view,
+    }
+
+
+async def _call_stage(service: WeatherService, stage: str) -> None:
+    if stage == "get_grid_coordinates":
+        service.get_grid_coordinates(latitude=service.latitude, longitude=service.longitude)
+    elif stage in ("_get_nowcast", "_get_forecast"):
+        await getattr(service, stage)(grid_x=service.grid_coord["grid_x"], grid_y=service.grid_coord["grid_y"])
+    elif stage == "get_weather":
+        await service.get_weather()
+    else:
+        await getattr(service, stage)(latitude=service.latitude, longitude=service.longitude)
+
+
+async def bench_stages(database: Database, resources: dict, coordinates: list[tuple[float, float]]) -> dict:
+    """
+    단계별 지연 시간 측정 (동시성 1, 순차 실행)
+    """
+    result: dict = {}
+    for stage in STAGES:
+        samples: list[float] = []
+        started: float = time.perf_counter()
+        for latitude, longitude in coordinates:
+            service: WeatherService = WeatherService(database=database, latitude=latitude, longitude=longitude, **resources)
+            start: float = time.perf_counter()
+            await _call_stage(service, stage)
+            samples.append(time.perf_counter() - start)
+        result[stage] = summarize(samples, time.perf_counter() - started)
+    return result
+
+
+async def bench_app(database: Database, coordinates: list[tuple[float, float]], concurrency: int) -> dict:
+    """
+    FastAPI 앱을 프로세스 내부(ASGI)에서 지정한 동시성으로 호출해 처리량과 지연 시간 측정
+    """
+    from app.main import app
+
+    app.state.database_factory = lambda: database
+    samples: list[float] = []
+    status_codes: dict[int, int] = {}
+    semaphore: asyncio.Semaphore = asyncio.Semaphore(concurrency)
+
+    async with app.router.lifespan_context(app):
+        transport: httpx.ASGITransport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await _wait_ready(client)
+
+            async def one(latitude: float, longitude: float) -> None:
+                async with semaphore:
+                    start: float = time.perf_counter()
+                    response: httpx.Response = await client.get(
+                        "/microweather", params={"latitude": latitude, "longitude": longitude}, headers={"Accept-Encoding": "gzip"}
+                    )
+                    samples.append(time.perf_counter() - start)
+                    status_codes[response.status_code] = status_codes.get(response.status_code, 0) + 1
+
+            started: float = time.perf_counter()
+            await asyncio.gather(*(one(latitude, longitude) for latitude, longitude in coordinates))
+            elapsed: float = time.perf_counter() - started
+
+    return summarize(samples, elapsed) | {"concurrency": concurrency, "status_codes": status_codes}
+
+
+async def _wait_ready(client: httpx.AsyncClient) -> float:
+    """
+    /ready 가 200 을 반환할 때까지 기다리는 함수
+    :return: float 기다린 시간(초)
+    """
+    start: float = time.perf_counter()
+    while (await client.get("/microweather/ready")).status_code != 200:
+        await asyncio.sleep(0.01)
+    return time.perf_counter() - start
+
+
+async def bench_startup(database: Database, coordinates: list[tuple[float, float]], warmup: bool, fast_factor: float) -> dict:
+    """
+    서버 시작부터 첫 빠른 요청까지 걸린 시간 측정 (동시성 1)
+    시작 후 좌표 목록을 한 번 요청하고(시작 직후), 같은 목록을 다시 요청해(안정 상태) 안정 상태 p50 의 fast_factor 배 이하인
+    첫 요청이 끝난 시각을 서버 시작 기준으로 기록
+    """
+    from app.main import app
+
+    app.state.database_factory = lambda: database
+    previous: str | None = os.environ.get("WARMUP")
+    os.environ["WARMUP"] = "1" if warmup else "0"
+    try:
+        started: float = time.perf_counter()
+        async with app.router.lifespan_context(app):
+            transport: httpx.ASGITransport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                await _wait_ready(client)
+                ready_seconds: float = time.perf_counter() - started
+
+                async def run_pass() -> list[tuple[float, float]]:
+                    samples: list[tuple[float, float]] = []
+                    for latitude, longitude in coordinates:
+                        start: float = time.perf_counter()
+                        await client.get(
+                            "/microweather", params={"latitude": latitude, "longitude": longitude}, headers={"Accept-Encoding": "gzip"}
+                        )
+                        samples.append((time.perf_counter() - start, time.perf_counter() - started))
+                    return samples
+
+                first_pass: list[tuple[float, float]] = await run_pass()
+                steady_pass: list[tuple[float, float]] = await run_pass()
+    finally:
+        if previous is None:
+            os.environ.pop("WARMUP", None)
+        else:
+            os.environ["WARMUP"] = previous
+
+    steady_p50: float = summarize([latency for latency, _ in steady_pass], 1.0)["p50_ms"] / 1000
+    first_fast: float | None = next(
+        (finished for latency, finished in first_pass if latency <= steady_p50 * fast_factor), None
+    )
+    return {
+        "warmup": warmup,
+        "ready_ms": ready_seconds * 1000,
+        "time_to_first_fast_request_ms": first_fast * 1000 if first_fast is not None else None,
+        "fast_threshold_ms": steady_p50 * fast_factor * 1000,
+        "first_request_ms": first_pass[0][0] * 1000,
+        "first_pass": summarize([latency for latency, _ in first_pass], first_pass[-1][1] - ready_seconds),
+        "steady": summarize([latency for latency, _ in steady_pass], steady_pass[-1][1] - first_pass[-1][1]),
+    }
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=300)
+    parser.add_argument("--concurrency", default="1,10,50")
+    parser.add_argument("--latency-ms", type=float, default=1.0, help="대체 DB 연산마다 추가할 지연 시간(ms)")
+    parser.add_argument("--hours", type=int, default=3, help="격자별 초단기실황 보관 발표 수")
+    parser.add_argument("--startup-requests", type=int, default=50, help="시작 직후 측정에 사용할 요청 수")
+    parser.add_argument("--fast-factor", type=float, default=2.0, help="안정 상태 p50 의 몇 배 이하를 빠른 요청으로 볼지")
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    database: Database = Database(client=FakeMongoClient(latency=args.latency_ms / 1000))
+    await seed(database, hours=args.hours)
+    coordinates: list[tuple[float, float]] = _coordinates(args.iterations)
+
+    report: dict = {
+        "commit": _commit(),
+        "created_at": datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "parameters": vars(args),
+        "stages": {
+            "baseline": await bench_stages(database, {}, coordinates),
+            "optimized": await bench_stages(database, await _resources(database), coordinates),
+        },
+        "app": [
+            await bench_app(database, coordinates, int(concurrency))
+            for concurrency in args.concurrency.split(",")
+        ],
+        "startup": [
+            await bench_startup(database, coordinates[:args.startup_requests], warmup, args.fast_factor)
+            for warmup in (False, True)
+        ],
+    }
+
+    text: str = json.dumps(report, indent=2, default=str)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,73 @@
+"""
+격자별 일출/일몰 테이블의 ephem 대비 정확도와 조회 비용 측정
+
+실행:
+    python -m app.benchmark.sun --samples 500
+"""
+import json
+import time
+import ephem
+import argparse
+import numpy as np
+from datetime import date, datetime, timedelta
+from app.microweather import grid, sun
+
+
+def _ephem_sun_times(latitude: float, longitude: float, day: date) -> tuple[datetime, datetime]:
+    observer: ephem.Observer = ephem.Observer()
+    observer.lat = str(latitude)
+    observer.lon = str(longitude)
+    observer.date = datetime(day.year, day.month, day.day) - sun.KST_OFFSET
+    sunrise: datetime = observer.next_rising(ephem.Sun()).datetime() + sun.KST_OFFSET
+    sunset: datetime = observer.next_setting(ephem.Sun()).datetime() + sun.KST_OFFSET
+    return sunrise, sunset
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--samples", type=int, default=500)
+    parser.add_argument("--day", type=date.fromisoformat, default=date.today())
+    args = parser.parse_args()
+
+    start: float = time.perf_counter()
+    table: sun.SunTable = sun.SunTable.build(args.day)
+    build_seconds: float = time.perf_counter() - start
+
+    rng: np.random.Generator = np.random.default_rng(0)
+    grid_x: np.ndarray = rng.integers(1, grid.GRID_NX + 1, args.samples)
+    grid_y: np.ndarray = rng.integers(1, grid.GRID_NY + 1, args.samples)
+    latitudes, longitudes = grid.from_grid_batch(grid_x, grid_y)
+
+    errors: list[float] = []
+    start = time.perf_counter()
+    for latitude, longitude in zip(latitudes.tolist(), longitudes.tolist()):
+        expected: tuple[datetime, datetime] = _ephem_sun_times(latitude, longitude, args.day)
+    ephem_seconds: float = (time.perf_counter() - start) / args.samples
+
+    midnight: datetime = datetime(args.day.year, args.day.month, args.day.day)
+    for x, y, latitude, longitude in zip(grid_x.tolist(), grid_y.tolist(), latitudes.tolist(), longitudes.tolist()):
+        expected = _ephem_sun_times(latitude, longitude, args.day)
+        sunrise_minutes, sunset_minutes = table.get_minutes(x, y)
+        errors.append(abs((midnight + timedelta(minutes=sunrise_minutes) - expected[0]).total_seconds()))
+        errors.append(abs((midnight + timedelta(minutes=sunset_minutes) - expected[1]).total_seconds()))
+
+    sun.get_table(args.day)
+    now: datetime = datetime.combine(args.day, datetime.now().time())
+    start = time.perf_counter()
+    for x, y, latitude, longitude in zip(grid_x.tolist(), grid_y.tolist(), latitudes.tolist(), longitudes.tolist()):
+        sun.is_sunrise(latitude=latitude, longitude=longitude, grid_x=x, grid_y=y, now=now)
+    lookup_seconds: float = (time.perf_counter() - start) / args.samples
+
+    print(json.dumps({
+        "day": args.day.isoformat(),
+        "cells": grid.GRID_NX * grid.GRID_NY,
+        "build_ms": build_seconds * 1000,
+        "max_error_s": max(errors),
+        "mean_error_s": float(np.mean(errors)),
+        "ephem_per_point_us": ephem_seconds * 1e6,
+        "table_lookup_us": lookup_seconds * 1e6,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
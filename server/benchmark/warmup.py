@@ -0,0 +1,81 @@
+"""
+서버 시작 직후 첫 요청 지연 비교: 시작 준비 없음(WARMUP=0) vs 시작 준비 후(/ready 가 200 이 된 뒤) 요청
+
+접근 로그에 기록된 격자(요청이 많은 순서)로 첫 요청들을 보내며, 시작부터 준비 완료까지 걸린 시간과 첫 요청들의 지연을 비교
+가짜 DB 의 왕복 지연(--latency)이 커넥션 풀이 비어 있을 때의 조회 비용 역할
+
+실행:
+    python -m app.benchmark.warmup --latency 0.005 --requests 20
+"""
+import os
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import numpy as np
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from app.microweather import grid
+from app.microweather.database import Database
+from app.benchmark.fake_database import FakeMongoClient, seed
+
+os.environ.setdefault("RATE_LIMIT_BURST", str(10 ** 9))
+os.environ.setdefault("MONGODB_ENSURE_INDEXES", "0")
+os.environ.setdefault("MONGODB_INDEX_PLAN_CHECK", "off")
+
+
+def _write_access_log(log_dir: str, cells: list[tuple[int, int]]) -> None:
+    with open(os.path.join(log_dir, "server.log"), "w", encoding="utf-8") as file:
+        for rank, (grid_x, grid_y) in enumerate(cells):
+            for _ in range(len(cells) - rank):
+                file.write(json.dumps({"path": "/microweather", "grid_x": grid_x, "grid_y": grid_y, "status": 200}) + "\n")
+
+
+def _run(mode: str, latency: float, cells: list[tuple[int, int]]) -> dict:
+    from app.main import app
+
+    database: Database = Database(client=FakeMongoClient(latency))
+    asyncio.run(seed(database, hours=1, now=datetime.now() + timedelta(hours=1)))
+    app.state.database_factory = lambda: database
+    os.environ["WARMUP"] = "1" if mode == "warmup" else "0"
+    latitudes, longitudes = grid.from_grid_batch(np.array([cell[0] for cell in cells]), np.array([cell[1] for cell in cells]))
+
+    start: float = time.perf_counter()
+    with TestClient(app, root_path="/microweather") as client:
+        while client.get("/microweather/ready").status_code != 200:
+            time.sleep(0.01)
+        ready_seconds: float = time.perf_counter() - start
+        latencies: list[float] = []
+        for latitude, longitude in zip(latitudes.tolist(), longitudes.tolist()):
+            request_start: float = time.perf_counter()
+            client.get("/microweather", params={"latitude": latitude, "longitude": longitude})
+            latencies.append((time.perf_counter() - request_start) * 1000)
+    return {
+        "ready_seconds": ready_seconds,
+        "first_request_ms": latencies[0],
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "max_ms": max(latencies),
+        "mean_ms": float(np.mean(latencies)),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.005)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    # 수도권 격자 중 요청이 많은 순서로 가정
+    cells: list[tuple[int, int]] = [(55 + index % 10, 122 + index // 10) for index in range(args.requests)]
+    results: dict = {"parameters": vars(args)}
+    with tempfile.TemporaryDirectory() as log_dir:
+        _write_access_log(log_dir, cells)
+        os.environ["LOG_DIR"] = log_dir
+        for mode in ("cold", "warmup"):
+            results[mode] = _run(mode, args.latency, cells)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
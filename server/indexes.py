@@ -0,0 +1,30 @@
+import sys
+import json
+import asyncio
+import logging
+import argparse
+from app.microweather import indexes
+from app.microweather.database import Database
+
+
+async def main() -> int:
+    """
+    MongoDB 인덱스 생성 및 요청 경로 쿼리의 실행 계획 확인 실행 함수
+    --check-only 를 지정하면 인덱스를 만들지 않고 실행 계획만 확인
+    :return: int 종료 코드 (실행 계획에 COLLSCAN/SORT 가 있으면 1)
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--check-only", action="store_true")
+    args = parser.parse_args()
+
+    async with Database() as database:
+        if not args.check_only:
+            print(json.dumps(await indexes.ensure_indexes(database), ensure_ascii=False, indent=2))
+        results: list[dict] = await indexes.verify_query_plans(database)
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+    return 1 if any(result["problem"] is not None for result in results) else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - [%(levelname)s | %(name)s] > %(message)s")
+    sys.exit(asyncio.run(main()))
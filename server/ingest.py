@@ -0,0 +1,93 @@
+import os
+import asyncio
+import logging
+import argparse
+from typing import Awaitable, Callable
+from datetime import date, timedelta
+from app.microweather.database import Database
+from app.microweather.ingestion import IngestionService
+from app.microweather.retention import RetentionPolicy
+from app.microweather.history import HistoryArchiver
+from app.microweather.snapshot import SnapshotBuilder, GridFileWriter
+
+
+async def main() -> None:
+    """
+    기상청/에어코리아 데이터 수집 실행 함수
+    --once 를 지정하면 해당 작업만 한 번 실행하고, 지정하지 않으면 발표 주기에 맞춰 계속 수집하면서 보관 기간 정리도 주기적으로 실행
+    WEATHER_SNAPSHOT=1 이면 수집 작업마다 격자별 snapshot 문서도 갱신
+    GRID_SNAPSHOT_PATH 를 지정하면 수집 작업마다 웹 워커가 매핑하는 격자 파일도 다시 씀
+    계속 수집할 때는 측정소 목록도 STATION_REFRESH_SECONDS(기본 하루)마다 다시 수집
+    HISTORY_ARCHIVE=1(기본)이면 지난 날짜의 초단기실황을 격자·날짜별 이력 보관 문서로 주기적으로 저장
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--once", choices=["nowcast", "forecast", "pm", "stations", "prune", "snapshot", "grid", "archive"])
+    parser.add_argument("--day", type=date.fromisoformat, help="--once archive 로 보관할 날짜 (기본 어제)")
+    args = parser.parse_args()
+
+    retention: RetentionPolicy = RetentionPolicy(
+        windows={
+            "nowcast": timedelta(hours=float(os.getenv("RETENTION_NOWCAST_HOURS", "72"))),
+            "forecast": timedelta(hours=float(os.getenv("RETENTION_FORECAST_HOURS", "24"))),
+            "pm_data": timedelta(hours=float(os.getenv("RETENTION_PM_HOURS", "72"))),
+        },
+        rollup=os.getenv("RETENTION_ROLLUP", "1") == "1",
+    )
+
+    concurrency: int = int(os.getenv("INGEST_CONCURRENCY", "20"))
+    async with Database() as database, IngestionService.create_client(concurrency=concurrency) as client:
+        service: IngestionService = IngestionService(
+            database=database,
+            client=client,
+            service_key=os.getenv("OPEN_API_KEY", ""),
+            concurrency=concurrency,
+        )
+        if args.once == "pm":
+            print(await service.ingest_particulate_matter())
+            return
+        if args.once == "stations":
+            print(await service.ingest_stations())
+            return
+        if args.once == "prune":
+            print(await retention.prune(database))
+            return
+        archiver: HistoryArchiver = HistoryArchiver(database)
+        if args.once == "archive":
+            print(await archiver.archive_day(args.day or date.today() - timedelta(days=1)))
+            return
+        grid_file_path: str | None = os.getenv("GRID_SNAPSHOT_PATH")
+        if args.once == "grid":
+            print(await GridFileWriter(database, grid_file_path or "data/grid.npy").refresh())
+            return
+
+        cells: list[tuple[int, int]] = await service.load_land_cells()
+        snapshot: SnapshotBuilder = SnapshotBuilder(database)
+        updates: list[Callable[[], Awaitable[dict]]] = []
+        if os.getenv("WEATHER_SNAPSHOT", "0") == "1":
+            updates.append(lambda: snapshot.refresh(cells))
+        if grid_file_path:
+            updates.append(GridFileWriter(database, grid_file_path).refresh)
+
+        async def on_update() -> dict:
+            return {"updates": [await update() for update in updates]}
+
+        if args.once == "nowcast":
+            print(await service.ingest_nowcast(cells))
+        elif args.once == "forecast":
+            print(await service.ingest_forecast(cells))
+        elif args.once == "snapshot":
+            print(await snapshot.refresh(cells))
+        else:
+            jobs: list[Awaitable] = [
+                service.run_forever(cells, on_update=on_update if updates else None),
+                retention.watch(database, interval=float(os.getenv("RETENTION_INTERVAL_SECONDS", "3600"))),
+                service.watch_stations(interval=float(os.getenv("STATION_REFRESH_SECONDS", "86400"))),
+            ]
+            if os.getenv("HISTORY_ARCHIVE", "1") == "1":
+                jobs.append(archiver.watch(interval=float(os.getenv("HISTORY_ARCHIVE_INTERVAL_SECONDS", "21600"))))
+            await asyncio.gather(*jobs)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - [%(levelname)s | %(name)s] > %(message)s")
+    asyncio.run(main())
@@ -1,17 +1,215 @@
+import os
+import time
+import asyncio
+import tempfile
+import httpx
 import uvicorn
-from fastapi import FastAPI
+from typing import Literal
+from datetime import date, datetime
+from logging.handlers import QueueListener
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response, Query
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
+from app.microweather import sun, metrics, indexes, history, export
+from app.microweather.cache import CellCache
+from app.microweather.gridfile import GridFile
+from app.microweather.warmup import Warmup, parse_cells
+from app.microweather.singleflight import SingleFlight
+from app.microweather.deadline import StageDeadlines, parse_deadlines
+from app.microweather.logger import setup_logging, log_fields, AccessLogMiddleware
+from app.microweather.ratelimit import RateLimiter, Blacklist, RateLimitMiddleware
+from app.microweather.encoding import ResponseEncoder, choose_encoding
+from app.microweather.address import AddressIndex
+from app.microweather.station import StationIndex
+from app.microweather.particulate import ParticulateMatterView
+from app.microweather.database import Database
+from app.microweather.fallback import UpstreamFallback
+from app.microweather.ingestion import IngestionService
+from app.microweather.release import NOWCAST_RELEASE_MINUTE, FORECAST_RELEASE_MINUTE
 from app.microweather.service import WeatherService
-from app.microweather.models import WeatherModel
+from app.microweather.batch import BatchWeatherService
+from app.microweather.models import WeatherModel, BatchRequestModel, BatchItemModel
 
-app = FastAPI(root_path="/microweather", docs_url=None, redoc_url=None)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    서버 시작 시 공유 자원(로그 큐, MongoDB 커넥션 풀과 인덱스, 격자 캐시, 동시 조회 합치기, 단계별 제한 시간, 응답 조각 캐시, 일출/일몰 테이블, 읍면동/측정소 인덱스, 최신 미세먼지 뷰, 기상청 API 직접 조회, 지표 수집)을 한 번만 생성하고 종료 시 정리하는 lifespan 함수
+    자원 생성 후 시작 준비(warmup.py)를 백그라운드로 실행하며, 끝날 때까지 /ready 는 503 응답
+    """
+    started_at: float = time.perf_counter()
+    log_dir: str = os.getenv("LOG_DIR", "log/server")
+    log_listener: QueueListener = setup_logging(
+        log_dir=log_dir,
+        sample_rate=float(os.getenv("LOG_SAMPLE_RATE", "1.0")),
+        backup_count=int(os.getenv("LOG_BACKUP_COUNT", "7")),
+        queue_size=int(os.getenv("LOG_QUEUE_SIZE", "10000")),
+        console=os.getenv("LOG_CONSOLE", "0") == "1",
+    )
+    app.state.database = app.state.database_factory()
+    await indexes.bootstrap(
+        app.state.database,
+        ensure=os.getenv("MONGODB_ENSURE_INDEXES", "1") == "1",
+        check=os.getenv("MONGODB_INDEX_PLAN_CHECK", "warn"),
+    )
+    cache_size: int = int(os.getenv("CELL_CACHE_MAX_SIZE", "10000"))
+    app.state.nowcast_cache = CellCache(release_minute=NOWCAST_RELEASE_MINUTE, max_size=cache_size)
+    app.state.forecast_cache = CellCache(release_minute=FORECAST_RELEASE_MINUTE, max_size=cache_size)
+    app.state.nowcast_flight = SingleFlight("nowcast")
+    app.state.forecast_flight = SingleFlight("forecast")
+    app.state.particulate_matter_flight = SingleFlight("particulate_matter")
+    app.state.stage_deadlines = StageDeadlines(
+        deadlines=parse_deadlines(
+            os.getenv("STAGE_DEADLINES", ""),
+            default=float(os.getenv("STAGE_DEADLINE_SECONDS", "0.3")),
+            stages=("address", "nowcast", "forecast", "particulate_matter", "snapshot"),
+        ),
+        max_size=int(os.getenv("STAGE_LAST_GOOD_MAX_SIZE", "100000")),
+    )
+    app.state.use_snapshot = os.getenv("WEATHER_SNAPSHOT", "0") == "1"
+    app.state.history_max_days = float(os.getenv("HISTORY_MAX_DAYS", "366"))
+    app.state.grid_file = None
+    if os.getenv("GRID_SNAPSHOT_PATH"):
+        # 수집 프로세스(ingest.py)가 쓰는 파일을 워커마다 읽기 전용으로 매핑
+        app.state.grid_file = GridFile(
+            os.getenv("GRID_SNAPSHOT_PATH"), check_interval=float(os.getenv("GRID_SNAPSHOT_CHECK_SECONDS", "1"))
+        )
+    app.state.response_encoder = ResponseEncoder(
+        max_size=int(os.getenv("RESPONSE_SECTION_CACHE_MAX_SIZE", "100000")),
+        brotli_max_size=int(os.getenv("RESPONSE_BROTLI_CACHE_MAX_SIZE", "20000")),
+    )
+    await sun.build_table(date.today())
+    sun_refresh_task: asyncio.Task = asyncio.create_task(sun.refresh_daily())
+    app.state.address_index = AddressIndex(cache_size=int(os.getenv("ADDRESS_CACHE_MAX_SIZE", "100000")))
+    await app.state.address_index.load(app.state.database)
+    address_watch_task: asyncio.Task = asyncio.create_task(
+        app.state.address_index.watch(app.state.database, interval=float(os.getenv("ADDRESS_INDEX_REFRESH_SECONDS", "3600")))
+    )
+    app.state.station_index = StationIndex()
+    await app.state.station_index.load(app.state.database)
+    station_watch_task: asyncio.Task = asyncio.create_task(
+        app.state.station_index.watch(app.state.database, interval=float(os.getenv("STATION_INDEX_REFRESH_SECONDS", "86400")))
+    )
+    app.state.particulate_matter_view = ParticulateMatterView()
+    await app.state.particulate_matter_view.load(app.state.database)
+    particulate_matter_watch_task: asyncio.Task = asyncio.create_task(
+        app.state.particulate_matter_view.watch(app.state.database, interval=float(os.getenv("PM_VIEW_REFRESH_SECONDS", "60")))
+    )
+    upstream_client: httpx.AsyncClient | None = None
+    app.state.upstream_fallback = None
+    if os.getenv("UPSTREAM_FALLBACK", "0") == "1":
+        concurrency: int = int(os.getenv("UPSTREAM_FALLBACK_CONCURRENCY", "10"))
+        upstream_client = IngestionService.create_client(
+            concurrency=concurrency, timeout=float(os.getenv("UPSTREAM_FALLBACK_TIMEOUT_SECONDS", "3"))
+        )
+        app.state.upstream_fallback = UpstreamFallback(IngestionService(
+            database=app.state.database,
+            client=upstream_client,
+            service_key=os.getenv("OPEN_API_KEY", ""),
+            concurrency=concurrency,
+            retries=int(os.getenv("UPSTREAM_FALLBACK_RETRIES", "1")),
+            backoff=0.2,
+        ))
+    cache_collector: metrics.CacheCollector = metrics.CacheCollector(lambda: _get_cache_stats(app))
+    metrics.PROCESS_REGISTRY.register(cache_collector)
+    event_loop_lag_task: asyncio.Task = asyncio.create_task(
+        metrics.watch_event_loop_lag(interval=float(os.getenv("EVENT_LOOP_LAG_INTERVAL_SECONDS", "0.5")))
+    )
+    app.state.warmup = Warmup(started_at=started_at)
+    warmup_task: asyncio.Task | None = None
+    if os.getenv("WARMUP", "1") == "1":
+        # 접근 로그에서 요청이 많은 격자를 찾아 격자 캐시를 채움 (WARMUP_CELLS 는 로그와 관계없이 항상 포함)
+        warmup_task = asyncio.create_task(app.state.warmup.run(
+            app.state.database,
+            nowcast_cache=app.state.nowcast_cache,
+            forecast_cache=app.state.forecast_cache,
+            grid_file=app.state.grid_file,
+            create_service=lambda latitude, longitude: _create_weather_service(app, latitude, longitude),
+            cells=parse_cells(os.getenv("WARMUP_CELLS", "")),
+            log_dir=log_dir,
+            max_cells=min(int(os.getenv("WARMUP_CELLS_LIMIT", "1000")), cache_size),
+            connections=int(os.getenv("WARMUP_CONNECTIONS", "10")),
+        ))
+    else:
+        app.state.warmup.is_ready = True
+        app.state.warmup.phase = "skipped"
+    yield
+    if warmup_task is not None:
+        warmup_task.cancel()
+    event_loop_lag_task.cancel()
+    metrics.PROCESS_REGISTRY.unregister(cache_collector)
+    metrics.mark_process_dead()
+    particulate_matter_watch_task.cancel()
+    station_watch_task.cancel()
+    address_watch_task.cancel()
+    sun_refresh_task.cancel()
+    if upstream_client is not None:
+        await upstream_client.aclose()
+    app.state.database.close()
+    log_listener.stop()
+
+def _get_cache_stats(app: FastAPI) -> dict[str, dict]:
+    return {
+        "nowcast_cache": app.state.nowcast_cache.stats(),
+        "forecast_cache": app.state.forecast_cache.stats(),
+        "address_cache": app.state.address_index.cache.stats(),
+        "response_section_cache": app.state.response_encoder.sections.stats(),
+        "response_brotli_cache": app.state.response_encoder.brotli_bodies.stats(),
+        "stage_last_good_cache": app.state.stage_deadlines.last_good.stats(),
+    }
+
+def _is_not_modified(if_none_match: str | None, etag: str) -> bool:
+    """
+    If-None-Match 헤더가 ETag 와 일치하는지 약한 비교로 확인하는 함수
+    """
+    if if_none_match is None:
+        return False
+    tags: list[str] = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+def _create_weather_service(app: FastAPI, latitude: float, longitude: float) -> WeatherService:
+    """
+    공유 자원을 사용하는 WeatherService 생성 함수 (요청 처리와 시작 준비에서 같은 경로를 쓰도록 함)
+    """
+    return WeatherService(
+        database=app.state.database,
+        latitude=latitude,
+        longitude=longitude,
+        nowcast_cache=app.state.nowcast_cache,
+        forecast_cache=app.state.forecast_cache,
+        address_index=app.state.address_index,
+        station_index=app.state.station_index,
+        particulate_matter_view=app.state.particulate_matter_view,
+        response_encoder=app.state.response_encoder,
+        upstream_fallback=app.state.upstream_fallback,
+        nowcast_flight=app.state.nowcast_flight,
+        forecast_flight=app.state.forecast_flight,
+        particulate_matter_flight=app.state.particulate_matter_flight,
+        stage_deadlines=app.state.stage_deadlines,
+        use_snapshot=app.state.use_snapshot,
+        grid_file=app.state.grid_file,
+    )
+
+def _get_cache_headers(service: WeatherService, now: datetime) -> dict[str, str]:
+    """
+    응답 캐시 헤더 생성 함수 (마지막 정상 값으로 대체한 단계가 있으면 클라이언트·CDN 이 저하된 응답을 그대로 쓰지 않도록 no-cache)
+    """
+    return {
+        "ETag": service.get_etag(),
+        "Cache-Control": "no-cache" if service.stale else f"public, max-age={service.get_max_age(now=now)}",
+        "Vary": "Accept-Encoding",
+    }
+
+app = FastAPI(root_path="/microweather", docs_url=None, redoc_url=None, lifespan=lifespan)
+app.state.database_factory = Database  # 벤치마크 등에서 대체 Database 를 주입할 때 교체
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=["*"],
-    allow_methods=["GET"],
+    allow_methods=["GET", "POST"],
     allow_headers=["*"],
 )
 
@@ -21,10 +219,137 @@ app.add_middleware(
     compresslevel=9,
 )
 
+app.add_middleware(
+    RateLimitMiddleware,
+    limiter=RateLimiter(
+        rate=float(os.getenv("RATE_LIMIT_RATE", "5")),
+        burst=int(os.getenv("RATE_LIMIT_BURST", "5")),
+        block_seconds=float(os.getenv("RATE_LIMIT_BLOCK_SECONDS", "1800")),
+        max_clients=int(os.getenv("RATE_LIMIT_MAX_CLIENTS", "1000000")),
+        idle_seconds=float(os.getenv("RATE_LIMIT_IDLE_SECONDS", "3600")),
+    ),
+    blacklist=Blacklist.load(os.getenv("BLACKLIST_PATH", "blacklist.txt")),
+    excluded_paths=("/metrics", "/ready"),
+)
+
+app.add_middleware(metrics.MetricsMiddleware, excluded_paths=("/metrics", "/ready"))
+
+app.add_middleware(AccessLogMiddleware)
+
 @app.get("", response_model=WeatherModel)
-async def get_weather(latitude: float, longitude: float):
-    return await WeatherService(latitude=latitude, longitude=longitude).get_weather()
+async def get_weather(request: Request, latitude: float, longitude: float):
+    service: WeatherService = _create_weather_service(request.app, latitude, longitude)
+    log_fields(grid_x=service.grid_coord["grid_x"], grid_y=service.grid_coord["grid_y"])
+    now: datetime = datetime.now()
+    if_none_match: str | None = request.headers.get("If-None-Match")
 
-if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=8089)
+    # 조건부 요청은 메모리 자원만으로 버전을 확인할 수 있으면 단계 실행 전에 304 응답
+    if if_none_match is not None and service.check_cached_versions(now=now) and _is_not_modified(if_none_match, service.get_etag()):
+        return Response(status_code=304, headers=_get_cache_headers(service, now))
+
+    encoding: str = choose_encoding(request.headers.get("Accept-Encoding", ""))
+    body: bytes = await service.get_encoded_weather(encoding=encoding)
+    headers: dict[str, str] = _get_cache_headers(service, now)
+    if _is_not_modified(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
+
+@app.post("/batch", response_model=list[BatchItemModel])
+async def get_weather_batch(request: Request, body: BatchRequestModel):
+    return await BatchWeatherService(
+        database=request.app.state.database,
+        coordinates=body.coordinates,
+        nowcast_cache=request.app.state.nowcast_cache,
+        forecast_cache=request.app.state.forecast_cache,
+        address_index=request.app.state.address_index,
+        station_index=request.app.state.station_index,
+        particulate_matter_view=request.app.state.particulate_matter_view,
+        grid_file=request.app.state.grid_file,
+        upstream_fallback=request.app.state.upstream_fallback,
+        nowcast_flight=request.app.state.nowcast_flight,
+        forecast_flight=request.app.state.forecast_flight,
+        particulate_matter_flight=request.app.state.particulate_matter_flight,
+        stage_deadlines=request.app.state.stage_deadlines,
+    ).get_weather()
+
+@app.get("/history")
+async def get_history(
+    request: Request,
+    start: datetime,
+    end: datetime,
+    latitude: float | None = None,
+    longitude: float | None = None,
+    grid_x: int | None = None,
+    grid_y: int | None = None,
+    output_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+):
+    grid_x, grid_y = history.resolve_history_cell(latitude=latitude, longitude=longitude, grid_x=grid_x, grid_y=grid_y)
+    # 응답 헤더를 보낸 뒤 스트리밍 중에 비교 오류가 나지 않도록 StreamingResponse 생성 전에 변환
+    start, end = history.to_kst_naive(start), history.to_kst_naive(end)
+    history.check_history_range(start=start, end=end, max_days=request.app.state.history_max_days)
+    log_fields(grid_x=grid_x, grid_y=grid_y)
+
+    # 커서 배치와 제너레이터로 읽는 즉시 내보내므로 기간 길이와 관계없이 메모리 사용량이 일정
+    rows = history.iter_history(request.app.state.database, grid_x=grid_x, grid_y=grid_y, start=start, end=end)
+    if output_format == "csv":
+        filename: str = f"nowcast_{grid_x}_{grid_y}_{start:%Y%m%d%H%M}_{end:%Y%m%d%H%M}.csv"
+        return StreamingResponse(
+            history.to_csv(rows), media_type="text/csv", headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+        )
+    return StreamingResponse(history.to_ndjson(rows), media_type="application/x-ndjson")
 
+@app.get("/grid")
+async def get_grid(
+    request: Request,
+    south: float,
+    west: float,
+    north: float,
+    east: float,
+    fields: str = export.DEFAULT_EXPORT_FIELDS,
+    output_format: Literal["json", "binary"] = Query("json", alias="format"),
+):
+    grid_x_range, grid_y_range = export.to_grid_range(south=south, west=west, north=north, east=east)
+    grid_export: export.GridExport = export.GridExport(
+        request.app.state.grid_file, grid_x_range, grid_y_range, export.parse_export_fields(fields)
+    )
+    log_fields(grid_x_range=list(grid_x_range), grid_y_range=list(grid_y_range))
+    if output_format == "binary":
+        return StreamingResponse(grid_export.iter_binary(), media_type="application/octet-stream")
+    return StreamingResponse(grid_export.iter_json(), media_type="application/json")
+
+@app.get("/stats")
+async def get_stats(request: Request):
+    upstream_fallback: UpstreamFallback | None = request.app.state.upstream_fallback
+    grid_file: GridFile | None = request.app.state.grid_file
+    return _get_cache_stats(request.app) | {
+        "grid_file": grid_file.stats() if grid_file is not None else None,
+        "upstream_fallback": upstream_fallback.stats() if upstream_fallback is not None else None,
+        "stage_deadlines": request.app.state.stage_deadlines.stats(),
+        "single_flight": {
+            flight.name: flight.stats()
+            for flight in (request.app.state.nowcast_flight, request.app.state.forecast_flight, request.app.state.particulate_matter_flight)
+        },
+    }
+
+@app.get("/ready", include_in_schema=False)
+async def get_ready(request: Request):
+    # 로드 밸런서 준비 상태 확인용, 시작 준비가 끝나기 전에는 503 으로 트래픽을 받지 않음
+    warmup: Warmup = request.app.state.warmup
+    return JSONResponse(status_code=200 if warmup.is_ready else 503, content=warmup.stats())
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
+
+if __name__ == "__main__":
+    # 워커가 여러 개면 격자 데이터는 GRID_SNAPSHOT_PATH 파일 매핑으로 공유하고,
+    # 지표는 prometheus_client 멀티 프로세스 모드로 워커별 파일에 기록해 /metrics 에서 합침 (워커는 환경 변수를 물려받아 시작)
+    # uvicorn/gunicorn 을 직접 여러 워커로 실행할 때도 PROMETHEUS_MULTIPROC_DIR 를 비어 있는 디렉터리로 설정해야 함
+    workers: int = int(os.getenv("WEB_CONCURRENCY", "1"))
+    if workers > 1:
+        os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", tempfile.mkdtemp(prefix="microweather-metrics-"))
+        metrics.prepare_multiprocess_dir(os.environ["PROMETHEUS_MULTIPROC_DIR"])
+    uvicorn.run("main:app", host="0.0.0.0", port=8089, workers=workers)
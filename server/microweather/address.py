@@ -0,0 +1,120 @@
+import bson
+import asyncio
+import hashlib
+import shapely
+import numpy as np
+from pymongo.errors import OperationFailure
+from app.microweather.cache import LRUCache
+from app.microweather.database import Database
+
+
+class AddressIndex:
+    def __init__(self, cache_size: int = 100000, precision: int = 4) -> None:
+        """
+        읍면동 경계 폴리곤을 메모리에 올려 역지오코딩하는 공간 인덱스 (STRtree + prepared geometry)
+        MongoDB location 컬렉션이 원본이며 load/reload 로 다시 불러옴
+        :param cache_size: int 양자화 좌표 캐시 최대 크기
+        :param precision: int 캐시 키로 사용할 위경도 소수점 자릿수 (4 자리 ≒ 10m)
+        """
+        self.precision: int = precision
+        self.cache: LRUCache = LRUCache(max_size=cache_size)
+        self.tree: shapely.STRtree | None = None
+        self.geometries: np.ndarray = np.empty(0, dtype=object)
+        self.locations: list[str] = []
+        self.fingerprint: str | None = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.tree is not None
+
+    @staticmethod
+    def _build(documents: list[dict]) -> tuple[shapely.STRtree, np.ndarray, list[str]]:
+        """
+        GeoJSON 문서 목록으로 STRtree 와 prepared geometry 배열을 생성하는 메소드 (워커 스레드에서 실행)
+        :param documents: list[dict]
+        :return: tuple[shapely.STRtree, np.ndarray, list[str]]
+        """
+        geometries: np.ndarray = np.array([shapely.geometry.shape(document["geometry"]) for document in documents], dtype=object)
+        shapely.prepare(geometries)
+        locations: list[str] = [document["location"] for document in documents]
+        return shapely.STRtree(geometries), geometries, locations
+
+    @staticmethod
+    async def _get_fingerprint(database: Database) -> str:
+        """
+        경계 데이터 변경 여부를 판단하기 위한 내용 해시 조회 메소드 (문서 추가·삭제와 경계·이름의 제자리 수정 모두 반영)
+        dbHash 명령으로 서버에서 location 컬렉션 내용 해시를 계산하고, 지원하지 않는 환경(mongos, 권한 없음)에서는 문서를 읽어 직접 계산
+        :param database: Database
+        :return: str
+        """
+        try:
+            result: dict = await database.database.command("dbHash", collections=["location"])
+            return result["collections"].get("location", "")
+        except OperationFailure:
+            digest = hashlib.blake2b(digest_size=16)
+            cursor = database.location.find({}, projection={"_id": 1, "geometry": 1, "location": 1}, sort=[("_id", 1)])
+            async for document in cursor:
+                digest.update(bson.encode(document))
+            return digest.hexdigest()
+
+    async def load(self, database: Database) -> None:
+        """
+        location 컬렉션 전체를 불러와 인덱스를 새로 만드는 메소드 (완성 후 한 번에 교체)
+        :param database: Database
+        """
+        fingerprint: tuple = await self._get_fingerprint(database)
+        documents: list[dict] = await database.location.find({}, projection={"_id": 0, "geometry": 1, "location": 1}).to_list(length=None)
+        tree, geometries, locations = await asyncio.to_thread(self._build, documents)
+
+        self.tree, self.geometries, self.locations = tree, geometries, locations
+        self.fingerprint = fingerprint
+        self.cache.clear()
+
+    async def reload_if_changed(self, database: Database) -> bool:
+        """
+        경계 데이터가 변경되었으면 인덱스를 다시 불러오는 메소드
+        :param database: Database
+        :return: bool 다시 불러왔는지 여부
+        """
+        if await self._get_fingerprint(database) == self.fingerprint:
+            return False
+        await self.load(database)
+        return True
+
+    async def watch(self, database: Database, interval: float) -> None:
+        """
+        interval 초마다 경계 데이터 변경을 확인하는 백그라운드 작업
+        :param database: Database
+        :param interval: float
+        """
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.reload_if_changed(database)
+            except Exception:
+                # 조회 실패 시 기존 인덱스를 유지하고 다음 주기에 다시 시도
+                continue
+
+    def lookup(self, latitude: float, longitude: float) -> str | None:
+        """
+        위경도가 포함된 읍면동 이름을 반환하는 메소드 (포함된 폴리곤이 없으면 None)
+        :param latitude: float
+        :param longitude: float
+        :return: str | None
+        """
+        key: tuple[float, float] = (round(latitude, self.precision), round(longitude, self.precision))
+        cached: str | None = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        point: shapely.Point = shapely.Point(longitude, latitude)
+        candidates: np.ndarray = self.tree.query(point)
+        if len(candidates) == 0:
+            return None
+        matches: np.ndarray = candidates[shapely.intersects(self.geometries[candidates], point)]
+        if len(matches) == 0:
+            return None
+
+        location: str = self.locations[int(matches.min())]
+        self.cache.put(key, location)
+        return location
@@ -0,0 +1,297 @@
+import asyncio
+import logging
+import numpy as np
+from typing import Any, Awaitable
+from datetime import datetime
+from fastapi import HTTPException
+from motor.motor_asyncio import AsyncIOMotorCollection
+from app.microweather import grid
+from app.microweather.cache import CellCache
+from app.microweather.gridfile import GridFile
+from app.microweather.fallback import UpstreamFallback
+from app.microweather.singleflight import SingleFlight
+from app.microweather.deadline import StageDeadlines
+from app.microweather.address import AddressIndex
+from app.microweather.station import StationIndex
+from app.microweather.particulate import ParticulateMatterView
+from app.microweather.database import Database
+from app.microweather.service import WeatherService
+from app.microweather.models import (
+    WeatherModel, NowcastModel, ForecastModel, CoordinateModel, BatchItemModel, BatchErrorModel
+)
+
+logger: logging.Logger = logging.getLogger("microweather.batch")
+
+
+class BatchWeatherService:
+    def __init__(
+        self,
+        database: Database,
+        coordinates: list[CoordinateModel],
+        nowcast_cache: CellCache | None = None,
+        forecast_cache: CellCache | None = None,
+        address_index: AddressIndex | None = None,
+        station_index: StationIndex | None = None,
+        particulate_matter_view: ParticulateMatterView | None = None,
+        concurrency: int = 32,
+        grid_file: GridFile | None = None,
+        upstream_fallback: UpstreamFallback | None = None,
+        nowcast_flight: SingleFlight | None = None,
+        forecast_flight: SingleFlight | None = None,
+        particulate_matter_flight: SingleFlight | None = None,
+        stage_deadlines: StageDeadlines | None = None,
+    ) -> None:
+        """
+        클래스 초기화 메소드
+        :param database: 애플리케이션 수명 동안 공유하는 Database (커넥션 풀)
+        :param coordinates: 조회할 위경도 목록
+        :param nowcast_cache: 초단기실황 격자 캐시
+        :param forecast_cache: 초단기예보 격자 캐시
+        :param address_index: 읍면동 공간 인덱스
+        :param station_index: 미세먼지 측정소 인덱스
+        :param particulate_matter_view: 측정소별 최신 미세먼지 뷰
+        :param concurrency: 주소/일출/미세먼지 조회를 동시에 실행할 최대 지점 수
+        :param grid_file: 워커 간 공유하는 메모리 매핑 격자 파일 (최신 발표분이 아닌 격자는 캐시·MongoDB 조회)
+        :param upstream_fallback: 일괄 조회에 없는 격자의 기상청 API 직접 조회 (WeatherService 와 같음)
+        :param nowcast_flight: 일괄 조회에 없는 격자의 초단기실황 동시 조회 합치기
+        :param forecast_flight: 일괄 조회에 없는 격자의 초단기예보 동시 조회 합치기
+        :param particulate_matter_flight: 같은 측정소 목록의 미세먼지 동시 조회 합치기
+        :param stage_deadlines: 단계별 제한 시간과 마지막 정상 값 (WeatherService 와 같은 키 사용)
+        """
+        self.database: Database = database
+        self.coordinates: list[CoordinateModel] = coordinates
+        self.nowcast_cache: CellCache | None = nowcast_cache
+        self.forecast_cache: CellCache | None = forecast_cache
+        self.address_index: AddressIndex | None = address_index
+        self.station_index: StationIndex | None = station_index
+        self.particulate_matter_view: ParticulateMatterView | None = particulate_matter_view
+        self.concurrency: int = concurrency
+        self.grid_file: GridFile | None = grid_file
+        self.upstream_fallback: UpstreamFallback | None = upstream_fallback
+        self.nowcast_flight: SingleFlight | None = nowcast_flight
+        self.forecast_flight: SingleFlight | None = forecast_flight
+        self.particulate_matter_flight: SingleFlight | None = particulate_matter_flight
+        self.stage_deadlines: StageDeadlines | None = stage_deadlines
+
+    async def get_weather(self) -> list[BatchItemModel]:
+        """
+        클래스 외부 실행용 최종 데이터 반환 메소드 (입력 순서 유지, 지점별 오류 반환)
+        :return: list[BatchItemModel]
+        """
+        items: list[BatchItemModel | None] = [None] * len(self.coordinates)
+        valid_indexes: list[int] = []
+        for index, coordinate in enumerate(self.coordinates):
+            try:
+                WeatherService.is_valid_coordinates(latitude=coordinate.latitude, longitude=coordinate.longitude)
+            except HTTPException as e:
+                items[index] = BatchItemModel(error=self._to_error(e))
+            else:
+                valid_indexes.append(index)
+
+        if not valid_indexes:
+            return items
+
+        grid_x, grid_y = grid.to_grid_batch(
+            np.array([self.coordinates[index].latitude for index in valid_indexes]),
+            np.array([self.coordinates[index].longitude for index in valid_indexes]),
+        )
+        cells: list[tuple[int, int]] = list(zip(grid_x.tolist(), grid_y.tolist()))
+        unique_cells: list[tuple[int, int]] = list(dict.fromkeys(cells))
+
+        nowcast_map, forecast_map = await asyncio.gather(
+            self._prefetch("nowcast", self.get_nowcasts(unique_cells)),
+            self._prefetch("forecast", self.get_forecasts(unique_cells)),
+        )
+
+        semaphore: asyncio.Semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def build(index: int, cell: tuple[int, int]) -> None:
+            async with semaphore:
+                items[index] = await self._get_item(self.coordinates[index], cell, nowcast_map, forecast_map)
+
+        await asyncio.gather(*(build(index, cell) for index, cell in zip(valid_indexes, cells)))
+        return items
+
+    async def _get_item(
+        self,
+        coordinate: CoordinateModel,
+        cell: tuple[int, int],
+        nowcast_map: dict[tuple[int, int], NowcastModel],
+        forecast_map: dict[tuple[int, int], list[ForecastModel]],
+    ) -> BatchItemModel:
+        """
+        지점 하나의 결과를 만드는 메소드
+        격자 단위 데이터는 미리 조회한 결과를 사용하고, 일괄 조회에 없는 격자와 주소·미세먼지는 단건 조회와 같은 단계
+        (동시 조회 합치기, 기상청 API 직접 조회, 단계별 제한 시간과 마지막 정상 값)로 조회
+        :return: BatchItemModel
+        """
+        try:
+            service: WeatherService = WeatherService(
+                database=self.database,
+                latitude=coordinate.latitude,
+                longitude=coordinate.longitude,
+                nowcast_cache=self.nowcast_cache,
+                forecast_cache=self.forecast_cache,
+                grid_coord={"grid_x": cell[0], "grid_y": cell[1]},
+                address_index=self.address_index,
+                station_index=self.station_index,
+                particulate_matter_view=self.particulate_matter_view,
+                upstream_fallback=self.upstream_fallback,
+                nowcast_flight=self.nowcast_flight,
+                forecast_flight=self.forecast_flight,
+                particulate_matter_flight=self.particulate_matter_flight,
+                stage_deadlines=self.stage_deadlines,
+            )
+            address, is_sunrise, nowcast, forecast, particulate_matter = await asyncio.gather(
+                service.run_stage("address"),
+                service.run_stage("sunrise"),
+                self._get_cell_stage(service, "nowcast", cell, nowcast_map),
+                self._get_cell_stage(service, "forecast", cell, forecast_map),
+                service.run_stage("particulate_matter"),
+            )
+            return BatchItemModel(weather=WeatherModel(
+                address=address,
+                is_sunrise=is_sunrise,
+                nowcast=nowcast,
+                forecast=forecast,
+                particulate_matter=particulate_matter,
+                stale=sorted(service.stale),
+            ))
+        except Exception as e:
+            return BatchItemModel(error=self._to_error(e))
+
+    async def _prefetch(self, stage: str, awaitable: Awaitable[dict]) -> dict:
+        """
+        격자 단위 일괄 조회를 단계 제한 시간 안에 실행하는 메소드
+        실패하거나 제한 시간을 넘기면 빈 결과를 반환해 모든 격자가 단건 조회 경로(동시 조회 합치기, 기상청 API 직접 조회,
+        단계별 제한 시간과 마지막 정상 값)로 처리되도록 함 (일괄 조회 오류로 요청 전체가 실패하지 않음)
+        :param stage: str ("nowcast", "forecast")
+        :param awaitable: Awaitable[dict]
+        :return: dict
+        """
+        timeout: float | None = self.stage_deadlines.deadlines.get(stage) if self.stage_deadlines is not None else None
+        try:
+            return await asyncio.wait_for(awaitable, timeout=timeout)
+        except Exception as e:
+            logger.warning(f"{stage} 일괄 조회 실패, 격자별 조회로 대체 : {e!r}")
+            return {}
+
+    @staticmethod
+    async def _get_cell_stage(service: WeatherService, stage: str, cell: tuple[int, int], prefetched: dict[tuple[int, int], Any]) -> Any:
+        """
+        미리 조회한 격자 데이터를 반환하고, 없으면 WeatherService 단계(단건 조회 경로)로 조회하는 메소드
+        :param service: WeatherService
+        :param stage: str ("nowcast", "forecast")
+        :param cell: tuple[int, int]
+        :param prefetched: dict 일괄 조회 결과
+        :return: Any
+        """
+        if cell in prefetched:
+            return prefetched[cell]
+        return await service.run_stage(stage)
+
+    async def get_nowcasts(self, cells: list[tuple[int, int]]) -> dict[tuple[int, int], NowcastModel]:
+        """
+        여러 격자의 초단기실황을 격자 파일, 캐시와 한 번의 집계 쿼리로 조회하는 메소드
+        :param cells: list[tuple[int, int]]
+        :return: dict[tuple[int, int], NowcastModel]
+        """
+        nowcast_map: dict[tuple[int, int], NowcastModel] = {}
+        missing_cells: list[tuple[int, int]] = self._from_cache(
+            self.nowcast_cache, self._from_grid_file("nowcast", cells, nowcast_map), nowcast_map
+        )
+
+        documents: dict[tuple[int, int], dict] = await self._find_latest(self.database.nowcast, missing_cells)
+        for cell, document in documents.items():
+            nowcast_map[cell] = WeatherService.to_nowcast_model(document)
+            if self.nowcast_cache is not None:
+                self.nowcast_cache.put(cell, nowcast_map[cell], tm=document["tm"])
+        return nowcast_map
+
+    async def get_forecasts(self, cells: list[tuple[int, int]]) -> dict[tuple[int, int], list[ForecastModel]]:
+        """
+        여러 격자의 초단기예보를 격자 파일, 캐시와 한 번의 집계 쿼리로 조회하는 메소드
+        :param cells: list[tuple[int, int]]
+        :return: dict[tuple[int, int], list[ForecastModel]]
+        """
+        forecast_map: dict[tuple[int, int], list[ForecastModel]] = {}
+        missing_cells: list[tuple[int, int]] = self._from_cache(
+            self.forecast_cache, self._from_grid_file("forecast", cells, forecast_map), forecast_map
+        )
+
+        documents: dict[tuple[int, int], dict] = await self._find_latest(self.database.forecast, missing_cells)
+        for cell, document in documents.items():
+            forecast_map[cell] = WeatherService.to_forecast_models(document)
+            if self.forecast_cache is not None:
+                self.forecast_cache.put(cell, forecast_map[cell], tm=document["tm"])
+        return forecast_map
+
+    def _from_grid_file(self, kind: str, cells: list[tuple[int, int]], result: dict) -> list[tuple[int, int]]:
+        """
+        격자 파일에 최신 발표분이 있는 격자는 result 에 채우고 나머지 격자 목록을 반환하는 메소드
+        :param kind: str ("nowcast", "forecast")
+        :return: list[tuple[int, int]]
+        """
+        if self.grid_file is None:
+            return cells
+
+        now: datetime = datetime.now()
+        missing_cells: list[tuple[int, int]] = []
+        for grid_x, grid_y in cells:
+            if kind == "nowcast":
+                entry: tuple | None = self.grid_file.get_nowcast(grid_x=grid_x, grid_y=grid_y)
+            else:
+                entry = self.grid_file.get_forecast(grid_x=grid_x, grid_y=grid_y)
+            if entry is not None and WeatherService.is_latest(kind, entry[1], now):
+                result[(grid_x, grid_y)] = entry[0]
+            else:
+                missing_cells.append((grid_x, grid_y))
+        return missing_cells
+
+    @staticmethod
+    def _from_cache(cache: CellCache | None, cells: list[tuple[int, int]], result: dict) -> list[tuple[int, int]]:
+        """
+        캐시에 있는 격자는 result 에 채우고 캐시에 없는 격자 목록을 반환하는 메소드
+        :return: list[tuple[int, int]]
+        """
+        if cache is None:
+            return cells
+
+        missing_cells: list[tuple[int, int]] = []
+        for cell in cells:
+            cached = cache.get(cell)
+            if cached is None:
+                missing_cells.append(cell)
+            else:
+                result[cell] = cached
+        return missing_cells
+
+    @staticmethod
+    async def _find_latest(collection: AsyncIOMotorCollection, cells: list[tuple[int, int]]) -> dict[tuple[int, int], dict]:
+        """
+        격자별 최신(tm 기준) 문서를 집계 쿼리 한 번으로 조회하는 메소드
+        {nx, ny, tm: -1} 인덱스를 그대로 사용하도록 같은 순서로 정렬
+        :param collection: AsyncIOMotorCollection
+        :param cells: list[tuple[int, int]]
+        :return: dict[tuple[int, int], dict]
+        """
+        if not cells:
+            return {}
+
+        documents: list[dict] = await collection.aggregate([
+            {"$match": {"$or": [{"nx": grid_x, "ny": grid_y} for grid_x, grid_y in cells]}},
+            {"$sort": {"nx": 1, "ny": 1, "tm": -1}},
+            {"$group": {"_id": {"nx": "$nx", "ny": "$ny"}, "document": {"$first": "$$ROOT"}}},
+        ], allowDiskUse=True).to_list(length=None)
+        return {(document["_id"]["nx"], document["_id"]["ny"]): document["document"] for document in documents}
+
+    @staticmethod
+    def _to_error(exception: Exception) -> BatchErrorModel:
+        """
+        지점별 예외를 응답용 오류 모델로 변환하는 메소드
+        :param exception: Exception
+        :return: BatchErrorModel
+        """
+        if isinstance(exception, HTTPException):
+            return BatchErrorModel(status_code=exception.status_code, detail=str(exception.detail))
+        return BatchErrorModel(status_code=500, detail="Internal Server Error")
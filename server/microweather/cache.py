@@ -0,0 +1,184 @@
+from typing import Any, Hashable
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from app.microweather.release import latest_base_time, next_release_time
+
+
+class LRUCache:
+    def __init__(self, max_size: int = 10000) -> None:
+        """
+        만료 시간 없이 크기만 제한하는 LRU 캐시
+        :param max_size: int 최대 저장 항목 수
+        """
+        self.max_size: int = max_size
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+
+    def get(self, key: Hashable) -> Any | None:
+        """
+        캐시 조회 메소드
+        :param key: Hashable
+        :return: Any | None
+        """
+        value: Any | None = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        캐시 저장 메소드
+        :param key: Hashable
+        :param value: Any
+        """
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        캐시 전체 삭제 메소드
+        """
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        캐시 크기 산정용 통계 반환 메소드
+        :return: dict
+        """
+        lookups: int = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+class CellCache:
+    def __init__(self, release_minute: int, max_size: int = 10000, retry_seconds: int = 60) -> None:
+        """
+        격자 좌표 (grid_x, grid_y) 를 키로 하는 크기 제한 LRU 캐시
+        만료는 항목마다 저장 시점의 최신 발표 시각(latest_base_time)과 비교해 결정
+        최신 발표분이면 다음 발표 시각에, 아직 수집되지 않은 이전 발표분이면 retry_seconds 후에 만료되며
+        수집이 격자 단위로 나누어 진행되어도 다른 격자의 tm 때문에 아직 갱신되지 않은 격자가 무효화되지 않음
+        :param release_minute: int 발표 데이터가 조회 가능해지는 분 (release.py 참고)
+        :param max_size: int 최대 저장 격자 수
+        :param retry_seconds: int 수집이 지연되어 최신 발표분이 아닌 데이터를 캐시할 때의 만료 시간(초)
+        """
+        self.release_minute: int = release_minute
+        self.max_size: int = max_size
+        self.retry_seconds: int = retry_seconds
+        self.latest_tm: datetime | None = None  # 통계용, 저장된 가장 최신 tm
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.expirations: int = 0
+        self._entries: OrderedDict[Hashable, tuple[Any, datetime, datetime]] = OrderedDict()
+
+    def get(self, key: Hashable, now: datetime | None = None) -> Any | None:
+        """
+        캐시 조회 메소드 (만료되었으면 None)
+        :param key: Hashable
+        :param now: datetime
+        :return: Any | None
+        """
+        entry: tuple[Any, datetime] | None = self.get_entry(key, now=now)
+        return entry[0] if entry is not None else None
+
+    def get_entry(self, key: Hashable, now: datetime | None = None) -> tuple[Any, datetime] | None:
+        """
+        캐시 조회 메소드 (값과 데이터 발표 시각을 함께 반환, 만료되었으면 None)
+        :param key: Hashable
+        :param now: datetime
+        :return: tuple[Any, datetime] | None
+        """
+        entry: tuple[Any, datetime, datetime] | None = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, tm, expires_at = entry
+        now = now if now is not None else datetime.now()
+        if now >= expires_at:
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value, tm
+
+    def get_tm(self, key: Hashable, now: datetime | None = None) -> datetime | None:
+        """
+        유효한 항목의 데이터 발표 시각만 확인하는 메소드 (통계와 LRU 순서에 영향 없음)
+        :param key: Hashable
+        :param now: datetime
+        :return: datetime | None
+        """
+        entry: tuple[Any, datetime, datetime] | None = self._entries.get(key)
+        if entry is None:
+            return None
+
+        _, tm, expires_at = entry
+        now = now if now is not None else datetime.now()
+        if now >= expires_at:
+            return None
+        return tm
+
+    def put(self, key: Hashable, value: Any, tm: datetime, now: datetime | None = None) -> None:
+        """
+        캐시 저장 메소드
+        :param key: Hashable
+        :param value: Any
+        :param tm: datetime 데이터 발표 시각
+        :param now: datetime
+        """
+        now = now if now is not None else datetime.now()
+        if self.latest_tm is None or tm > self.latest_tm:
+            self.latest_tm = tm
+
+        if tm < latest_base_time(now, self.release_minute):
+            # 최신 발표분이 아직 수집되지 않은 경우 짧은 주기로 다시 조회
+            expires_at: datetime = now + timedelta(seconds=self.retry_seconds)
+        else:
+            expires_at = next_release_time(now, self.release_minute)
+
+        self._entries[key] = (value, tm, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        캐시 전체 삭제 메소드
+        """
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        캐시 크기 산정용 통계 반환 메소드
+        :return: dict
+        """
+        lookups: int = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "latest_tm": self.latest_tm,
+        }
@@ -0,0 +1,104 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Hashable
+from fastapi import HTTPException
+from app.microweather.cache import LRUCache
+from app.microweather.metrics import STAGE_FALLBACKS
+
+logger: logging.Logger = logging.getLogger("microweather.deadline")
+
+
+def parse_deadlines(value: str, default: float | None = None, stages: tuple[str, ...] = ()) -> dict[str, float]:
+    """
+    "address=0.2,particulate_matter=0.3" 형식의 단계별 제한 시간(초) 설정을 읽는 함수
+    :param value: str 단계별 설정 (빈 문자열이면 기본값만 사용)
+    :param default: float | None stages 중 설정이 없는 단계의 제한 시간 (None 또는 0 이하면 제한 없음)
+    :param stages: tuple[str, ...] 기본값을 적용할 단계 이름
+    :return: dict[str, float]
+    """
+    deadlines: dict[str, float] = {stage: default for stage in stages} if default is not None and default > 0 else {}
+    for item in filter(None, (item.strip() for item in value.split(","))):
+        stage, seconds = item.split("=", 1)
+        if float(seconds) > 0:
+            deadlines[stage.strip()] = float(seconds)
+        else:
+            deadlines.pop(stage.strip(), None)
+    return deadlines
+
+
+class StageDeadlines:
+    def __init__(self, deadlines: dict[str, float], max_size: int = 100000) -> None:
+        """
+        응답 구성 단계별 제한 시간과 마지막 정상 값(last known good)을 관리하는 클래스
+        단계가 제한 시간을 넘기거나 실패하면 같은 키의 마지막 정상 값으로 응답하고 (stale 표시),
+        진행 중이던 조회는 백그라운드에서 끝까지 실행해 마지막 정상 값을 갱신
+        :param deadlines: dict[str, float] 단계 이름 -> 제한 시간(초), 없는 단계는 제한 없음
+        :param max_size: int 단계별·키별 마지막 정상 값 최대 보관 수
+        """
+        self.deadlines: dict[str, float] = deadlines
+        self.last_good: LRUCache = LRUCache(max_size=max_size)
+        self.timeouts: int = 0
+        self.failures: int = 0
+        self.stale: int = 0
+        self._refreshing: set[asyncio.Task] = set()
+
+    async def run(self, stage: str, key: Hashable, awaitable: Awaitable[tuple[Any, Any]]) -> tuple[Any, Any, bool]:
+        """
+        단계 하나를 제한 시간 안에 실행하는 메소드
+        제한 시간 초과나 실패 시 마지막 정상 값이 없으면 끝까지 기다리거나 예외를 그대로 전파
+        4xx HTTPException 은 정상 응답(데이터 없음 등)으로 보고 대체하지 않음
+        :param stage: str 단계 이름
+        :param key: Hashable 마지막 정상 값 키 (격자 좌표 등)
+        :param awaitable: Awaitable 결과로 (값, 버전) 을 반환
+        :return: tuple[Any, Any, bool] (값, 버전, stale 여부)
+        """
+        task: asyncio.Future = asyncio.ensure_future(awaitable)
+        task.add_done_callback(lambda done: self._store(stage, key, done))
+        try:
+            value, version = await asyncio.wait_for(asyncio.shield(task), timeout=self.deadlines.get(stage))
+        except asyncio.TimeoutError:
+            reason: str = "timeout"
+        except HTTPException as e:
+            if e.status_code < 500:
+                raise
+            reason = "error"
+        except Exception:
+            reason = "error"
+        else:
+            return value, version, False
+
+        last_good: tuple[Any, Any] | None = self.last_good.get((stage, key))
+        if last_good is None:
+            # 대체할 값이 없으면 제한 시간을 넘겨도 결과를 기다리고, 실패는 그대로 전파
+            value, version = await asyncio.shield(task)
+            return value, version, False
+
+        if reason == "timeout":
+            self.timeouts += 1
+            self._refreshing.add(task)
+            task.add_done_callback(self._refreshing.discard)
+        else:
+            self.failures += 1
+            logger.warning("%s %s 조회 실패로 마지막 정상 값 사용", stage, key, exc_info=task.exception())
+        self.stale += 1
+        STAGE_FALLBACKS.labels(stage=stage, reason=reason).inc()
+        return last_good[0], last_good[1], True
+
+    def _store(self, stage: str, key: Hashable, task: asyncio.Future) -> None:
+        if task.cancelled() or task.exception() is not None:
+            return
+        self.last_good.put((stage, key), task.result())
+
+    def stats(self) -> dict:
+        """
+        제한 시간 초과·실패 수와 마지막 정상 값으로 응답한 수 반환 메소드
+        :return: dict
+        """
+        return {
+            "deadlines": self.deadlines,
+            "timeouts": self.timeouts,
+            "failures": self.failures,
+            "stale": self.stale,
+            "refreshing": len(self._refreshing),
+            "last_good": self.last_good.stats(),
+        }
@@ -0,0 +1,174 @@
+import zlib
+import struct
+import brotli
+from typing import Callable, Hashable
+from pydantic import BaseModel, TypeAdapter
+from app.microweather.cache import LRUCache
+from app.microweather.models import NowcastModel, ForecastModel, ParticulateMatterModel
+
+ENCODINGS: tuple[str, ...] = ("br", "gzip", "identity")
+
+_GZIP_HEADER: bytes = b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff"
+_DEFLATE_FINAL_BLOCK: bytes = b"\x03\x00"  # 비어 있는 마지막 고정 허프만 블록
+_STRING_ADAPTER: TypeAdapter = TypeAdapter(str)
+_FORECAST_ADAPTER: TypeAdapter = TypeAdapter(list[ForecastModel])
+_STALE_ADAPTER: TypeAdapter = TypeAdapter(list[str])
+
+
+def content_key(*models: BaseModel) -> tuple:
+    """
+    모델 필드 값으로 만든 조각 내용 키 (같은 발표 시각 문서가 그대로 다시 저장되어 값이 바뀌어도 다른 키가 되도록 함)
+    :param models: BaseModel
+    :return: tuple
+    """
+    return tuple(tuple(model.__dict__.values()) for model in models)
+
+
+def choose_encoding(accept_encoding: str) -> str:
+    """
+    Accept-Encoding 헤더에서 사용할 인코딩을 고르는 함수 (br > gzip > identity, q=0 은 제외)
+    :param accept_encoding: str
+    :return: str
+    """
+    accepted: set[str] = set()
+    for item in accept_encoding.lower().split(","):
+        name, _, parameters = item.strip().partition(";")
+        quality: str = parameters.strip().removeprefix("q=").strip()
+        try:
+            if quality and float(quality) == 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(name.strip())
+    for encoding in ENCODINGS[:-1]:
+        if encoding in accepted or "*" in accepted:
+            return encoding
+    return "identity"
+
+
+class EncodedSection:
+    def __init__(self, raw: bytes, level: int = 9) -> None:
+        """
+        응답 JSON 의 한 조각과, 다른 조각 뒤에 그대로 이어 붙일 수 있는 raw deflate 압축본
+        (Z_FULL_FLUSH 로 바이트 경계에서 끝나고 이전 조각을 참조하지 않으므로 순서대로 연결하면 하나의 deflate 스트림이 됨)
+        :param raw: bytes
+        :param level: int 압축 레벨
+        """
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        self.raw: bytes = raw
+        self.deflated: bytes = compressor.compress(raw) + compressor.flush(zlib.Z_FULL_FLUSH)
+
+
+class ResponseEncoder:
+    def __init__(self, max_size: int = 100000, brotli_max_size: int = 20000, gzip_level: int = 9, brotli_quality: int = 9) -> None:
+        """
+        격자/측정소 단위로 변하지 않는 응답 조각을 직렬화·압축된 바이트로 보관하고, 요청마다 바이트 연결로 응답 본문을 만드는 클래스
+        gzip 은 조각별 deflate 결과를 이어 붙이고, brotli 는 스트림 연결이 불가능하므로 조각 조합별 압축 결과를 캐시
+        :param max_size: int 최대 보관 조각 수
+        :param brotli_max_size: int 최대 보관 brotli 본문 수
+        :param gzip_level: int
+        :param brotli_quality: int
+        """
+        self.gzip_level: int = gzip_level
+        self.brotli_quality: int = brotli_quality
+        self.sections: LRUCache = LRUCache(max_size=max_size)
+        self.brotli_bodies: LRUCache = LRUCache(max_size=brotli_max_size)
+
+    def section(self, key: Hashable, build: Callable[[], bytes]) -> tuple[Hashable, EncodedSection]:
+        """
+        key 에 해당하는 조각을 반환하는 메소드 (없으면 build 결과를 직렬화·압축해 저장)
+        :param key: Hashable 조각의 내용이 같으면 같은 값이어야 함 (격자 + 발표 시각 등)
+        :param build: Callable[[], bytes] 조각 JSON 바이트 생성 함수
+        :return: tuple[Hashable, EncodedSection]
+        """
+        encoded: EncodedSection | None = self.sections.get(key)
+        if encoded is None:
+            encoded = EncodedSection(build(), level=self.gzip_level)
+            self.sections.put(key, encoded)
+        return key, encoded
+
+    def encode_weather(
+        self,
+        address: str,
+        is_sunrise: bool,
+        grid_coord: dict,
+        nowcast: NowcastModel,
+        forecast: list[ForecastModel],
+        particulate_matter: ParticulateMatterModel,
+        encoding: str,
+        stale: list[str] | None = None,
+        versions: dict | None = None,
+    ) -> bytes:
+        """
+        WeatherModel 을 FastAPI 가 직렬화한 것과 같은 JSON 본문을 조각 연결로 만드는 메소드
+        데이터 조각 키는 격자(측정소), 발표 시각(versions)과 값(content_key)으로 구분
+        같은 발표 시각 문서가 제자리에서 다시 쓰여도(기상청 직접 조회 후 정기 수집 upsert, 재수집) 이전 바이트를 쓰지 않음
+        :param encoding: str (br, gzip, identity)
+        :param stale: list[str] 마지막 정상 값으로 대체한 단계
+        :param versions: dict WeatherService.versions (nowcast, forecast, particulate_matter 발표/측정 시각)
+        :return: bytes
+        """
+        stale = stale or []
+        versions = versions or {}
+        cell: tuple[int, int] = (grid_coord["grid_x"], grid_coord["grid_y"])
+        sections: list[tuple[Hashable, EncodedSection]] = [
+            self.section(
+                ("address", address, is_sunrise),
+                lambda: b'{"address":' + _STRING_ADAPTER.dump_json(address) + b',"is_sunrise":' + (b"true" if is_sunrise else b"false") + b',"nowcast":',
+            ),
+            self.section(
+                ("nowcast", cell, versions.get("nowcast"), content_key(nowcast)), lambda: nowcast.model_dump_json().encode()
+            ),
+            self.section(("literal", "forecast"), lambda: b',"forecast":'),
+            self.section(
+                ("forecast", cell, versions.get("forecast"), content_key(*forecast)), lambda: _FORECAST_ADAPTER.dump_json(forecast)
+            ),
+            self.section(("literal", "particulate_matter"), lambda: b',"particulate_matter":'),
+            self.section(
+                ("particulate_matter", versions.get("particulate_matter"), content_key(particulate_matter)),
+                lambda: particulate_matter.model_dump_json().encode(),
+            ),
+            self.section(("stale",) + tuple(stale), lambda: b',"stale":' + _STALE_ADAPTER.dump_json(stale) + b"}"),
+        ]
+        if encoding == "gzip":
+            return self._join_gzip(sections)
+        if encoding == "br":
+            return self._join_brotli(sections)
+        return b"".join(encoded.raw for _, encoded in sections)
+
+    @staticmethod
+    def _join_gzip(sections: list[tuple[Hashable, EncodedSection]]) -> bytes:
+        """
+        조각별 deflate 결과를 이어 붙여 gzip 본문을 만드는 메소드 (압축 없이 CRC32 계산만 수행)
+        :return: bytes
+        """
+        crc: int = 0
+        size: int = 0
+        for _, encoded in sections:
+            crc = zlib.crc32(encoded.raw, crc)
+            size += len(encoded.raw)
+        return b"".join(
+            [_GZIP_HEADER]
+            + [encoded.deflated for _, encoded in sections]
+            + [_DEFLATE_FINAL_BLOCK, struct.pack("<II", crc, size & 0xFFFFFFFF)]
+        )
+
+    def _join_brotli(self, sections: list[tuple[Hashable, EncodedSection]]) -> bytes:
+        """
+        조각 조합별로 한 번만 brotli 압축하는 메소드
+        :return: bytes
+        """
+        key: tuple = tuple(key for key, _ in sections)
+        body: bytes | None = self.brotli_bodies.get(key)
+        if body is None:
+            body = brotli.compress(b"".join(encoded.raw for _, encoded in sections), quality=self.brotli_quality)
+            self.brotli_bodies.put(key, body)
+        return body
+
+    def stats(self) -> dict:
+        """
+        조각/brotli 본문 캐시 통계 반환 메소드
+        :return: dict
+        """
+        return {"sections": self.sections.stats(), "brotli_bodies": self.brotli_bodies.stats()}
+
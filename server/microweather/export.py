@@ -0,0 +1,178 @@
+import json
+import struct
+import numpy as np
+from typing import Iterator
+from fastapi import HTTPException
+from app.microweather import grid, gridfile
+from app.microweather.ingestion import NOWCAST_CATEGORIES, FORECAST_CATEGORIES
+
+# 바이너리 응답 시작 4바이트, 이어서 헤더 JSON 길이(uint32 little-endian), 헤더 JSON, 필드별 배열
+BINARY_MAGIC: bytes = b"MWG1"
+BINARY_DTYPE: str = "<f4"
+
+# 내보낼 수 있는 필드 -> (격자 파일 값 필드, 값 필드 안의 열)
+EXPORT_FIELDS: dict[str, tuple[str, int]] = {
+    **{f"nowcast.{category}": ("nowcast", index) for index, category in enumerate(NOWCAST_CATEGORIES)},
+    **{f"forecast.{category}": ("forecast", index) for index, category in enumerate(FORECAST_CATEGORIES)},
+}
+DEFAULT_EXPORT_FIELDS: str = "nowcast.T1H,nowcast.PTY,forecast.SKY"
+
+# 경계 상자 한 변에서 격자 좌표로 변환할 점 수 (람베르트 정각원추도법에서는 위도선이 곡선이라 꼭짓점만으로는 부족)
+_EDGE_SAMPLES: int = 33
+
+
+def to_grid_range(south: float, west: float, north: float, east: float) -> tuple[tuple[int, int], tuple[int, int]]:
+    """
+    위경도 경계 상자를 덮는 격자 범위를 계산하는 함수 (지원 영역 밖 부분은 잘라냄)
+    :param south: float
+    :param west: float
+    :param north: float
+    :param east: float
+    :return: tuple ((grid_x 최소, 최대), (grid_y 최소, 최대)), 양 끝 포함
+    """
+    if not (south < north and west < east):
+        raise HTTPException(status_code=400, detail="Bounding box must satisfy south < north and west < east.")
+
+    steps: np.ndarray = np.linspace(0.0, 1.0, _EDGE_SAMPLES)
+    latitudes: np.ndarray = np.concatenate([
+        south + (north - south) * steps, south + (north - south) * steps,
+        np.full(_EDGE_SAMPLES, south), np.full(_EDGE_SAMPLES, north),
+    ])
+    longitudes: np.ndarray = np.concatenate([
+        np.full(_EDGE_SAMPLES, west), np.full(_EDGE_SAMPLES, east),
+        west + (east - west) * steps, west + (east - west) * steps,
+    ])
+    grid_x, grid_y = grid.to_grid_batch(latitudes, longitudes)
+    grid_x_range: tuple[int, int] = (max(int(grid_x.min()), 1), min(int(grid_x.max()), grid.GRID_NX))
+    grid_y_range: tuple[int, int] = (max(int(grid_y.min()), 1), min(int(grid_y.max()), grid.GRID_NY))
+    if grid_x_range[0] > grid_x_range[1] or grid_y_range[0] > grid_y_range[1]:
+        raise HTTPException(status_code=404, detail="Bounding box is outside the support area.")
+    return grid_x_range, grid_y_range
+
+
+def parse_export_fields(value: str) -> list[str]:
+    """
+    쉼표로 구분한 필드 목록 확인 함수
+    :param value: str 예: "nowcast.T1H,forecast.SKY"
+    :return: list[str] 중복 제거, 입력 순서 유지
+    """
+    fields: list[str] = list(dict.fromkeys(field.strip() for field in value.split(",") if field.strip()))
+    unknown: list[str] = [field for field in fields if field not in EXPORT_FIELDS]
+    if not fields or unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown fields: {', '.join(unknown) or '(empty)'}. Available: {', '.join(EXPORT_FIELDS)}"
+        )
+    return fields
+
+
+class GridExport:
+    def __init__(
+        self,
+        grid_file: gridfile.GridFile | None,
+        grid_x_range: tuple[int, int],
+        grid_y_range: tuple[int, int],
+        fields: list[str],
+        chunk_rows: int = 16,
+    ) -> None:
+        """
+        격자 파일(gridfile.py)의 격자 범위를 필드별 조밀 배열로 내보내는 클래스 (MongoDB 조회 없음)
+        배열 축은 (grid_x, grid_y), 예보 필드는 (예보 시간, grid_x, grid_y) 이며 데이터가 없는 격자는 NaN(JSON 은 null)
+        범위 안에서 가장 최신 발표분이 아닌 격자도 NaN 으로 채워 모든 격자가 같은 발표 시각 값을 갖도록 함
+        :param grid_file: GridFile | None (None 이거나 파일이 없으면 503)
+        :param grid_x_range: tuple[int, int]
+        :param grid_y_range: tuple[int, int]
+        :param fields: list[str] EXPORT_FIELDS 이름
+        :param chunk_rows: int 응답 조각 하나에 담을 grid_x 행 수
+        """
+        region: np.ndarray | None = grid_file.get_region(grid_x_range, grid_y_range) if grid_file is not None else None
+        if region is None:
+            raise HTTPException(status_code=503, detail="Grid snapshot is not available.")
+        self.region: np.ndarray = region
+        self.grid_x_range: tuple[int, int] = grid_x_range
+        self.grid_y_range: tuple[int, int] = grid_y_range
+        self.fields: list[str] = fields
+        self.chunk_rows: int = chunk_rows
+        self.latest_tm: dict[str, int] = {
+            kind: int(region[f"{kind}_tm"].max()) if region.size else 0 for kind in ("nowcast", "forecast")
+        }
+
+    def header(self, dtype: str | None = None) -> dict:
+        """
+        응답 헤더(범위, 발표 시각, 필드별 shape) 생성 메소드
+        :param dtype: str | None 바이너리 배열 dtype (JSON 응답이면 None)
+        :return: dict
+        """
+        shape: list[int] = list(self.region.shape)
+        forecast_times: list[str] = []
+        if self.latest_tm["forecast"]:
+            cell: tuple = np.unravel_index(int(np.argmax(self.region["forecast_tm"])), self.region.shape)
+            record: np.void = self.region[cell]
+            forecast_times = [
+                gridfile.from_minutes(value).isoformat() for value in record["forecast_time"][:int(record["forecast_count"])].tolist()
+            ]
+
+        fields: list[dict] = []
+        for field in self.fields:
+            kind, _ = EXPORT_FIELDS[field]
+            field_shape: list[int] = [gridfile.FORECAST_HOURS] + shape if kind == "forecast" else shape
+            fields.append({"name": field, "shape": field_shape} | ({"dtype": dtype} if dtype is not None else {}))
+        return {
+            "grid_x": list(self.grid_x_range),
+            "grid_y": list(self.grid_y_range),
+            "axes": ["grid_x", "grid_y"],
+            "nowcast_tm": gridfile.from_minutes(self.latest_tm["nowcast"]).isoformat() if self.latest_tm["nowcast"] else None,
+            "forecast_tm": gridfile.from_minutes(self.latest_tm["forecast"]).isoformat() if self.latest_tm["forecast"] else None,
+            "forecast_times": forecast_times,
+            "fields": fields,
+        }
+
+    def _iter_field(self, field: str) -> Iterator[np.ndarray]:
+        """
+        필드 값을 chunk_rows 행 단위 float64 배열로 반환하는 제너레이터 (예보 필드는 예보 시간 순서로 반복)
+        """
+        kind, column = EXPORT_FIELDS[field]
+        for hour in range(gridfile.FORECAST_HOURS) if kind == "forecast" else (None,):
+            for row_start in range(0, self.region.shape[0], self.chunk_rows):
+                rows: np.ndarray = self.region[row_start:row_start + self.chunk_rows]
+                values: np.ndarray = rows[kind][..., hour, column] if hour is not None else rows[kind][..., column]
+                valid: np.ndarray = (rows[f"{kind}_tm"] == self.latest_tm[kind]) & (rows[f"{kind}_tm"] != 0)
+                if hour is not None:
+                    valid &= rows["forecast_count"] > hour
+                yield np.where(valid, values, np.nan)
+
+    def iter_binary(self) -> Iterator[bytes]:
+        """
+        바이너리 응답 생성 제너레이터
+        MWG1 + 헤더 길이(uint32 LE) + 헤더 JSON + fields 순서의 C 순서 float32 LE 배열
+        :return: Iterator[bytes]
+        """
+        header: bytes = json.dumps(self.header(dtype=BINARY_DTYPE), separators=(",", ":")).encode()
+        yield BINARY_MAGIC + struct.pack("<I", len(header)) + header
+        for field in self.fields:
+            for values in self._iter_field(field):
+                yield values.astype(BINARY_DTYPE).tobytes()
+
+    def iter_json(self) -> Iterator[bytes]:
+        """
+        JSON 응답 생성 제너레이터 {"header": {...}, "data": {필드: 중첩 배열}}
+        :return: Iterator[bytes]
+        """
+        yield b'{"header":' + json.dumps(self.header(), separators=(",", ":")).encode() + b',"data":{'
+        for field_index, field in enumerate(self.fields):
+            kind, _ = EXPORT_FIELDS[field]
+            yield (b"," if field_index else b"") + json.dumps(field).encode() + b":[" + (b"[" if kind == "forecast" else b"")
+            rows_per_hour: int = -(-self.region.shape[0] // self.chunk_rows)
+            for chunk_index, values in enumerate(self._iter_field(field)):
+                rows: list[str] = [
+                    json.dumps([None if value != value else value for value in row], separators=(",", ":"))
+                    for row in values.tolist()
+                ]
+                if chunk_index % rows_per_hour:
+                    prefix: bytes = b","
+                elif chunk_index:
+                    prefix = b"],["
+                else:
+                    prefix = b""
+                yield prefix + ",".join(rows).encode()
+            yield (b"]" if kind == "forecast" else b"") + b"]"
+        yield b"}}"
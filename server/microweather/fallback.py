@@ -0,0 +1,47 @@
+import logging
+from datetime import datetime
+from app.microweather.ingestion import IngestionService
+from app.microweather.singleflight import SingleFlight
+from app.microweather.release import NOWCAST_RELEASE_MINUTE, FORECAST_RELEASE_MINUTE, latest_base_time
+
+logger: logging.Logger = logging.getLogger("microweather.fallback")
+
+_RELEASE_MINUTES: dict[str, int] = {"nowcast": NOWCAST_RELEASE_MINUTE, "forecast": FORECAST_RELEASE_MINUTE}
+
+
+class UpstreamFallback:
+    def __init__(self, ingestion: IngestionService) -> None:
+        """
+        MongoDB 에 격자 데이터가 없을 때 기상청 API 를 직접 호출하고 결과를 MongoDB 에 저장하는 클래스
+        같은 격자·발표 시각에 대한 동시 요청은 하나의 API 호출 결과를 함께 사용
+        :param ingestion: IngestionService (커넥션 풀, 재시도, 문서 변환, 저장 로직 재사용)
+        """
+        self.ingestion: IngestionService = ingestion
+        self.flight: SingleFlight = SingleFlight("upstream")
+
+    async def get(self, kind: str, grid_x: int, grid_y: int, now: datetime | None = None) -> dict:
+        """
+        격자 하나의 최신 nowcast/forecast 문서를 기상청 API 에서 조회하는 메소드
+        :param kind: str ("nowcast", "forecast")
+        :param grid_x: int
+        :param grid_y: int
+        :param now: datetime
+        :return: dict nowcast/forecast 컬렉션 문서
+        :raise UpstreamError: 재시도 후에도 API 호출이 실패한 경우
+        """
+        now = now if now is not None else datetime.now()
+        key: tuple[str, int, int, datetime] = (kind, grid_x, grid_y, latest_base_time(now, _RELEASE_MINUTES[kind]))
+
+        async def ingest() -> dict:
+            logger.warning("%s (%d, %d) 데이터가 없어 기상청 API 를 직접 조회", kind, grid_x, grid_y)
+            return await self.ingestion.ingest_cell(kind, grid_x, grid_y, now=now)
+
+        return await self.flight.do(key, ingest)
+
+    def stats(self) -> dict:
+        """
+        API 직접 조회 수와 합쳐진 요청 수 반환 메소드
+        :return: dict
+        """
+        stats: dict = self.flight.stats()
+        return {"requests": stats["calls"], "coalesced": stats["coalesced"], "in_flight": stats["in_flight"]}
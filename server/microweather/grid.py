@@ -0,0 +1,103 @@
+import math
+import numpy as np
+
+# 기상청 동네예보 격자 (Lambert Conformal Conic, 구면 지구) 상수
+EARTH_RADIUS: float = 6371.00877  # km
+GRID_SCALE: float = 5.0  # km
+STANDARD_LATITUDE_1: float = 30.0
+STANDARD_LATITUDE_2: float = 60.0
+ORIGIN_LATITUDE: float = 38.0
+ORIGIN_LONGITUDE: float = 126.0
+ORIGIN_GRID_X: int = 43
+ORIGIN_GRID_Y: int = 136
+
+# 격자 범위 (1 ~ GRID_NX, 1 ~ GRID_NY)
+GRID_NX: int = 149
+GRID_NY: int = 253
+
+
+class _Projection:
+    def __init__(self) -> None:
+        """
+        투영 상수를 모듈 로드 시 한 번만 계산하는 클래스
+        """
+        degree: float = math.pi / 180.0
+        self.degree: float = degree
+        self.re: float = EARTH_RADIUS / GRID_SCALE
+        self.olon: float = ORIGIN_LONGITUDE * degree
+        slat1: float = STANDARD_LATITUDE_1 * degree
+        slat2: float = STANDARD_LATITUDE_2 * degree
+        olat: float = ORIGIN_LATITUDE * degree
+
+        sn: float = math.tan(math.pi * 0.25 + slat2 * 0.5) / math.tan(math.pi * 0.25 + slat1 * 0.5)
+        self.sn: float = math.log(math.cos(slat1) / math.cos(slat2)) / math.log(sn)
+        sf: float = math.tan(math.pi * 0.25 + slat1 * 0.5)
+        self.sf: float = (math.pow(sf, self.sn) * math.cos(slat1)) / self.sn
+        ro: float = math.tan(math.pi * 0.25 + olat * 0.5)
+        self.ro: float = (self.re * self.sf) / math.pow(ro, self.sn)
+
+
+PROJECTION: _Projection = _Projection()
+
+
+def to_grid(latitude: float, longitude: float) -> tuple[int, int]:
+    """
+    위경도를 기상청 동네예보 격자 좌표로 변환하는 함수 (기상청 참조 공식, 반올림)
+    :param latitude: float
+    :param longitude: float
+    :return: tuple[int, int] (grid_x, grid_y)
+    """
+    p: _Projection = PROJECTION
+    ra: float = math.tan(math.pi * 0.25 + latitude * p.degree * 0.5)
+    ra = (p.re * p.sf) / math.pow(ra, p.sn)
+    theta: float = longitude * p.degree - p.olon
+    if theta > math.pi:
+        theta -= 2.0 * math.pi
+    if theta < -math.pi:
+        theta += 2.0 * math.pi
+    theta *= p.sn
+
+    grid_x: int = math.floor(ra * math.sin(theta) + ORIGIN_GRID_X + 0.5)
+    grid_y: int = math.floor(p.ro - ra * math.cos(theta) + ORIGIN_GRID_Y + 0.5)
+    return grid_x, grid_y
+
+
+def to_grid_batch(latitudes: np.ndarray, longitudes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    위경도 배열을 기상청 동네예보 격자 좌표 배열로 한 번에 변환하는 함수
+    :param latitudes: np.ndarray
+    :param longitudes: np.ndarray
+    :return: tuple[np.ndarray, np.ndarray] (grid_x, grid_y), dtype int64
+    """
+    p: _Projection = PROJECTION
+    latitudes = np.asarray(latitudes, dtype=np.float64)
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+
+    ra: np.ndarray = (p.re * p.sf) / np.power(np.tan(math.pi * 0.25 + latitudes * p.degree * 0.5), p.sn)
+    theta: np.ndarray = longitudes * p.degree - p.olon
+    theta = np.where(theta > math.pi, theta - 2.0 * math.pi, theta)
+    theta = np.where(theta < -math.pi, theta + 2.0 * math.pi, theta)
+    theta *= p.sn
+
+    grid_x: np.ndarray = np.floor(ra * np.sin(theta) + ORIGIN_GRID_X + 0.5).astype(np.int64)
+    grid_y: np.ndarray = np.floor(p.ro - ra * np.cos(theta) + ORIGIN_GRID_Y + 0.5).astype(np.int64)
+    return grid_x, grid_y
+
+
+def from_grid_batch(grid_x: np.ndarray, grid_y: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    기상청 동네예보 격자 좌표 배열을 격자 중심의 위경도 배열로 변환하는 함수 (기상청 참조 공식 역변환)
+    :param grid_x: np.ndarray
+    :param grid_y: np.ndarray
+    :return: tuple[np.ndarray, np.ndarray] (latitude, longitude)
+    """
+    p: _Projection = PROJECTION
+    xn: np.ndarray = np.asarray(grid_x, dtype=np.float64) - ORIGIN_GRID_X
+    yn: np.ndarray = p.ro - (np.asarray(grid_y, dtype=np.float64) - ORIGIN_GRID_Y)
+
+    ra: np.ndarray = np.sqrt(xn * xn + yn * yn)
+    if p.sn < 0:
+        ra = -ra
+    latitudes: np.ndarray = 2.0 * np.arctan(np.power((p.re * p.sf) / ra, 1.0 / p.sn)) - math.pi * 0.5
+    longitudes: np.ndarray = np.arctan2(xn, yn) / p.sn + p.olon
+    return latitudes / p.degree, longitudes / p.degree
@@ -0,0 +1,199 @@
+import os
+import time
+import logging
+import tempfile
+import numpy as np
+from datetime import datetime, timedelta
+from app.microweather import grid
+from app.microweather.ingestion import NOWCAST_CATEGORIES, FORECAST_CATEGORIES
+from app.microweather.models import NowcastModel, ForecastModel
+
+logger: logging.Logger = logging.getLogger("microweather.gridfile")
+
+# 초단기예보 발표당 예보 시간 수 (numOfRows 60 = 6시간 x 10개 항목)
+FORECAST_HOURS: int = 6
+
+# 격자 하나의 레코드, 배열 전체 shape 은 (GRID_NX, GRID_NY) 이며 [grid_x - 1, grid_y - 1] 로 조회
+# 시각은 1970-01-01 (KST, naive) 기준 분 단위 정수, 0 이면 데이터 없음
+# 값은 기본값을 적용한 float64 로 저장해 MongoDB 경로와 같은 응답을 만듦
+GRID_DTYPE: np.dtype = np.dtype([
+    ("nowcast_tm", "<i8"),
+    ("nowcast", "<f8", (len(NOWCAST_CATEGORIES),)),
+    ("forecast_tm", "<i8"),
+    ("forecast_count", "<i1"),
+    ("forecast_time", "<i8", (FORECAST_HOURS,)),
+    ("forecast", "<f8", (FORECAST_HOURS, len(FORECAST_CATEGORIES))),
+])
+
+_EPOCH: datetime = datetime(1970, 1, 1)
+
+
+def to_minutes(value: datetime) -> int:
+    """
+    datetime 을 격자 파일 시각(1970-01-01 기준 분)으로 변환하는 함수
+    """
+    return (value - _EPOCH) // timedelta(minutes=1)
+
+
+def from_minutes(value: int) -> datetime:
+    """
+    격자 파일 시각을 datetime 으로 변환하는 함수
+    """
+    return _EPOCH + timedelta(minutes=value)
+
+
+def write_grid_file(path: str, array: np.ndarray) -> None:
+    """
+    배열을 같은 디렉터리의 임시 파일에 쓴 뒤 os.replace 로 교체하는 함수
+    읽는 쪽은 항상 이전 파일이나 새 파일 전체만 보게 되며, 이미 매핑한 이전 파일은 교체 후에도 유효
+    :param path: str
+    :param array: np.ndarray
+    """
+    directory: str = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    descriptor, temporary_path = tempfile.mkstemp(dir=directory, prefix=".grid-", suffix=".npy")
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            np.save(file, array, allow_pickle=False)
+            file.flush()
+            os.fsync(file.fileno())
+        os.chmod(temporary_path, 0o644)
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+
+
+class GridFile:
+    def __init__(self, path: str, check_interval: float = 1.0) -> None:
+        """
+        GridFileWriter(snapshot.py) 가 쓴 격자 파일을 읽기 전용 메모리 매핑으로 조회하는 클래스
+        워커 프로세스가 여러 개여도 같은 페이지 캐시를 공유하므로 격자 데이터가 프로세스마다 복제되지 않음
+        check_interval 초마다 파일이 교체되었는지(inode, 수정 시각) 확인하고 바뀌었으면 다시 매핑
+        :param path: str
+        :param check_interval: float
+        """
+        self.path: str = path
+        self.check_interval: float = check_interval
+        self.reloads: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self._array: np.ndarray | None = None
+        self._file_id: tuple[int, int] | None = None
+        self._checked_at: float = float("-inf")
+
+    @property
+    def is_loaded(self) -> bool:
+        self._refresh()
+        return self._array is not None
+
+    def _refresh(self) -> None:
+        """
+        파일 교체 여부를 확인해 다시 매핑하는 메소드 (check_interval 안에서는 확인하지 않음)
+        """
+        checked_at: float = time.monotonic()
+        if checked_at - self._checked_at < self.check_interval:
+            return
+        self._checked_at = checked_at
+        try:
+            status: os.stat_result = os.stat(self.path)
+        except FileNotFoundError:
+            return
+
+        file_id: tuple[int, int] = (status.st_ino, status.st_mtime_ns)
+        if file_id == self._file_id:
+            return
+        try:
+            array: np.ndarray = np.load(self.path, mmap_mode="r", allow_pickle=False)
+        except (OSError, ValueError) as e:
+            logger.error(f"격자 파일 매핑 실패 : {e}")
+            return
+        if array.dtype != GRID_DTYPE or array.shape != (grid.GRID_NX, grid.GRID_NY):
+            logger.error(f"격자 파일 형식 불일치 : {array.dtype}, {array.shape}")
+            return
+        self._array = array
+        self._file_id = file_id
+        self.reloads += 1
+
+    def _get_record(self, grid_x: int, grid_y: int, tm_field: str) -> np.void | None:
+        self._refresh()
+        if self._array is None or not (1 <= grid_x <= grid.GRID_NX and 1 <= grid_y <= grid.GRID_NY):
+            self.misses += 1
+            return None
+        record: np.void = self._array[grid_x - 1, grid_y - 1]
+        if record[tm_field] == 0:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return record
+
+    def get_tm(self, kind: str, grid_x: int, grid_y: int) -> datetime | None:
+        """
+        격자의 데이터 발표 시각만 확인하는 메소드 (통계에 영향 없음)
+        :param kind: str ("nowcast", "forecast")
+        :param grid_x: int
+        :param grid_y: int
+        :return: datetime | None
+        """
+        self._refresh()
+        if self._array is None or not (1 <= grid_x <= grid.GRID_NX and 1 <= grid_y <= grid.GRID_NY):
+            return None
+        tm: int = int(self._array[grid_x - 1, grid_y - 1][f"{kind}_tm"])
+        return from_minutes(tm) if tm else None
+
+    def get_region(self, grid_x_range: tuple[int, int], grid_y_range: tuple[int, int]) -> np.ndarray | None:
+        """
+        격자 범위(양 끝 포함)의 레코드 배열 조회 메소드 (복사 없는 메모리 매핑 뷰, 파일이 교체되어도 뷰는 이전 파일 유지)
+        :param grid_x_range: tuple[int, int]
+        :param grid_y_range: tuple[int, int]
+        :return: np.ndarray | None shape (x 개수, y 개수), 파일이 없으면 None
+        """
+        self._refresh()
+        if self._array is None:
+            return None
+        return self._array[grid_x_range[0] - 1:grid_x_range[1], grid_y_range[0] - 1:grid_y_range[1]]
+
+    def get_nowcast(self, grid_x: int, grid_y: int) -> tuple[NowcastModel, datetime] | None:
+        """
+        초단기실황 조회 메소드
+        :param grid_x: int
+        :param grid_y: int
+        :return: tuple[NowcastModel, datetime] | None (모델, 발표 시각)
+        """
+        record: np.void | None = self._get_record(grid_x, grid_y, "nowcast_tm")
+        if record is None:
+            return None
+        tm: datetime = from_minutes(int(record["nowcast_tm"]))
+        return NowcastModel(datetime=tm, **dict(zip(NOWCAST_CATEGORIES, record["nowcast"].tolist()))), tm
+
+    def get_forecast(self, grid_x: int, grid_y: int) -> tuple[list[ForecastModel], datetime] | None:
+        """
+        초단기예보 조회 메소드
+        :param grid_x: int
+        :param grid_y: int
+        :return: tuple[list[ForecastModel], datetime] | None (모델 리스트, 발표 시각)
+        """
+        record: np.void | None = self._get_record(grid_x, grid_y, "forecast_tm")
+        if record is None:
+            return None
+        count: int = int(record["forecast_count"])
+        forecast_model_list: list[ForecastModel] = [
+            ForecastModel(datetime=from_minutes(effective_time), **dict(zip(FORECAST_CATEGORIES, values)))
+            for effective_time, values in zip(record["forecast_time"][:count].tolist(), record["forecast"][:count].tolist())
+        ]
+        return forecast_model_list, from_minutes(int(record["forecast_tm"]))
+
+    def stats(self) -> dict:
+        """
+        통계 반환 메소드
+        :return: dict
+        """
+        lookups: int = self.hits + self.misses
+        return {
+            "path": self.path,
+            "loaded": self._array is not None,
+            "reloads": self.reloads,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
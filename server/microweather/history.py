@@ -0,0 +1,331 @@
+import io
+import csv
+import json
+import math
+import time
+import zlib
+import asyncio
+import logging
+import numpy as np
+from typing import AsyncIterator
+from datetime import date, datetime, timedelta, timezone
+from pymongo import UpdateOne
+from fastapi import HTTPException
+from app.microweather import grid
+from app.microweather.database import Database
+from app.microweather.ingestion import NOWCAST_CATEGORIES
+from app.microweather.service import WeatherService
+
+logger: logging.Logger = logging.getLogger("microweather.history")
+
+# 보관 문서 data 필드의 열 순서, 하루 안의 분(minute)과 초단기실황 값을 열마다 연속된 float64 로 저장
+ARCHIVE_COLUMNS: tuple[str, ...] = ("minute",) + NOWCAST_CATEGORIES
+
+# 이력 응답 열 (CSV 헤더, NDJSON 키)
+HISTORY_FIELDS: tuple[str, ...] = ("datetime",) + NOWCAST_CATEGORIES
+
+# 저장된 tm/day 는 시간대 정보가 없는 KST
+KST: timezone = timezone(timedelta(hours=9))
+
+
+def resolve_history_cell(
+    latitude: float | None, longitude: float | None, grid_x: int | None, grid_y: int | None
+) -> tuple[int, int]:
+    """
+    이력 조회 대상 격자를 위경도 또는 격자 좌표로 확인하는 함수
+    :param latitude: float | None
+    :param longitude: float | None
+    :param grid_x: int | None
+    :param grid_y: int | None
+    :return: tuple[int, int] (grid_x, grid_y)
+    """
+    if latitude is not None and longitude is not None:
+        WeatherService.is_valid_coordinates(latitude=latitude, longitude=longitude)
+        return grid.to_grid(latitude=latitude, longitude=longitude)
+    if grid_x is not None and grid_y is not None:
+        if not (1 <= grid_x <= grid.GRID_NX and 1 <= grid_y <= grid.GRID_NY):
+            raise HTTPException(status_code=404, detail="Grid cell is outside the support area.")
+        return grid_x, grid_y
+    raise HTTPException(status_code=400, detail="Either latitude and longitude or grid_x and grid_y are required.")
+
+
+def to_kst_naive(value: datetime) -> datetime:
+    """
+    시간대가 있는 시각을 저장 형식과 같은 시간대 없는 KST 로 변환하는 함수 (시간대가 없으면 KST 로 보고 그대로 반환)
+    MongoDB 는 시간대가 있는 조건을 UTC 로 바꾸므로 변환하지 않으면 KST tm 과 9시간 어긋나고, 시간대 없는 보관 문서 day 와 비교할 수 없음
+    :param value: datetime
+    :return: datetime
+    """
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(KST).replace(tzinfo=None)
+
+
+def check_history_range(start: datetime, end: datetime, max_days: float) -> None:
+    """
+    이력 조회 기간 확인 함수
+    :param start: datetime
+    :param end: datetime
+    :param max_days: float 한 번에 조회할 수 있는 최대 일수
+    """
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end must be later than start.")
+    if end - start > timedelta(days=max_days):
+        raise HTTPException(status_code=400, detail=f"History range must be at most {max_days:g} days.")
+
+
+def to_archive_document(grid_x: int, grid_y: int, day: datetime, block: np.ndarray) -> dict:
+    """
+    격자 하나의 하루치 초단기실황을 열 단위 압축 배열 문서로 변환하는 함수
+    :param grid_x: int
+    :param grid_y: int
+    :param day: datetime 해당 날짜 0시
+    :param block: np.ndarray shape (len(ARCHIVE_COLUMNS), count), 값이 없으면 NaN
+    :return: dict {nx, ny, day, count, data}
+    """
+    return {
+        "nx": grid_x,
+        "ny": grid_y,
+        "day": day,
+        "count": block.shape[1],
+        "data": zlib.compress(np.ascontiguousarray(block, dtype="<f8").tobytes()),
+    }
+
+
+def from_archive_document(document: dict) -> list[dict]:
+    """
+    보관 문서를 시각 순 이력 행 목록으로 변환하는 함수
+    :param document: dict
+    :return: list[dict] {datetime, PTY, REH, RN1, T1H}, 값이 없으면 None
+    """
+    block: np.ndarray = np.frombuffer(zlib.decompress(document["data"]), dtype="<f8").reshape(
+        len(ARCHIVE_COLUMNS), document["count"]
+    )
+    rows: list[dict] = []
+    for values in block.T.tolist():
+        row: dict = {"datetime": document["day"] + timedelta(minutes=int(values[0]))}
+        for category, value in zip(NOWCAST_CATEGORIES, values[1:]):
+            row[category] = None if math.isnan(value) else value
+        rows.append(row)
+    return rows
+
+
+async def iter_history(
+    database: Database, grid_x: int, grid_y: int, start: datetime, end: datetime, batch_size: int = 500
+) -> AsyncIterator[dict]:
+    """
+    격자의 start <= tm < end 초단기실황 이력을 시각 순으로 하나씩 반환하는 비동기 제너레이터
+    보관된 날짜는 nowcast_archive 문서(하루 한 문서)를 순서대로 읽고, 보관되지 않은 구간만 nowcast 컬렉션(정리된 시각은 nowcast_hourly)에서 읽음
+    :param database: Database
+    :param grid_x: int
+    :param grid_y: int
+    :param start: datetime
+    :param end: datetime
+    :param batch_size: int 커서가 한 번에 가져올 문서 수
+    :return: AsyncIterator[dict] {datetime, PTY, REH, RN1, T1H}
+    """
+    position: datetime = start
+    archive = database.nowcast_archive.find(
+        {"nx": grid_x, "ny": grid_y, "day": {"$gte": datetime.combine(start.date(), datetime.min.time()), "$lt": end}},
+        projection={"_id": 0},
+        sort=[("day", 1)],
+        batch_size=batch_size,
+    )
+    async for document in archive:
+        if position < document["day"]:
+            async for row in _iter_nowcast(database, grid_x, grid_y, position, document["day"], batch_size):
+                yield row
+        for row in from_archive_document(document):
+            if position <= row["datetime"] < end:
+                yield row
+        position = max(position, document["day"] + timedelta(days=1))
+
+    if position < end:
+        async for row in _iter_nowcast(database, grid_x, grid_y, position, end, batch_size):
+            yield row
+
+
+async def _iter_nowcast(
+    database: Database, grid_x: int, grid_y: int, start: datetime, end: datetime, batch_size: int
+) -> AsyncIterator[dict]:
+    """
+    보관되지 않은 구간의 격자 start <= tm < end 초단기실황을 읽는 비동기 제너레이터
+    nowcast 컬렉션에서 격자의 첫 문서 이전 시각은 보관 기간 정리(retention.py)로 삭제되었으므로 시간별 요약(nowcast_hourly)에서 읽고,
+    이후 시각은 nowcast 컬렉션을 {nx, ny, tm} 인덱스 순서로 읽음 (보관 작업이 오래 멈춰도 이력이 비지 않도록 함)
+    """
+    first: dict | None = await database.nowcast.find_one(
+        {"nx": grid_x, "ny": grid_y, "tm": {"$gte": start, "$lt": end}}, projection={"_id": 0, "tm": 1}, sort=[("tm", 1)]
+    )
+    raw_start: datetime = end if first is None else first["tm"]
+    if start < raw_start:
+        async for row in _iter_nowcast_hourly(database, grid_x, grid_y, start, raw_start, batch_size):
+            yield row
+    if first is None:
+        return
+
+    cursor = database.nowcast.find(
+        {"nx": grid_x, "ny": grid_y, "tm": {"$gte": raw_start, "$lt": end}},
+        projection={"_id": 0, "tm": 1, **{category: 1 for category in NOWCAST_CATEGORIES}},
+        sort=[("tm", 1)],
+        batch_size=batch_size,
+    )
+    async for document in cursor:
+        yield {"datetime": document["tm"]} | {category: document.get(category) for category in NOWCAST_CATEGORIES}
+
+
+async def _iter_nowcast_hourly(
+    database: Database, grid_x: int, grid_y: int, start: datetime, end: datetime, batch_size: int
+) -> AsyncIterator[dict]:
+    """
+    시간별 요약(nowcast_hourly) 문서에서 격자의 start <= tm < end 값을 시각 순으로 읽는 비동기 제너레이터
+    요약 문서는 전체 격자 배열이므로 서버에서 격자 위치($indexOfArray, nx·ny 정렬 순)의 값만 골라 시간마다 한 행만 전송
+    """
+    # nx 가 grid_x 인 첫 위치부터 ny 가 grid_y 인 위치를 찾고, 그 위치의 nx 가 다르면 해당 시각에 격자 데이터 없음
+    index: dict = {"$indexOfArray": ["$ny", grid_y, {"$max": [0, {"$indexOfArray": ["$nx", grid_x]}]}]}
+    values: dict = {"$let": {"vars": {"index": index}, "in": {"$cond": [
+        {"$and": [{"$gte": ["$$index", 0]}, {"$eq": [{"$arrayElemAt": ["$nx", "$$index"]}, grid_x]}]},
+        [{"$arrayElemAt": [f"${category}", "$$index"]} for category in NOWCAST_CATEGORIES],
+        None,
+    ]}}}
+    hourly = database.nowcast_hourly.aggregate([
+        {"$match": {"tm": {"$gte": start, "$lt": end}}},
+        {"$sort": {"tm": 1}},
+        {"$project": {"_id": 0, "tm": 1, "values": values}},
+    ], batchSize=batch_size)
+    async for document in hourly:
+        if document["values"] is not None:
+            yield {"datetime": document["tm"]} | dict(zip(NOWCAST_CATEGORIES, document["values"]))
+
+
+async def to_ndjson(rows: AsyncIterator[dict], chunk_rows: int = 500) -> AsyncIterator[bytes]:
+    """
+    이력 행을 NDJSON 으로 직렬화하는 비동기 제너레이터 (chunk_rows 행마다 한 조각)
+    :param rows: AsyncIterator[dict]
+    :param chunk_rows: int
+    :return: AsyncIterator[bytes]
+    """
+    lines: list[str] = []
+    async for row in rows:
+        lines.append(json.dumps(row | {"datetime": row["datetime"].isoformat()}, ensure_ascii=False, separators=(",", ":")))
+        if len(lines) >= chunk_rows:
+            yield ("\n".join(lines) + "\n").encode()
+            lines.clear()
+    if lines:
+        yield ("\n".join(lines) + "\n").encode()
+
+
+async def to_csv(rows: AsyncIterator[dict], chunk_rows: int = 500) -> AsyncIterator[bytes]:
+    """
+    이력 행을 헤더가 있는 CSV 로 직렬화하는 비동기 제너레이터 (chunk_rows 행마다 한 조각)
+    :param rows: AsyncIterator[dict]
+    :param chunk_rows: int
+    :return: AsyncIterator[bytes]
+    """
+    buffer: io.StringIO = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(HISTORY_FIELDS)
+    count: int = 0
+    async for row in rows:
+        writer.writerow([row["datetime"].isoformat()] + [row[category] for category in NOWCAST_CATEGORIES])
+        count += 1
+        if count % chunk_rows == 0:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class HistoryArchiver:
+    def __init__(self, database: Database, batch_size: int = 1000) -> None:
+        """
+        지난 날짜의 초단기실황을 격자·날짜별 열 단위 압축 문서(nowcast_archive)로 보관하는 클래스
+        긴 기간 이력 조회가 시각별 문서 대신 하루 한 문서를 순서대로 읽도록 함 (보관 기간 정리 대상 아님)
+        nowcast 컬렉션에 없는 시각은 시간별 요약(nowcast_hourly)에서 읽으므로 정리된 날짜도 다시 보관할 수 있음
+        :param database: Database
+        :param batch_size: int bulk_write 한 번에 보낼 문서 수
+        """
+        self.database: Database = database
+        self.batch_size: int = batch_size
+
+    async def archive_day(self, day: date) -> dict:
+        """
+        하루치 초단기실황 보관 메소드 (같은 날짜를 다시 실행하면 덮어씀, 끝난 날짜에만 실행)
+        :param day: date
+        :return: dict 처리 결과
+        """
+        start: float = time.perf_counter()
+        day_start: datetime = datetime.combine(day, datetime.min.time())
+        day_end: datetime = day_start + timedelta(days=1)
+        cells: int = grid.GRID_NX * grid.GRID_NY
+        # 하루 안의 분 -> (격자별 값 배열 (cells, 카테고리 수), 격자별 데이터 존재 여부)
+        slots: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+
+        def slot(tm: datetime) -> tuple[np.ndarray, np.ndarray]:
+            minute: int = (tm - day_start) // timedelta(minutes=1)
+            if minute not in slots:
+                slots[minute] = (np.full((cells, len(NOWCAST_CATEGORIES)), np.nan), np.zeros(cells, dtype=bool))
+            return slots[minute]
+
+        cursor = self.database.nowcast.find(
+            {"tm": {"$gte": day_start, "$lt": day_end}},
+            projection={"_id": 0, "nx": 1, "ny": 1, "tm": 1, **{category: 1 for category in NOWCAST_CATEGORIES}},
+            batch_size=self.batch_size,
+        )
+        async for document in cursor:
+            values, present = slot(document["tm"])
+            index: int = (document["nx"] - 1) * grid.GRID_NY + document["ny"] - 1
+            values[index] = [document.get(category) for category in NOWCAST_CATEGORIES]
+            present[index] = True
+
+        raw_minutes: set[int] = set(slots)
+        hourly = self.database.nowcast_hourly.find({"tm": {"$gte": day_start, "$lt": day_end}}, projection={"_id": 0})
+        async for document in hourly:
+            if (document["tm"] - day_start) // timedelta(minutes=1) in raw_minutes:
+                continue
+            values, present = slot(document["tm"])
+            indexes: np.ndarray = (np.array(document["nx"]) - 1) * grid.GRID_NY + np.array(document["ny"]) - 1
+            values[indexes] = np.array([document[category] for category in NOWCAST_CATEGORIES], dtype=float).T
+            present[indexes] = True
+
+        minutes: list[int] = sorted(slots)
+        operations: list[UpdateOne] = []
+        if minutes:
+            minute_array: np.ndarray = np.array(minutes, dtype=float)
+            values_by_minute: np.ndarray = np.stack([slots[minute][0] for minute in minutes])
+            present_by_minute: np.ndarray = np.stack([slots[minute][1] for minute in minutes])
+            for index in np.flatnonzero(present_by_minute.any(axis=0)).tolist():
+                rows: np.ndarray = present_by_minute[:, index]
+                block: np.ndarray = np.vstack([minute_array[rows], values_by_minute[rows, index, :].T])
+                grid_x, grid_y = index // grid.GRID_NY + 1, index % grid.GRID_NY + 1
+                operations.append(UpdateOne(
+                    {"nx": grid_x, "ny": grid_y, "day": day_start},
+                    {"$set": to_archive_document(grid_x, grid_y, day_start, block)},
+                    upsert=True,
+                ))
+
+        for batch_start in range(0, len(operations), self.batch_size):
+            await self.database.nowcast_archive.bulk_write(operations[batch_start:batch_start + self.batch_size], ordered=False)
+        return {
+            "collection": "nowcast_archive",
+            "day": day.isoformat(),
+            "times": len(minutes),
+            "written": len(operations),
+            "seconds": round(time.perf_counter() - start, 3),
+        }
+
+    async def watch(self, interval: float, days: int = 2) -> None:
+        """
+        interval 초마다 어제까지 days 일을 보관하는 백그라운드 작업 (수집 프로세스에서 실행)
+        이전 실행이 실패한 날짜도 다음 실행에서 다시 보관하도록 여러 날을 덮어씀
+        :param interval: float
+        :param days: int
+        """
+        while True:
+            today: date = date.today()
+            for offset in range(days, 0, -1):
+                try:
+                    logger.info(await self.archive_day(today - timedelta(days=offset)))
+                except Exception as e:
+                    logger.error(f"이력 보관 실패 : {e}")
+            await asyncio.sleep(interval)
@@ -0,0 +1,139 @@
+import logging
+from typing import Any
+from datetime import datetime
+from pymongo import ASCENDING, DESCENDING, GEOSPHERE, IndexModel
+from pymongo.errors import PyMongoError
+from app.microweather.database import Database
+from app.microweather.particulate import VALID_READING_FILTER
+
+logger: logging.Logger = logging.getLogger("microweather.indexes")
+
+# 컬렉션별 인덱스 (service.py, batch.py, particulate.py, ingestion.py, retention.py, snapshot.py, history.py 의 조회·upsert·삭제 조건 기준)
+INDEXES: dict[str, list[IndexModel]] = {
+    "nowcast": [
+        IndexModel([("nx", ASCENDING), ("ny", ASCENDING), ("tm", DESCENDING)], name="nx_ny_tm"),
+        IndexModel([("tm", ASCENDING)], name="tm"),
+    ],
+    "forecast": [
+        IndexModel([("nx", ASCENDING), ("ny", ASCENDING), ("tm", DESCENDING)], name="nx_ny_tm"),
+        IndexModel([("tm", ASCENDING)], name="tm"),
+    ],
+    "location": [IndexModel([("geometry", GEOSPHERE)], name="geometry_2dsphere")],
+    "pm_station": [
+        IndexModel([("geometry", GEOSPHERE)], name="geometry_2dsphere"),
+        IndexModel([("station_name", ASCENDING)], name="station_name"),
+    ],
+    "pm_data": [
+        IndexModel([("station_name", ASCENDING), ("tm", DESCENDING)], name="station_name_tm"),
+        IndexModel([("tm", ASCENDING)], name="tm"),
+    ],
+    "nowcast_hourly": [IndexModel([("tm", ASCENDING)], name="tm", unique=True)],
+    "pm_data_hourly": [IndexModel([("tm", ASCENDING)], name="tm", unique=True)],
+    "snapshot": [IndexModel([("nx", ASCENDING), ("ny", ASCENDING)], name="nx_ny", unique=True)],
+    "nowcast_archive": [IndexModel([("nx", ASCENDING), ("ny", ASCENDING), ("day", ASCENDING)], name="nx_ny_day", unique=True)],
+}
+
+# 요청마다 실행되는 조회 (컬렉션, 이름, find 인자), 값은 실행 계획 확인용 예시
+_SAMPLE_POINT: dict = {"type": "Point", "coordinates": [126.9784, 37.5666]}
+HOT_QUERIES: list[tuple[str, str, dict]] = [
+    ("nowcast", "latest nowcast by cell", {"filter": {"nx": 60, "ny": 127}, "sort": [("tm", -1)], "limit": 1}),
+    ("forecast", "latest forecast by cell", {"filter": {"nx": 60, "ny": 127}, "sort": [("tm", -1)], "limit": 1}),
+    ("location", "address by point", {"filter": {"geometry": {"$geoIntersects": {"$geometry": _SAMPLE_POINT}}}, "limit": 1}),
+    ("pm_station", "nearest stations", {"filter": {"geometry": {"$near": {"$geometry": _SAMPLE_POINT}}}, "limit": 3}),
+    ("pm_data", "latest reading by station", {"filter": {"station_name": "중구"}, "sort": [("tm", -1)], "limit": 1}),
+    ("pm_data", "latest valid reading by station", {"filter": {"station_name": "중구"} | VALID_READING_FILTER, "sort": [("tm", -1)], "limit": 1}),
+    ("snapshot", "snapshot by cell", {"filter": {"nx": 60, "ny": 127}, "limit": 1}),
+    ("nowcast_archive", "archived days by cell", {"filter": {"nx": 60, "ny": 127, "day": {"$gte": datetime(2000, 1, 1)}}, "sort": [("day", 1)]}),
+    ("nowcast", "history by cell", {"filter": {"nx": 60, "ny": 127, "tm": {"$gte": datetime(2000, 1, 1)}}, "sort": [("tm", 1)]}),
+    ("pm_data", "readings since last poll", {"filter": {"tm": {"$gte": datetime(2000, 1, 1)}}, "sort": [("tm", 1)]}),
+]
+
+# 실행 계획에 있으면 안 되는 단계 (컬렉션 전체 스캔, 인덱스를 쓰지 못한 메모리 정렬)
+BAD_STAGES: tuple[str, ...] = ("COLLSCAN", "SORT")
+
+
+async def ensure_indexes(database: Database) -> dict[str, list[str]]:
+    """
+    INDEXES 에 선언한 인덱스를 생성하는 함수 (이미 있으면 변경 없음)
+    같은 이름에 다른 정의가 있는 등 생성에 실패한 인덱스는 로그를 남기고 다음 컬렉션 진행
+    :param database: Database
+    :return: dict[str, list[str]] 컬렉션 -> 생성(확인)한 인덱스 이름
+    """
+    created: dict[str, list[str]] = {}
+    for collection_name, indexes in INDEXES.items():
+        try:
+            created[collection_name] = await database.database[collection_name].create_indexes(indexes)
+        except PyMongoError as e:
+            logger.error("%s 인덱스 생성 실패: %s", collection_name, e)
+            created[collection_name] = []
+    return created
+
+
+def _stages(plan: Any) -> list[str]:
+    """
+    실행 계획에 포함된 모든 stage 이름을 찾는 함수 (inputStage, inputStages, queryPlan 등 중첩 구조 탐색)
+    :param plan: Any explain 결과의 winningPlan
+    :return: list[str]
+    """
+    if isinstance(plan, list):
+        return [stage for item in plan for stage in _stages(item)]
+    if not isinstance(plan, dict):
+        return []
+    stages: list[str] = [plan["stage"]] if isinstance(plan.get("stage"), str) else []
+    for key, value in plan.items():
+        if key != "rejectedPlans" and isinstance(value, (dict, list)):
+            stages.extend(_stages(value))
+    return stages
+
+
+async def verify_query_plans(database: Database) -> list[dict]:
+    """
+    HOT_QUERIES 의 실행 계획을 explain 으로 확인하는 함수
+    :param database: Database
+    :return: list[dict] 쿼리별 결과 (collection, query, stages, problem), problem 이 None 이면 정상
+    """
+    results: list[dict] = []
+    for collection_name, query_name, arguments in HOT_QUERIES:
+        result: dict = {"collection": collection_name, "query": query_name, "stages": [], "problem": None}
+        cursor = database.database[collection_name].find(arguments["filter"], sort=arguments.get("sort"))
+        if "limit" in arguments:
+            cursor = cursor.limit(arguments["limit"])
+        try:
+            explain: dict = await cursor.explain()
+        except PyMongoError as e:
+            # 2dsphere 인덱스가 없으면 $near 는 실행 계획 단계에서 실패
+            result["problem"] = f"explain failed: {e}"
+            results.append(result)
+            continue
+
+        result["stages"] = _stages(explain.get("queryPlanner", {}).get("winningPlan", {}))
+        bad_stages: list[str] = [stage for stage in result["stages"] if stage in BAD_STAGES]
+        if bad_stages:
+            result["problem"] = f"plan uses {', '.join(bad_stages)}"
+        results.append(result)
+    return results
+
+
+async def bootstrap(database: Database, ensure: bool = True, check: str = "warn") -> list[dict]:
+    """
+    서버 시작 시 인덱스 생성과 실행 계획 확인을 수행하는 함수
+    :param database: Database
+    :param ensure: bool 인덱스 생성 여부
+    :param check: str 실행 계획 확인 방식 ("warn": 로그만, "fail": 문제가 있으면 RuntimeError, "off": 확인 안 함)
+    :return: list[dict] verify_query_plans 결과 (check 가 off 면 빈 리스트)
+    :raise RuntimeError: check 가 fail 이고 문제가 있는 실행 계획이 있는 경우
+    """
+    if ensure:
+        await ensure_indexes(database)
+    if check == "off":
+        return []
+
+    results: list[dict] = await verify_query_plans(database)
+    problems: list[dict] = [result for result in results if result["problem"] is not None]
+    for result in problems:
+        logger.warning("%s (%s): %s %s", result["collection"], result["query"], result["problem"], result["stages"])
+    if problems and check == "fail":
+        raise RuntimeError(f"{len(problems)} hot queries have no usable index: " + ", ".join(
+            f"{result['collection']} ({result['query']})" for result in problems
+        ))
+    return results
@@ -0,0 +1,433 @@
+import os
+import random
+import asyncio
+import logging
+import httpx
+import shapely
+import numpy as np
+from typing import Awaitable, Callable
+from datetime import datetime, timedelta
+from pymongo import UpdateOne
+from pymongo.errors import PyMongoError
+from app.microweather import grid
+from app.microweather.database import Database
+from app.microweather.release import NOWCAST_RELEASE_MINUTE, FORECAST_RELEASE_MINUTE, PM_RELEASE_MINUTE, latest_base_time
+
+logger: logging.Logger = logging.getLogger("microweather.ingestion")
+
+KMA_API_BASE_URL: str = os.getenv("KMA_API_BASE_URL", "http://apis.data.go.kr/1360000/VilageFcstInfoService_2.0")
+AIRKOREA_API_BASE_URL: str = os.getenv("AIRKOREA_API_BASE_URL", "http://apis.data.go.kr/B552584/ArpltnInforInqireSvc")
+AIRKOREA_STATION_API_BASE_URL: str = os.getenv("AIRKOREA_STATION_API_BASE_URL", "http://apis.data.go.kr/B552584/MsrstnInfoInqireSvc")
+
+NOWCAST_CATEGORIES: tuple[str, ...] = ("PTY", "REH", "RN1", "T1H")
+FORECAST_CATEGORIES: tuple[str, ...] = ("LGT", "PTY", "RN1", "SKY", "T1H")
+
+
+class UpstreamError(Exception):
+    """
+    공공데이터 API 응답이 비정상일 때 발생하는 예외
+    """
+
+
+def parse_kma_value(value: str | float | int | None) -> float | None:
+    """
+    기상청 API 관측/예보 값을 숫자로 변환하는 함수
+    "강수없음", "1mm 미만" 은 0, "30.0~50.0mm" 같은 범위는 하한값, 결측값(±900 이상)은 None
+    :param value: str | float | int | None
+    :return: float | None
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        number: float = float(value)
+    else:
+        text: str = value.strip().replace("mm", "").replace("cm", "").strip()
+        if text in ("", "-"):
+            return None
+        if text in ("강수없음", "적설없음") or text.endswith("미만"):
+            return 0.0
+        text = text.split("~")[0].replace("이상", "").strip()
+        try:
+            number = float(text)
+        except ValueError:
+            return None
+    if number >= 900 or number <= -900:
+        return None
+    return number
+
+
+def parse_pm_value(value: str | int | None) -> int | None:
+    """
+    에어코리아 API 측정값/등급을 정수로 변환하는 함수 ("-", 빈 값은 None)
+    :param value: str | int | None
+    :return: int | None
+    """
+    if value is None or value in ("", "-"):
+        return None
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_pm_datetime(data_time: str) -> datetime:
+    """
+    에어코리아 dataTime("YYYY-MM-DD HH:MM", 자정은 "24:00") 을 datetime 으로 변환하는 함수
+    :param data_time: str
+    :return: datetime
+    """
+    day, time = data_time.strip().split(" ")
+    hour, minute = time.split(":")
+    return datetime.strptime(day, "%Y-%m-%d") + timedelta(hours=int(hour), minutes=int(minute))
+
+
+def to_nowcast_document(grid_x: int, grid_y: int, base_time: datetime, items: list[dict]) -> dict:
+    """
+    초단기실황 API 응답 item 목록을 nowcast 컬렉션 문서로 변환하는 함수
+    :return: dict {nx, ny, tm, PTY, REH, RN1, T1H, ...}
+    """
+    document: dict = {"nx": grid_x, "ny": grid_y, "tm": base_time}
+    document.update({category: None for category in NOWCAST_CATEGORIES})
+    for item in items:
+        document[item["category"]] = parse_kma_value(item.get("obsrValue"))
+    return document
+
+
+def to_forecast_document(grid_x: int, grid_y: int, base_time: datetime, items: list[dict]) -> dict:
+    """
+    초단기예보 API 응답 item 목록을 forecast 컬렉션 문서로 변환하는 함수
+    :return: dict {nx, ny, tm, items: [{effective_time, LGT, PTY, RN1, SKY, T1H, ...}]}
+    """
+    forecasts: dict[datetime, dict] = {}
+    for item in items:
+        effective_time: datetime = datetime.strptime(item["fcstDate"] + item["fcstTime"], "%Y%m%d%H%M")
+        forecast: dict = forecasts.setdefault(
+            effective_time, {"effective_time": effective_time} | {category: None for category in FORECAST_CATEGORIES}
+        )
+        forecast[item["category"]] = parse_kma_value(item.get("fcstValue"))
+    return {"nx": grid_x, "ny": grid_y, "tm": base_time, "items": [forecasts[key] for key in sorted(forecasts)]}
+
+
+def to_pm_document(item: dict) -> dict:
+    """
+    에어코리아 실시간 측정 item 을 pm_data 컬렉션 문서로 변환하는 함수
+    :return: dict {station_name, tm, dataTime, pm10Value, pm10Grade1h, pm25Value, pm25Grade1h}
+    """
+    tm: datetime = parse_pm_datetime(item["dataTime"])
+    return {
+        "station_name": item["stationName"],
+        "tm": tm,
+        "dataTime": tm,
+        "pm10Value": parse_pm_value(item.get("pm10Value")),
+        "pm10Grade1h": parse_pm_value(item.get("pm10Grade1h")),
+        "pm25Value": parse_pm_value(item.get("pm25Value")),
+        "pm25Grade1h": parse_pm_value(item.get("pm25Grade1h")),
+    }
+
+
+def get_land_cells(documents: list[dict]) -> list[tuple[int, int]]:
+    """
+    읍면동 경계 폴리곤과 겹치는 격자 목록을 계산하는 함수
+    격자 중심이 폴리곤 안에 있는 격자와 경계선 꼭짓점이 지나는 격자(해안선, 작은 섬)를 합침
+    :param documents: list[dict] location 컬렉션 문서 (geometry 필드)
+    :return: list[tuple[int, int]]
+    """
+    geometries: np.ndarray = np.array([shapely.geometry.shape(document["geometry"]) for document in documents], dtype=object)
+    tree: shapely.STRtree = shapely.STRtree(geometries)
+
+    grid_x, grid_y = np.meshgrid(np.arange(1, grid.GRID_NX + 1), np.arange(1, grid.GRID_NY + 1), indexing="ij")
+    grid_x, grid_y = grid_x.ravel(), grid_y.ravel()
+    latitudes, longitudes = grid.from_grid_batch(grid_x, grid_y)
+    point_indexes, _ = tree.query(shapely.points(longitudes, latitudes), predicate="within")
+
+    vertices: np.ndarray = shapely.get_coordinates(geometries)
+    vertex_x, vertex_y = grid.to_grid_batch(vertices[:, 1], vertices[:, 0])
+
+    cells: set[tuple[int, int]] = set(zip(grid_x[point_indexes].tolist(), grid_y[point_indexes].tolist()))
+    cells.update(zip(vertex_x.tolist(), vertex_y.tolist()))
+    return sorted(
+        (cell_x, cell_y) for cell_x, cell_y in cells
+        if 1 <= cell_x <= grid.GRID_NX and 1 <= cell_y <= grid.GRID_NY
+    )
+
+
+class IngestionService:
+    def __init__(
+        self,
+        database: Database,
+        client: httpx.AsyncClient,
+        service_key: str,
+        concurrency: int = 20,
+        retries: int = 3,
+        backoff: float = 0.5,
+        batch_size: int = 500,
+        kma_base_url: str = KMA_API_BASE_URL,
+        airkorea_base_url: str = AIRKOREA_API_BASE_URL,
+        station_base_url: str = AIRKOREA_STATION_API_BASE_URL,
+    ) -> None:
+        """
+        기상청/에어코리아 API 를 비동기로 일괄 호출해 MongoDB 컬렉션을 갱신하는 클래스
+        :param database: Database
+        :param client: httpx.AsyncClient (커넥션 풀 공유)
+        :param service_key: str 공공데이터포털 서비스 키
+        :param concurrency: int 동시에 호출할 최대 API 요청 수
+        :param retries: int 요청 실패 시 재시도 횟수
+        :param backoff: float 재시도 대기 시간 기준(초), 재시도마다 2배 + 지터
+        :param batch_size: int bulk_write 한 번에 보낼 최대 문서 수
+        :param kma_base_url: str 기상청 동네예보 API 주소 (로컬 대체 서버로 교체 가능)
+        :param airkorea_base_url: str 에어코리아 대기오염정보 API 주소
+        :param station_base_url: str 에어코리아 측정소정보 API 주소
+        """
+        self.database: Database = database
+        self.client: httpx.AsyncClient = client
+        self.service_key: str = service_key
+        self.semaphore: asyncio.Semaphore = asyncio.Semaphore(concurrency)
+        self.retries: int = retries
+        self.backoff: float = backoff
+        self.batch_size: int = batch_size
+        self.kma_base_url: str = kma_base_url
+        self.airkorea_base_url: str = airkorea_base_url
+        self.station_base_url: str = station_base_url
+
+    @staticmethod
+    def create_client(concurrency: int = 20, timeout: float = 10.0) -> httpx.AsyncClient:
+        """
+        동시 요청 수에 맞춘 커넥션 풀을 가진 HTTP 클라이언트 생성 메소드
+        :param concurrency: int
+        :param timeout: float
+        :return: httpx.AsyncClient
+        """
+        return httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+        )
+
+    async def _request(self, url: str, params: dict) -> dict:
+        """
+        공공데이터 API 호출 메소드 (네트워크 오류, 5xx, 비정상 응답 코드 시 지수 백오프로 재시도)
+        :param url: str
+        :param params: dict
+        :return: dict response.body
+        """
+        params = {"serviceKey": self.service_key} | params
+        for attempt in range(self.retries + 1):
+            try:
+                async with self.semaphore:
+                    response: httpx.Response = await self.client.get(url, params=params)
+                response.raise_for_status()
+                data: dict = response.json()["response"]
+                result_code: str = data["header"]["resultCode"]
+                if result_code != "00":
+                    raise UpstreamError(f'{url} 비정상 응답 코드 : {result_code} {data["header"].get("resultMsg")}')
+                return data["body"]
+            except (httpx.HTTPError, ValueError, KeyError, UpstreamError) as e:
+                if attempt == self.retries:
+                    raise UpstreamError(str(e)) from e
+                await asyncio.sleep(self.backoff * (2 ** attempt) * (1 + random.random()))
+
+    async def _request_pages(self, url: str, params: dict, num_of_rows: int = 1000) -> list[dict]:
+        """
+        totalCount 만큼 pageNo 를 넘겨 가며 모든 item 을 조회하는 메소드 (에어코리아 API, 첫 페이지 이후는 동시에 조회)
+        :param url: str
+        :param params: dict numOfRows, pageNo 를 제외한 요청 인자
+        :param num_of_rows: int 페이지당 item 수
+        :return: list[dict] 전체 item
+        """
+        body: dict = await self._request(url, params | {"numOfRows": str(num_of_rows), "pageNo": "1"})
+        items: list[dict] = list(body["items"])
+        pages: int = -(-int(body.get("totalCount") or len(items)) // num_of_rows)
+        bodies: list[dict] = await asyncio.gather(*(
+            self._request(url, params | {"numOfRows": str(num_of_rows), "pageNo": str(page)}) for page in range(2, pages + 1)
+        ))
+        for page_body in bodies:
+            items.extend(page_body["items"])
+        return items
+
+    async def _bulk_upsert(self, collection, documents: list[dict], keys: tuple[str, ...]) -> int:
+        """
+        keys 기준 upsert 를 batch_size 단위 bulk_write 로 실행하는 메소드
+        :return: int 반영된 문서 수
+        """
+        written: int = 0
+        for start in range(0, len(documents), self.batch_size):
+            operations: list[UpdateOne] = [
+                UpdateOne({key: document[key] for key in keys}, {"$set": document}, upsert=True)
+                for document in documents[start:start + self.batch_size]
+            ]
+            result = await collection.bulk_write(operations, ordered=False)
+            written += result.upserted_count + result.modified_count
+        return written
+
+    async def fetch_nowcast(self, grid_x: int, grid_y: int, base_time: datetime) -> dict:
+        """
+        격자 하나의 초단기실황 조회 메소드
+        :return: dict nowcast 문서
+        """
+        body: dict = await self._request(f"{self.kma_base_url}/getUltraSrtNcst", {
+            "numOfRows": "30",
+            "pageNo": "1",
+            "dataType": "JSON",
+            "base_date": base_time.strftime("%Y%m%d"),
+            "base_time": base_time.strftime("%H%M"),
+            "nx": grid_x,
+            "ny": grid_y,
+        })
+        return to_nowcast_document(grid_x, grid_y, base_time, body["items"]["item"])
+
+    async def fetch_forecast(self, grid_x: int, grid_y: int, base_time: datetime) -> dict:
+        """
+        격자 하나의 초단기예보 조회 메소드
+        :return: dict forecast 문서
+        """
+        body: dict = await self._request(f"{self.kma_base_url}/getUltraSrtFcst", {
+            "numOfRows": "60",
+            "pageNo": "1",
+            "dataType": "JSON",
+            "base_date": base_time.strftime("%Y%m%d"),
+            "base_time": base_time.strftime("%H%M"),
+            "nx": grid_x,
+            "ny": grid_y,
+        })
+        return to_forecast_document(grid_x, grid_y, base_time, body["items"]["item"])
+
+    async def ingest_cell(self, kind: str, grid_x: int, grid_y: int, now: datetime | None = None) -> dict:
+        """
+        격자 하나의 최신 초단기실황(kind="nowcast") 또는 초단기예보(kind="forecast")를 조회해 저장하는 메소드
+        :param kind: str
+        :param grid_x: int
+        :param grid_y: int
+        :param now: datetime
+        :return: dict 조회한 문서 (저장 실패 시에도 반환)
+        """
+        fetch, collection, release_minute = {
+            "nowcast": (self.fetch_nowcast, self.database.nowcast, NOWCAST_RELEASE_MINUTE),
+            "forecast": (self.fetch_forecast, self.database.forecast, FORECAST_RELEASE_MINUTE),
+        }[kind]
+        document: dict = await fetch(grid_x, grid_y, latest_base_time(now or datetime.now(), release_minute))
+        try:
+            await self._bulk_upsert(collection, [document], ("nx", "ny", "tm"))
+        except PyMongoError as e:
+            # 조회한 문서는 그대로 사용하고 저장은 다음 정기 수집에 맡김
+            logger.warning(f"{collection.name} ({grid_x}, {grid_y}) 저장 실패 : {e}")
+        return document
+
+    async def _ingest_cells(self, fetch, collection, cells: list[tuple[int, int]], base_time: datetime) -> dict:
+        """
+        전체 격자를 동시에 조회해 하나의 컬렉션에 일괄 upsert 하는 메소드 (격자별 실패는 건너뜀)
+        :return: dict 처리 결과
+        """
+        results: list = await asyncio.gather(
+            *(fetch(grid_x, grid_y, base_time) for grid_x, grid_y in cells), return_exceptions=True
+        )
+        documents: list[dict] = [result for result in results if isinstance(result, dict)]
+        failed: int = len(results) - len(documents)
+        if failed:
+            logger.warning(f"{collection.name} {base_time:%Y%m%d%H%M} 조회 실패 격자 {failed}/{len(cells)}")
+        written: int = await self._bulk_upsert(collection, documents, ("nx", "ny", "tm"))
+        return {"collection": collection.name, "tm": base_time, "cells": len(cells), "failed": failed, "written": written}
+
+    async def ingest_nowcast(self, cells: list[tuple[int, int]], now: datetime | None = None) -> dict:
+        """
+        현재 조회 가능한 최신 초단기실황을 전체 격자에 대해 수집하는 메소드
+        :return: dict
+        """
+        base_time: datetime = latest_base_time(now or datetime.now(), NOWCAST_RELEASE_MINUTE)
+        return await self._ingest_cells(self.fetch_nowcast, self.database.nowcast, cells, base_time)
+
+    async def ingest_forecast(self, cells: list[tuple[int, int]], now: datetime | None = None) -> dict:
+        """
+        현재 조회 가능한 최신 초단기예보를 전체 격자에 대해 수집하는 메소드
+        :return: dict
+        """
+        base_time: datetime = latest_base_time(now or datetime.now(), FORECAST_RELEASE_MINUTE)
+        return await self._ingest_cells(self.fetch_forecast, self.database.forecast, cells, base_time)
+
+    async def ingest_particulate_matter(self) -> dict:
+        """
+        전국 측정소의 실시간 미세먼지 측정 정보를 한 번에 수집하는 메소드
+        :return: dict
+        """
+        items: list[dict] = await self._request_pages(f"{self.airkorea_base_url}/getCtprvnRltmMesureDnsty", {
+            "returnType": "json",
+            "sidoName": "전국",
+            "ver": "1.3",
+        })
+        documents: list[dict] = [to_pm_document(item) for item in items if item.get("dataTime")]
+        written: int = await self._bulk_upsert(self.database.pm_data, documents, ("station_name", "tm"))
+        return {"collection": "pm_data", "stations": len(documents), "written": written}
+
+    async def ingest_stations(self) -> dict:
+        """
+        측정소 목록과 위치(WGS84)를 수집하는 메소드
+        :return: dict
+        """
+        items: list[dict] = await self._request_pages(f"{self.station_base_url}/getMsrstnList", {"returnType": "json"})
+        documents: list[dict] = [
+            {
+                "station_name": item["stationName"],
+                "address": item.get("addr"),
+                "geometry": {"type": "Point", "coordinates": [float(item["dmY"]), float(item["dmX"])]},
+            }
+            for item in items
+            if item.get("dmX") and item.get("dmY")
+        ]
+        written: int = await self._bulk_upsert(self.database.pm_station, documents, ("station_name",))
+        return {"collection": "pm_station", "stations": len(documents), "written": written}
+
+    async def load_land_cells(self) -> list[tuple[int, int]]:
+        """
+        location 컬렉션의 읍면동 경계로 수집 대상 격자 목록을 계산하는 메소드
+        :return: list[tuple[int, int]]
+        """
+        documents: list[dict] = await self.database.location.find({}, projection={"_id": 0, "geometry": 1}).to_list(length=None)
+        return await asyncio.to_thread(get_land_cells, documents)
+
+    async def run_forever(
+        self,
+        cells: list[tuple[int, int]],
+        delay_minutes: int = 10,
+        on_update: Callable[[], Awaitable[dict]] | None = None,
+    ) -> None:
+        """
+        발표 주기에 맞춰 초단기실황, 초단기예보, 미세먼지를 계속 수집하는 메소드
+        각 발표 시각(release.py, PM_RELEASE_MINUTE) 에서 delay_minutes 만큼 지난 뒤 실행
+        :param cells: list[tuple[int, int]]
+        :param delay_minutes: int
+        :param on_update: 수집 작업이 끝날 때마다 실행할 후속 작업 (격자별 snapshot 갱신 등)
+        """
+        jobs: dict[int, Callable[[], Awaitable[dict]]] = {
+            (NOWCAST_RELEASE_MINUTE + delay_minutes) % 60: lambda: self.ingest_nowcast(cells),
+            (FORECAST_RELEASE_MINUTE + delay_minutes) % 60: lambda: self.ingest_forecast(cells),
+            (PM_RELEASE_MINUTE + delay_minutes) % 60: self.ingest_particulate_matter,
+        }
+        while True:
+            now: datetime = datetime.now()
+            runs: list[datetime] = []
+            for minute in jobs:
+                run_time: datetime = now.replace(minute=minute, second=0, microsecond=0)
+                runs.append(run_time if run_time > now else run_time + timedelta(hours=1))
+            next_run: datetime = min(runs)
+            await asyncio.sleep((next_run - now).total_seconds())
+            try:
+                logger.info(await jobs[next_run.minute]())
+            except Exception as e:
+                logger.error(f"수집 실패 : {e}")
+                continue
+            if on_update is not None:
+                try:
+                    logger.info(await on_update())
+                except Exception as e:
+                    logger.error(f"수집 후속 작업 실패 : {e}")
+
+    async def watch_stations(self, interval: float) -> None:
+        """
+        interval 초마다 측정소 목록을 다시 수집하는 백그라운드 작업 (수집 프로세스에서 실행, 시작 시 한 번 실행)
+        측정소 신설·이전·폐쇄가 pm_station 에 반영되어야 웹 서버의 StationIndex 와 snapshot 이 가까운 측정소를 올바르게 고름
+        :param interval: float
+        """
+        while True:
+            try:
+                logger.info(await self.ingest_stations())
+            except Exception as e:
+                logger.error(f"측정소 목록 수집 실패 : {e}")
+            await asyncio.sleep(interval)
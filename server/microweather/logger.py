@@ -0,0 +1,185 @@
+import os
+import sys
+import json
+import time
+import queue
+import random
+import logging
+from contextvars import ContextVar
+from urllib.parse import parse_qsl
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+
+logger: logging.Logger = logging.getLogger("microweather")
+access_logger: logging.Logger = logging.getLogger("microweather.access")
+
+# 요청 하나의 접근 로그에 함께 기록할 필드 (AccessLogMiddleware 가 요청마다 새 dict 를 설정)
+_request_fields: ContextVar[dict | None] = ContextVar("request_fields", default=None)
+
+
+def log_fields(**fields) -> None:
+    """
+    현재 요청의 접근 로그에 필드를 추가하는 함수 (요청 밖에서 호출하면 무시)
+    """
+    request_fields: dict | None = _request_fields.get()
+    if request_fields is not None:
+        request_fields.update(fields)
+
+
+def log_stage(stage: str, seconds: float) -> None:
+    """
+    현재 요청의 단계별 처리 시간(ms)을 접근 로그에 추가하는 함수 (요청 밖에서 호출하면 무시)
+    """
+    request_fields: dict | None = _request_fields.get()
+    if request_fields is not None:
+        request_fields.setdefault("stages_ms", {})[stage] = round(seconds * 1000, 3)
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        로그 레코드를 한 줄 JSON 으로 변환하는 메소드 (extra={"fields": {...}} 로 전달한 값 포함)
+        """
+        line: dict = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        line.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            line["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            line["exception"] = record.exc_text
+        return json.dumps(line, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    def __init__(self, sample_rate: float = 1.0) -> None:
+        """
+        INFO 이하 로그는 sample_rate 비율만 통과시키고 WARNING 이상은 모두 통과시키는 필터
+        :param sample_rate: float 0.0 ~ 1.0
+        """
+        super().__init__()
+        self.sample_rate: float = sample_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.WARNING or self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+
+class _NonBlockingQueueHandler(QueueHandler):
+    def __init__(self, log_queue: queue.Queue) -> None:
+        """
+        큐가 가득 차면 기다리지 않고 레코드를 버리는 QueueHandler (이벤트 루프를 막지 않음)
+        """
+        super().__init__(log_queue)
+        self.dropped: int = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 포맷은 QueueListener 스레드의 핸들러에서 수행하고, 여기서는 메시지 인자만 확정
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def setup_logging(
+    log_dir: str = "log/server",
+    sample_rate: float = 1.0,
+    backup_count: int = 7,
+    queue_size: int = 10000,
+    console: bool = False,
+) -> QueueListener:
+    """
+    microweather 로거에 큐 기반 JSON 로그를 설정하는 함수 (서버 시작 시 한 번 호출)
+    요청 처리 쪽에서는 큐에 넣기만 하고, 파일 쓰기와 자정 기준 로테이션은 QueueListener 스레드에서 수행
+    :param log_dir: str 로그 디렉터리 (old_server 와 같은 log/server)
+    :param sample_rate: float INFO 로그 샘플링 비율
+    :param backup_count: int 보관할 로테이션 파일 수
+    :param queue_size: int 큐 최대 크기 (초과분은 버림)
+    :param console: bool 표준 출력에도 기록할지 여부
+    :return: QueueListener (start 이후 반환, 종료 시 stop 호출)
+    """
+    os.makedirs(log_dir, exist_ok=True)
+    formatter: JsonFormatter = JsonFormatter()
+    handlers: list[logging.Handler] = [
+        TimedRotatingFileHandler(
+            filename=os.path.join(log_dir, "server.log"), when="midnight", interval=1, backupCount=backup_count, encoding="utf-8"
+        )
+    ]
+    if console:
+        handlers.append(logging.StreamHandler(sys.stdout))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    queue_handler: _NonBlockingQueueHandler = _NonBlockingQueueHandler(queue.Queue(maxsize=queue_size))
+    queue_handler.addFilter(SamplingFilter(sample_rate))
+    for existing in [handler for handler in logger.handlers if isinstance(handler, _NonBlockingQueueHandler)]:
+        logger.removeHandler(existing)
+    logger.addHandler(queue_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+    listener: QueueListener = QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+def _get_coordinates(query_string: bytes) -> dict:
+    query: dict = dict(parse_qsl(query_string.decode("latin-1")))
+    coordinates: dict = {}
+    for name in ("latitude", "longitude"):
+        try:
+            coordinates[name] = float(query[name])
+        except (KeyError, ValueError):
+            continue
+    return coordinates
+
+
+class AccessLogMiddleware:
+    def __init__(self, app) -> None:
+        """
+        요청마다 접근 로그 한 줄(IP, 경로, 위경도, 상태 코드, 처리 시간, 격자, 단계별 처리 시간)을 남기는 ASGI 미들웨어
+        5xx 는 ERROR, 4xx 는 WARNING, 나머지는 INFO (INFO 만 샘플링 대상)
+        :param app: ASGI 앱
+        """
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        fields: dict = {}
+        token = _request_fields.set(fields)
+        status_code: int = 500
+        start: float = time.perf_counter()
+
+        async def send_wrapper(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_fields.reset(token)
+            client = scope.get("client")
+            level: int = logging.ERROR if status_code >= 500 else logging.WARNING if status_code >= 400 else logging.INFO
+            access_logger.log(level, "%s %s %d", scope["method"], scope["path"], status_code, extra={"fields": {
+                "ip": client[0] if client else None,
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status_code,
+                "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+                **_get_coordinates(scope.get("query_string", b"")),
+                **fields,
+            }})
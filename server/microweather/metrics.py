@@ -0,0 +1,240 @@
+import os
+import glob
+import time
+import asyncio
+from typing import Awaitable, Callable, Iterable, TypeVar
+from pymongo import monitoring
+from prometheus_client import Counter, Gauge, Histogram, CollectorRegistry, REGISTRY, CONTENT_TYPE_LATEST, generate_latest, multiprocess
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+from app.microweather.logger import log_stage
+
+T = TypeVar("T")
+
+# 워커가 여러 개일 때 워커별 지표 파일을 둘 디렉터리 (prometheus_client 멀티 프로세스 모드, 지표 생성 전에 설정되어 있어야 함)
+MULTIPROCESS_DIR: str | None = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+# 워커 프로세스마다 값이 다른 수집 시점 컬렉터 (캐시 통계 등), 멀티 프로세스 모드에서는 응답한 워커의 값
+PROCESS_REGISTRY: CollectorRegistry = CollectorRegistry(auto_describe=True)
+
+LATENCY_BUCKETS: tuple[float, ...] = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+HTTP_REQUESTS = Counter(
+    "microweather_http_requests_total", "처리한 HTTP 요청 수", ["method", "route", "status"]
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "microweather_http_request_duration_seconds", "HTTP 요청 처리 시간", ["method", "route"], buckets=LATENCY_BUCKETS
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "microweather_http_requests_in_progress", "처리 중인 HTTP 요청 수", ["method"], multiprocess_mode="livesum"
+)
+BRANCH_DURATION = Histogram(
+    "microweather_weather_branch_duration_seconds", "get_weather 단계별 처리 시간", ["branch", "outcome"], buckets=LATENCY_BUCKETS
+)
+EVENT_LOOP_LAG = Histogram(
+    "microweather_event_loop_lag_seconds", "이벤트 루프 지연 (예약한 깨어남 시각과 실제 시각의 차이)", buckets=LATENCY_BUCKETS
+)
+RATE_LIMITED = Counter(
+    "microweather_rate_limited_total", "요청 제한으로 거부한 요청 수", ["reason"]
+)
+SINGLE_FLIGHT_CALLS = Counter(
+    "microweather_single_flight_calls_total", "동시 조회 합치기 대상 요청 수 (leader: 실제 실행, coalesced: 진행 중인 실행 결과 공유)", ["group", "role"]
+)
+STAGE_FALLBACKS = Counter(
+    "microweather_stage_fallbacks_total", "제한 시간 초과·실패로 마지막 정상 값을 사용한 단계 수", ["stage", "reason"]
+)
+WARMUP_SECONDS = Gauge(
+    "microweather_warmup_seconds", "시작 준비 단계별 소요 시간 (total: 서버 시작부터 준비 완료까지)", ["step"], multiprocess_mode="liveall"
+)
+MONGO_POOL_CONNECTIONS = Gauge(
+    "microweather_mongo_pool_connections", "커넥션 풀이 보유한 연결 수", ["address"], multiprocess_mode="livesum"
+)
+MONGO_POOL_CHECKED_OUT = Gauge(
+    "microweather_mongo_pool_checked_out", "대여 중인 연결 수", ["address"], multiprocess_mode="livesum"
+)
+MONGO_POOL_CHECKOUT_FAILURES = Counter(
+    "microweather_mongo_pool_checkout_failures_total", "연결 대여 실패 수", ["address", "reason"]
+)
+
+
+async def timed(branch: str, awaitable: Awaitable[T]) -> T:
+    """
+    코루틴 실행 시간을 단계(branch)별 히스토그램과 현재 요청의 접근 로그에 기록하는 함수 (예외는 그대로 전파)
+    :param branch: str
+    :param awaitable: Awaitable
+    :return: awaitable 의 결과
+    """
+    start: float = time.perf_counter()
+    outcome: str = "error"
+    try:
+        result: T = await awaitable
+        outcome = "ok"
+        return result
+    finally:
+        elapsed: float = time.perf_counter() - start
+        BRANCH_DURATION.labels(branch=branch, outcome=outcome).observe(elapsed)
+        log_stage(branch, elapsed)
+
+
+async def watch_event_loop_lag(interval: float = 0.5) -> None:
+    """
+    interval 초마다 깨어나 예정 시각보다 늦어진 만큼을 이벤트 루프 지연으로 기록하는 백그라운드 작업
+    :param interval: float
+    """
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+    while True:
+        expected: float = loop.time() + interval
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.observe(max(0.0, loop.time() - expected))
+
+
+class ConnectionPoolMetrics(monitoring.ConnectionPoolListener):
+    """
+    pymongo 커넥션 풀 이벤트로 서버별 연결 수, 대여 중인 연결 수, 대여 실패 수를 집계하는 리스너
+    """
+
+    @staticmethod
+    def _address(event: monitoring._PoolEvent) -> str:
+        host, port = event.address
+        return f"{host}:{port}"
+
+    def pool_created(self, event: monitoring.PoolCreatedEvent) -> None:
+        MONGO_POOL_CONNECTIONS.labels(address=self._address(event)).set(0)
+        MONGO_POOL_CHECKED_OUT.labels(address=self._address(event)).set(0)
+
+    def pool_ready(self, event: monitoring.PoolReadyEvent) -> None:
+        pass
+
+    def pool_cleared(self, event: monitoring.PoolClearedEvent) -> None:
+        pass
+
+    def pool_closed(self, event: monitoring.PoolClosedEvent) -> None:
+        MONGO_POOL_CONNECTIONS.labels(address=self._address(event)).set(0)
+        MONGO_POOL_CHECKED_OUT.labels(address=self._address(event)).set(0)
+
+    def connection_created(self, event: monitoring.ConnectionCreatedEvent) -> None:
+        MONGO_POOL_CONNECTIONS.labels(address=self._address(event)).inc()
+
+    def connection_ready(self, event: monitoring.ConnectionReadyEvent) -> None:
+        pass
+
+    def connection_closed(self, event: monitoring.ConnectionClosedEvent) -> None:
+        MONGO_POOL_CONNECTIONS.labels(address=self._address(event)).dec()
+
+    def connection_check_out_started(self, event: monitoring.ConnectionCheckOutStartedEvent) -> None:
+        pass
+
+    def connection_check_out_failed(self, event: monitoring.ConnectionCheckOutFailedEvent) -> None:
+        MONGO_POOL_CHECKOUT_FAILURES.labels(address=self._address(event), reason=str(event.reason)).inc()
+
+    def connection_checked_out(self, event: monitoring.ConnectionCheckedOutEvent) -> None:
+        MONGO_POOL_CHECKED_OUT.labels(address=self._address(event)).inc()
+
+    def connection_checked_in(self, event: monitoring.ConnectionCheckedInEvent) -> None:
+        MONGO_POOL_CHECKED_OUT.labels(address=self._address(event)).dec()
+
+
+class CacheCollector(Collector):
+    def __init__(self, caches: Callable[[], dict[str, dict]]) -> None:
+        """
+        수집 시점에 캐시별 stats() 결과를 읽어 적중/미스/제거 수와 적중률을 노출하는 컬렉터
+        :param caches: 캐시 이름 -> stats() 결과 dict 를 반환하는 함수
+        """
+        self.caches: Callable[[], dict[str, dict]] = caches
+
+    def collect(self) -> Iterable:
+        hits = CounterMetricFamily("microweather_cache_hits", "캐시 적중 수", labels=["cache"])
+        misses = CounterMetricFamily("microweather_cache_misses", "캐시 미스 수", labels=["cache"])
+        evictions = CounterMetricFamily("microweather_cache_evictions", "캐시 제거 수", labels=["cache"])
+        size = GaugeMetricFamily("microweather_cache_size", "캐시 항목 수", labels=["cache"])
+        hit_ratio = GaugeMetricFamily("microweather_cache_hit_ratio", "캐시 적중률", labels=["cache"])
+        for name, stats in self.caches().items():
+            hits.add_metric([name], stats["hits"])
+            misses.add_metric([name], stats["misses"])
+            evictions.add_metric([name], stats["evictions"])
+            size.add_metric([name], stats["size"])
+            hit_ratio.add_metric([name], stats["hit_ratio"])
+        yield from (hits, misses, evictions, size, hit_ratio)
+
+
+def get_route_path(scope) -> str:
+    """
+    ASGI scope 의 path 에서 root_path 를 뺀 앱 내부 경로를 반환하는 함수 (starlette get_route_path 와 같은 규칙)
+    프록시가 접두사(/microweather)를 떼고 전달해도, 그대로 전달해도 같은 경로가 됨
+    :param scope: ASGI scope
+    :return: str
+    """
+    root_path: str = scope.get("root_path", "")
+    path: str = scope["path"]
+    if root_path and (path == root_path or path.startswith(root_path + "/")):
+        return path[len(root_path):]
+    return path
+
+
+class MetricsMiddleware:
+    def __init__(self, app, excluded_paths: tuple[str, ...] = ("/metrics",)) -> None:
+        """
+        요청 수, 상태 코드, 처리 시간을 라우트 경로별로 기록하는 ASGI 미들웨어
+        라벨 수가 늘어나지 않도록 실제 URL 대신 root_path 를 포함한 매칭 라우트 경로를 사용 (매칭 실패 시 "unmatched")
+        :param app: ASGI 앱
+        :param excluded_paths: 기록하지 않을 라우트 경로 (root_path 제외, get_route_path 참고)
+        """
+        self.app = app
+        self.excluded_paths: tuple[str, ...] = excluded_paths
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method: str = scope["method"]
+        status_code: int = 500
+        start: float = time.perf_counter()
+
+        async def send_wrapper(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_PROGRESS.labels(method=method).inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_PROGRESS.labels(method=method).dec()
+            route = scope.get("route")
+            path: str = scope.get("root_path", "") + route.path if route is not None else "unmatched"
+            if get_route_path(scope) not in self.excluded_paths:
+                HTTP_REQUEST_DURATION.labels(method=method, route=path).observe(time.perf_counter() - start)
+                HTTP_REQUESTS.labels(method=method, route=path, status=str(status_code)).inc()
+
+
+def prepare_multiprocess_dir(path: str) -> None:
+    """
+    멀티 프로세스 모드 지표 디렉터리를 만들고 이전 실행의 지표 파일을 지우는 함수 (워커 시작 전 부모 프로세스에서 한 번 실행)
+    :param path: str
+    """
+    os.makedirs(path, exist_ok=True)
+    for file in glob.glob(os.path.join(path, "*.db")):
+        os.remove(file)
+
+
+def mark_process_dead() -> None:
+    """
+    종료하는 워커의 live* 게이지 값을 합계에서 제외하는 함수 (멀티 프로세스 모드에서만 동작)
+    """
+    if MULTIPROCESS_DIR is not None:
+        multiprocess.mark_process_dead(os.getpid(), MULTIPROCESS_DIR)
+
+
+def render(registry: CollectorRegistry = REGISTRY) -> tuple[bytes, str]:
+    """
+    Prometheus 텍스트 형식으로 지표를 직렬화하는 함수
+    멀티 프로세스 모드(PROMETHEUS_MULTIPROC_DIR)면 어느 워커가 응답해도 모든 워커의 지표 파일을 합친 값을 반환
+    :param registry: CollectorRegistry 단일 프로세스일 때 직렬화할 레지스트리
+    :return: tuple[bytes, str] (본문, Content-Type)
+    """
+    if MULTIPROCESS_DIR is not None:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry, path=MULTIPROCESS_DIR)
+    return generate_latest(registry) + generate_latest(PROCESS_REGISTRY), CONTENT_TYPE_LATEST
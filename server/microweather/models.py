@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 
 class NowcastModel(BaseModel):
@@ -30,3 +30,19 @@ class WeatherModel(BaseModel):
     nowcast: NowcastModel
     forecast: list[ForecastModel]
     particulate_matter: ParticulateMatterModel
+    stale: list[str] = Field(default_factory=list)
+
+class CoordinateModel(BaseModel):
+    latitude: float
+    longitude: float
+
+class BatchRequestModel(BaseModel):
+    coordinates: list[CoordinateModel] = Field(min_length=1, max_length=1000)
+
+class BatchErrorModel(BaseModel):
+    status_code: int
+    detail: str
+
+class BatchItemModel(BaseModel):
+    weather: WeatherModel | None = None
+    error: BatchErrorModel | None = None
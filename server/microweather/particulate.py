@@ -0,0 +1,106 @@
+import asyncio
+from datetime import datetime
+from app.microweather.database import Database
+
+# is_valid_reading 과 같은 조건의 MongoDB 필터
+VALID_READING_FILTER: dict = {"$or": [{"pm10Value": {"$ne": None}}, {"pm25Value": {"$ne": None}}]}
+
+
+def is_valid_reading(particulate_matter: dict) -> bool:
+    """
+    PM10, PM2.5 중 하나라도 측정값이 있는 데이터인지 확인하는 함수
+    :param particulate_matter: dict
+    :return: bool
+    """
+    return (particulate_matter.get("pm10Value") is not None) or (particulate_matter.get("pm25Value") is not None)
+
+
+class ParticulateMatterView:
+    def __init__(self) -> None:
+        """
+        측정소별 최신 측정 데이터와 최신 유효(PM10 또는 PM2.5 값 존재) 측정 데이터를 보관하는 메모리 뷰
+        pm_data 컬렉션을 tm 기준으로 폴링해 갱신
+        """
+        self.latest: dict[str, dict] = {}
+        self.latest_valid: dict[str, dict] = {}
+        self.latest_tm: datetime | None = None
+        self.is_loaded: bool = False
+
+    def update(self, particulate_matter: dict) -> None:
+        """
+        측정 데이터 한 건을 뷰에 반영하는 메소드 (기존보다 최신 tm 인 경우만 교체)
+        :param particulate_matter: dict
+        """
+        station_name: str = particulate_matter["station_name"]
+        tm: datetime = particulate_matter["tm"]
+
+        current: dict | None = self.latest.get(station_name)
+        if current is None or current["tm"] <= tm:
+            self.latest[station_name] = particulate_matter
+        if is_valid_reading(particulate_matter):
+            current_valid: dict | None = self.latest_valid.get(station_name)
+            if current_valid is None or current_valid["tm"] <= tm:
+                self.latest_valid[station_name] = particulate_matter
+        if self.latest_tm is None or tm > self.latest_tm:
+            self.latest_tm = tm
+
+    async def load(self, database: Database) -> None:
+        """
+        측정소별 최신 데이터와 최신 유효 데이터를 집계 쿼리로 불러오는 메소드
+        :param database: Database
+        """
+        latest_pipeline: list[dict] = [
+            {"$sort": {"station_name": 1, "tm": -1}},
+            {"$group": {"_id": "$station_name", "document": {"$first": "$$ROOT"}}},
+        ]
+        latest, latest_valid = await asyncio.gather(
+            database.pm_data.aggregate(latest_pipeline, allowDiskUse=True).to_list(length=None),
+            database.pm_data.aggregate([{"$match": VALID_READING_FILTER}] + latest_pipeline, allowDiskUse=True).to_list(length=None),
+        )
+
+        self.latest = {}
+        self.latest_valid = {}
+        self.latest_tm = None
+        for item in latest + latest_valid:
+            self.update(item["document"])
+        self.is_loaded = True
+
+    async def poll(self, database: Database) -> int:
+        """
+        마지막으로 반영한 tm 이후에 저장된 측정 데이터만 조회해 반영하는 메소드
+        :param database: Database
+        :return: int 반영한 데이터 수
+        """
+        query: dict = {"tm": {"$gte": self.latest_tm}} if self.latest_tm is not None else {}
+        documents: list[dict] = await database.pm_data.find(query, sort=[("tm", 1)]).to_list(length=None)
+        for document in documents:
+            self.update(document)
+        return len(documents)
+
+    async def watch(self, database: Database, interval: float) -> None:
+        """
+        interval 초마다 새 측정 데이터를 반영하는 백그라운드 작업
+        :param database: Database
+        :param interval: float
+        """
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.poll(database)
+            except Exception:
+                # 조회 실패 시 기존 뷰를 유지하고 다음 주기에 다시 시도
+                continue
+
+    def get(self, station_names: list[str]) -> dict | None:
+        """
+        후보 측정소 중 가장 최신 유효 데이터를 반환하는 메소드
+        유효 데이터가 없으면 가장 최신 데이터, 그것도 없으면 None
+        :param station_names: list[str]
+        :return: dict | None
+        """
+        candidates: list[dict] = [self.latest_valid[name] for name in station_names if name in self.latest_valid]
+        if not candidates:
+            candidates = [self.latest[name] for name in station_names if name in self.latest]
+        if not candidates:
+            return None
+        return max(candidates, key=lambda particulate_matter: particulate_matter["tm"])
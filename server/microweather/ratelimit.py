@@ -0,0 +1,197 @@
+import time
+import socket
+import logging
+import ipaddress
+from collections import OrderedDict
+from app.microweather.metrics import RATE_LIMITED, get_route_path
+
+logger: logging.Logger = logging.getLogger("microweather.ratelimit")
+
+
+class _Bucket:
+    __slots__ = ("tokens", "updated_at", "blocked_until")
+
+    def __init__(self, tokens: float, updated_at: float) -> None:
+        self.tokens: float = tokens
+        self.updated_at: float = updated_at
+        self.blocked_until: float = 0.0
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        rate: float = 5.0,
+        burst: int = 5,
+        block_seconds: float = 1800.0,
+        max_clients: int = 1_000_000,
+        idle_seconds: float = 3600.0,
+    ) -> None:
+        """
+        IP 별 토큰 버킷 요청 제한 (IP 당 상태 크기 고정, 요청당 O(1))
+        버킷이 비면 block_seconds 동안 차단하며, 오래 요청이 없는 IP 와 max_clients 초과분은 LRU 순서로 제거
+        기본값은 old_server/serverUtil.py 의 checkTempBlock 과 같은 기준 (1초에 5회, 30분 차단)
+        :param rate: float 초당 보충 토큰 수
+        :param burst: int 버킷 크기 (연속 허용 요청 수)
+        :param block_seconds: float 차단 시간(초)
+        :param max_clients: int 최대 추적 IP 수
+        :param idle_seconds: float 마지막 요청 이후 상태를 보관하는 시간(초), 차단 중인 IP 는 차단이 끝날 때까지 보관
+        """
+        self.rate: float = rate
+        self.burst: int = burst
+        self.block_seconds: float = block_seconds
+        self.max_clients: int = max_clients
+        self.idle_seconds: float = idle_seconds
+        self.evictions: int = 0
+        self._buckets: OrderedDict[str, _Bucket] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def check(self, client: str, now: float | None = None) -> float:
+        """
+        요청 한 건을 반영하고 허용 여부를 반환하는 메소드
+        :param client: str 클라이언트 IP
+        :param now: float time.monotonic() 기준 시각
+        :return: float 허용이면 0, 차단이면 남은 차단 시간(초)
+        """
+        now = now if now is not None else time.monotonic()
+        bucket: _Bucket | None = self._buckets.get(client)
+        if bucket is None:
+            bucket = _Bucket(tokens=float(self.burst), updated_at=now)
+            self._buckets[client] = bucket
+            self._evict(now)
+        else:
+            self._buckets.move_to_end(client)
+
+        if bucket.blocked_until > now:
+            return bucket.blocked_until - now
+
+        bucket.tokens = min(float(self.burst), bucket.tokens + (now - bucket.updated_at) * self.rate)
+        bucket.updated_at = now
+        if bucket.tokens < 1.0:
+            bucket.blocked_until = now + self.block_seconds
+            bucket.tokens = float(self.burst)
+            logger.warning("Blocked client %s for %.0f seconds", client, self.block_seconds)
+            return self.block_seconds
+
+        bucket.tokens -= 1.0
+        return 0.0
+
+    def _evict(self, now: float) -> None:
+        """
+        가장 오래 요청이 없는 IP 부터 유휴 시간이 지났거나 최대 추적 수를 넘는 상태를 제거하는 메소드 (분할 상환 O(1))
+        :param now: float
+        """
+        while self._buckets:
+            client, bucket = next(iter(self._buckets.items()))
+            expired: bool = now - bucket.updated_at > self.idle_seconds and bucket.blocked_until <= now
+            if not expired and len(self._buckets) <= self.max_clients:
+                break
+            del self._buckets[client]
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        """
+        추적 중인 IP 수와 제거 수 반환 메소드
+        :return: dict
+        """
+        return {"clients": len(self._buckets), "max_clients": self.max_clients, "evictions": self.evictions}
+
+
+class Blacklist:
+    def __init__(self, entries: list[str] | None = None) -> None:
+        """
+        IP 주소와 CIDR 대역으로 구성된 차단 목록 (접두사 길이별 네트워크 주소 집합, 조회는 등록된 접두사 길이 수만큼의 집합 조회)
+        :param entries: list[str] "203.0.113.7", "198.51.100.0/24", "2001:db8::/32" 형식
+        """
+        self._networks: dict[tuple[int, int], set[int]] = {}
+        for entry in entries or []:
+            self.add(entry)
+
+    def __len__(self) -> int:
+        return sum(len(networks) for networks in self._networks.values())
+
+    @classmethod
+    def load(cls, path: str) -> "Blacklist":
+        """
+        한 줄에 하나씩 IP 또는 CIDR 을 적은 파일에서 차단 목록을 읽는 메소드 (빈 줄과 # 주석 무시, 파일이 없으면 빈 목록)
+        old_server/blacklist.txt 형식과 호환
+        :param path: str
+        :return: Blacklist
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                entries: list[str] = [line.split("#", 1)[0].strip() for line in file]
+        except FileNotFoundError:
+            return cls()
+        return cls([entry for entry in entries if entry])
+
+    def add(self, entry: str) -> None:
+        """
+        IP 또는 CIDR 대역 추가 메소드
+        :param entry: str
+        """
+        network: ipaddress.IPv4Network | ipaddress.IPv6Network = ipaddress.ip_network(entry, strict=False)
+        self._networks.setdefault((network.version, network.prefixlen), set()).add(int(network.network_address))
+
+    def __contains__(self, client: str) -> bool:
+        for version, family, bits in ((4, socket.AF_INET, 32), (6, socket.AF_INET6, 128)):
+            try:
+                value: int = int.from_bytes(socket.inet_pton(family, client), "big")
+                break
+            except OSError:
+                continue
+        else:
+            return False
+
+        for (network_version, prefixlen), networks in self._networks.items():
+            if network_version == version and (value >> (bits - prefixlen) << (bits - prefixlen)) in networks:
+                return True
+        return False
+
+
+class RateLimitMiddleware:
+    def __init__(self, app, limiter: RateLimiter, blacklist: Blacklist, excluded_paths: tuple[str, ...] = ()) -> None:
+        """
+        차단 목록에 있는 IP 는 403, 요청 제한을 넘은 IP 는 차단 시간 동안 429 로 응답하는 ASGI 미들웨어
+        클라이언트 IP 는 ASGI scope 의 client 를 사용 (프록시 뒤에서는 uvicorn --proxy-headers 로 설정)
+        :param app: ASGI 앱
+        :param limiter: RateLimiter
+        :param blacklist: Blacklist
+        :param excluded_paths: 제한하지 않을 경로 (헬스 체크, 지표 수집 등, root_path 제외, get_route_path 참고)
+        """
+        self.app = app
+        self.limiter: RateLimiter = limiter
+        self.blacklist: Blacklist = blacklist
+        self.excluded_paths: tuple[str, ...] = excluded_paths
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or scope.get("client") is None or get_route_path(scope) in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        client: str = scope["client"][0]
+        if client in self.blacklist:
+            RATE_LIMITED.labels(reason="banned").inc()
+            await self._reject(send, 403, b"403 Forbidden", [])
+            return
+
+        retry_after: float = self.limiter.check(client)
+        if retry_after > 0:
+            RATE_LIMITED.labels(reason="blocked").inc()
+            await self._reject(send, 429, b"429 Too Many Requests", [(b"retry-after", str(int(retry_after) + 1).encode())])
+            return
+
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    async def _reject(send, status_code: int, body: bytes, headers: list[tuple[bytes, bytes]]) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [
+                (b"content-type", b"text/plain; charset=utf-8"),
+                (b"content-length", str(len(body)).encode()),
+            ] + headers,
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,34 @@
+from datetime import datetime, timedelta
+
+# 기상청 API 제공 시각 (매시 base_time 기준, 해당 분 이후 조회 가능)
+NOWCAST_RELEASE_MINUTE: int = 30
+FORECAST_RELEASE_MINUTE: int = 45
+# 에어코리아 실시간 측정 정보 갱신 시각 (매시 정각 자료가 약 15분 이후 제공)
+PM_RELEASE_MINUTE: int = 15
+
+
+def latest_base_time(now: datetime, release_minute: int) -> datetime:
+    """
+    현재 시각 기준 조회 가능한 가장 최근 발표 시각(base_date + base_time)을 반환하는 함수
+    old_server/apps/getDateTime.py 의 getDate/getTime 로직과 동일 (자정 이전 날짜 처리 포함)
+    :param now: datetime
+    :param release_minute: int (초단기실황 30, 초단기예보 45)
+    :return: datetime
+    """
+    base_time: datetime = now.replace(minute=0, second=0, microsecond=0)
+    if now.minute < release_minute:
+        base_time -= timedelta(hours=1)
+    return base_time
+
+
+def next_release_time(now: datetime, release_minute: int) -> datetime:
+    """
+    현재 시각 이후 다음 발표 데이터가 조회 가능해지는 시각을 반환하는 함수
+    :param now: datetime
+    :param release_minute: int
+    :return: datetime
+    """
+    release_time: datetime = now.replace(minute=release_minute, second=0, microsecond=0)
+    if release_time <= now:
+        release_time += timedelta(hours=1)
+    return release_time
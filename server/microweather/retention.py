@@ -0,0 +1,140 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from app.microweather.database import Database
+from app.microweather.ingestion import NOWCAST_CATEGORIES
+from app.microweather.particulate import VALID_READING_FILTER
+
+logger: logging.Logger = logging.getLogger("microweather.retention")
+
+PM_FIELDS: tuple[str, ...] = ("pm10Value", "pm10Grade1h", "pm25Value", "pm25Grade1h")
+
+# 컬렉션 -> 격자/측정소 식별 필드 (요청 경로가 최신 tm 을 읽는 단위)
+SERIES_KEYS: dict[str, tuple[str, ...]] = {
+    "nowcast": ("nx", "ny"),
+    "forecast": ("nx", "ny"),
+    "pm_data": ("station_name",),
+}
+
+# 보관 기간이 지나도 남길 문서 조건, 미세먼지는 최신 데이터와 별도로 최신 유효 데이터도 요청 경로에서 사용
+PROTECTED_FILTERS: dict[str, tuple[dict, ...]] = {
+    "pm_data": ({}, VALID_READING_FILTER),
+}
+
+# 시간별 요약 대상 컬렉션 -> (키 필드, 값 필드), 초단기예보는 다음 발표에 대체되므로 요약하지 않음
+ROLLUP_FIELDS: dict[str, tuple[tuple[str, ...], tuple[str, ...]]] = {
+    "nowcast": (SERIES_KEYS["nowcast"], NOWCAST_CATEGORIES),
+    "pm_data": (SERIES_KEYS["pm_data"], PM_FIELDS),
+}
+
+
+def to_hourly_document(tm: datetime, documents: list[dict], keys: tuple[str, ...], values: tuple[str, ...]) -> dict:
+    """
+    같은 tm 의 격자/측정소별 문서를 필드별 배열 하나로 묶은 시간별 요약 문서로 변환하는 함수
+    격자·측정소마다 문서 하나(필드 이름 반복, _id, 인덱스 항목)를 두는 대신 시간마다 문서 하나만 보관
+    :param tm: datetime
+    :param documents: list[dict]
+    :param keys: tuple[str, ...] 격자/측정소 식별 필드
+    :param values: tuple[str, ...] 보관할 값 필드
+    :return: dict {tm, count, <field>: [...]}
+    """
+    documents = sorted(documents, key=lambda document: tuple(document[key] for key in keys))
+    hourly: dict = {"tm": tm, "count": len(documents)}
+    for field in keys + values:
+        hourly[field] = [document.get(field) for document in documents]
+    return hourly
+
+
+class RetentionPolicy:
+    def __init__(self, windows: dict[str, timedelta], rollup: bool = True) -> None:
+        """
+        시계열 컬렉션(nowcast, forecast, pm_data)에서 보관 기간이 지난 데이터를 정리하는 클래스
+        요청 경로는 격자/측정소별 최신 tm 만 읽으므로, 오래된 데이터는 지우고 필요하면 <컬렉션>_hourly 에 시간별 요약으로 남김
+        TTL 인덱스는 요약 전에 삭제되고 tm(KST, naive)을 UTC 로 해석하므로 주기 실행 방식 사용
+        :param windows: dict[str, timedelta] 컬렉션 이름 -> 보관 기간
+        :param rollup: bool 삭제 전에 ROLLUP_FIELDS 대상 컬렉션을 시간별 요약으로 저장할지 여부
+        """
+        self.windows: dict[str, timedelta] = windows
+        self.rollup: bool = rollup
+
+    async def prune(self, database: Database, now: datetime | None = None) -> list[dict]:
+        """
+        모든 대상 컬렉션 정리 메소드
+        :param database: Database
+        :param now: datetime
+        :return: list[dict] 컬렉션별 처리 결과
+        """
+        now = now or datetime.now()
+        return [
+            await self._prune_collection(database, name, now - window)
+            for name, window in self.windows.items()
+        ]
+
+    async def _prune_collection(self, database: Database, name: str, cutoff: datetime) -> dict:
+        """
+        컬렉션 하나에서 cutoff 이전 tm 을 시간 단위로 요약·삭제하는 메소드
+        수집이 멈춘 격자/측정소도 응답할 데이터가 남도록 격자/측정소별 최신 문서(_protected_ids)는 보관 기간이 지나도 삭제하지 않음
+        요약 저장 후 삭제하므로 중간에 실패해도 다음 실행에서 같은 tm 을 다시 처리 (요약은 tm 기준 덮어쓰기)
+        :param database: Database
+        :param name: str
+        :param cutoff: datetime
+        :return: dict
+        """
+        collection = database.database[name]
+        protected: list = await self._protected_ids(collection, name, cutoff)
+        expired: dict = {"_id": {"$nin": protected}}
+        hours: list[datetime] = sorted(await collection.distinct("tm", {"tm": {"$lt": cutoff}} | expired))
+        rolled_up: int = 0
+        deleted: int = 0
+        for tm in hours:
+            if self.rollup and name in ROLLUP_FIELDS:
+                keys, values = ROLLUP_FIELDS[name]
+                documents: list[dict] = await collection.find(
+                    {"tm": tm}, projection={"_id": 0, **{field: 1 for field in keys + values}}
+                ).to_list(length=None)
+                await database.database[f"{name}_hourly"].replace_one(
+                    {"tm": tm}, to_hourly_document(tm, documents, keys, values), upsert=True
+                )
+                rolled_up += 1
+            deleted += (await collection.delete_many({"tm": tm} | expired)).deleted_count
+        return {
+            "collection": name, "cutoff": cutoff, "hours": len(hours), "rolled_up": rolled_up, "deleted": deleted, "protected": len(protected),
+        }
+
+    @staticmethod
+    async def _protected_ids(collection, name: str, cutoff: datetime) -> list:
+        """
+        격자/측정소별 최신 문서 중 cutoff 이전인(삭제 대상이 될) 문서의 _id 를 조회하는 메소드
+        {키, tm} 인덱스 순서로 정렬해 키마다 첫 문서만 가져옴 (SERIES_KEYS 에 없는 컬렉션은 가장 최신 문서 하나)
+        :param collection: AsyncIOMotorCollection
+        :param name: str
+        :param cutoff: datetime
+        :return: list[ObjectId]
+        """
+        keys: tuple[str, ...] = SERIES_KEYS.get(name, ())
+        protected: set = set()
+        for condition in PROTECTED_FILTERS.get(name, ({},)):
+            pipeline: list[dict] = [
+                {"$sort": {**{key: 1 for key in keys}, "tm": -1}},
+                {"$group": {"_id": {key: f"${key}" for key in keys} or None, "document_id": {"$first": "$_id"}, "tm": {"$first": "$tm"}}},
+            ]
+            if condition:
+                pipeline.insert(0, {"$match": condition})
+            async for latest in collection.aggregate(pipeline):
+                if latest["tm"] < cutoff:
+                    protected.add(latest["document_id"])
+        return list(protected)
+
+    async def watch(self, database: Database, interval: float) -> None:
+        """
+        interval 초마다 정리를 실행하는 백그라운드 작업 (수집 프로세스에서 실행)
+        :param database: Database
+        :param interval: float
+        """
+        while True:
+            try:
+                for result in await self.prune(database):
+                    logger.info(result)
+            except Exception as e:
+                logger.error(f"보관 기간 정리 실패 : {e}")
+            await asyncio.sleep(interval)
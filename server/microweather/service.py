@@ -1,68 +1,391 @@
-import ephem
 import asyncio
+import hashlib
+from typing import Any, Awaitable, Hashable
 from fastapi import HTTPException
-from pyproj import Proj, Transformer
 from datetime import datetime, timedelta
+from app.microweather import grid, sun
+from app.microweather.metrics import timed
+from app.microweather.encoding import ResponseEncoder
+from app.microweather.fallback import UpstreamFallback
+from app.microweather.ingestion import UpstreamError
+from app.microweather.release import NOWCAST_RELEASE_MINUTE, FORECAST_RELEASE_MINUTE, PM_RELEASE_MINUTE, latest_base_time, next_release_time
+from app.microweather.cache import CellCache
+from app.microweather.gridfile import GridFile
+from app.microweather.singleflight import SingleFlight
+from app.microweather.deadline import StageDeadlines
+from app.microweather.address import AddressIndex
+from app.microweather.station import StationIndex
+from app.microweather.particulate import ParticulateMatterView, VALID_READING_FILTER
 from app.microweather.database import Database
 from app.microweather.models import WeatherModel, NowcastModel, ForecastModel, ParticulateMatterModel
 
+# 최신 발표분이 아직 수집되지 않은 데이터로 응답할 때의 Cache-Control max-age (CellCache retry_seconds 와 동일)
+STALE_MAX_AGE_SECONDS: int = 60
+
 
 class WeatherService:
-    def __init__(self, latitude: float, longitude: float) -> None:
+    def __init__(
+        self,
+        database: Database,
+        latitude: float,
+        longitude: float,
+        nowcast_cache: CellCache | None = None,
+        forecast_cache: CellCache | None = None,
+        grid_coord: dict | None = None,
+        address_index: AddressIndex | None = None,
+        station_index: StationIndex | None = None,
+        particulate_matter_view: ParticulateMatterView | None = None,
+        response_encoder: ResponseEncoder | None = None,
+        upstream_fallback: UpstreamFallback | None = None,
+        nowcast_flight: SingleFlight | None = None,
+        forecast_flight: SingleFlight | None = None,
+        particulate_matter_flight: SingleFlight | None = None,
+        stage_deadlines: StageDeadlines | None = None,
+        use_snapshot: bool = False,
+        grid_file: GridFile | None = None,
+    ) -> None:
         """
         클래스 초기화 메소드
+        :param database: 애플리케이션 수명 동안 공유하는 Database (커넥션 풀)
         :param latitude: 위도
         :param longitude: 경도
+        :param nowcast_cache: 초단기실황 격자 캐시 (None 이면 캐시 미사용)
+        :param forecast_cache: 초단기예보 격자 캐시 (None 이면 캐시 미사용)
+        :param grid_coord: 이미 변환된 격자 좌표 (배치 조회 시 일괄 변환 결과 전달)
+        :param address_index: 읍면동 공간 인덱스 (None 이거나 로드 전이면 MongoDB 조회)
+        :param station_index: 미세먼지 측정소 인덱스 (None 이거나 로드 전이면 MongoDB 조회)
+        :param particulate_matter_view: 측정소별 최신 미세먼지 뷰 (None 이거나 로드 전이면 MongoDB 조회)
+        :param response_encoder: 직렬화·압축된 응답 조각 캐시 (get_encoded_weather 사용 시 필요)
+        :param upstream_fallback: MongoDB 에 격자 데이터가 없을 때 기상청 API 직접 조회 (None 이면 404)
+        :param nowcast_flight: 같은 격자의 초단기실황 동시 조회 합치기 (None 이면 요청마다 조회)
+        :param forecast_flight: 같은 격자의 초단기예보 동시 조회 합치기 (None 이면 요청마다 조회)
+        :param particulate_matter_flight: 같은 측정소 목록의 미세먼지 동시 조회 합치기 (None 이면 요청마다 조회)
+        :param stage_deadlines: 단계별 제한 시간과 격자별 마지막 정상 값 (None 이면 모든 단계를 끝까지 기다림)
+        :param use_snapshot: 격자 캐시에 없는 격자는 snapshot 문서 한 번 조회로 주소 외 구성 요소를 읽을지 여부
+        :param grid_file: 워커 간 공유하는 메모리 매핑 격자 파일 (None 이거나 최신 발표분이 아니면 격자 캐시·MongoDB 조회)
         """
+        self.database: Database = database
+        self.nowcast_cache: CellCache | None = nowcast_cache
+        self.forecast_cache: CellCache | None = forecast_cache
+        self.address_index: AddressIndex | None = address_index
+        self.station_index: StationIndex | None = station_index
+        self.particulate_matter_view: ParticulateMatterView | None = particulate_matter_view
+        self.response_encoder: ResponseEncoder | None = response_encoder
+        self.upstream_fallback: UpstreamFallback | None = upstream_fallback
+        self.nowcast_flight: SingleFlight | None = nowcast_flight
+        self.forecast_flight: SingleFlight | None = forecast_flight
+        self.particulate_matter_flight: SingleFlight | None = particulate_matter_flight
+        self.stage_deadlines: StageDeadlines | None = stage_deadlines
+        self.use_snapshot: bool = use_snapshot
+        self.grid_file: GridFile | None = grid_file
+        self.stale: list[str] = []  # 제한 시간 초과·실패로 마지막 정상 값을 사용한 단계
+        self.versions: dict = {}  # 응답 구성 요소별 버전 (주소, 일출 여부, 데이터 발표/측정 시각), ETag 와 max-age 계산용
         self.longitude: float = longitude
         self.latitude: float = latitude
-        self._is_valid_coordinates(latitude=self.latitude, longitude=self.longitude)
-        self.grid_coord: dict = self._get_grid_coordinates(latitude=self.latitude, longitude=self.longitude)
+        self.is_valid_coordinates(latitude=self.latitude, longitude=self.longitude)
+        self.grid_coord: dict = grid_coord if grid_coord is not None else self.get_grid_coordinates(latitude=self.latitude, longitude=self.longitude)
 
     async def get_weather(self) -> WeatherModel:
         """
         클래스 외부 실행용 최종 데이터 반환 메소드
         :return: WeatherModel
         """
-        address, is_sunrise, nowcast_model, forecast_model, particulate_matter = await asyncio.gather(
-            self._get_address(latitude=self.latitude, longitude=self.longitude),
-            self._is_sunrise(latitude=self.latitude, longitude=self.longitude),
-            self._get_nowcast(grid_x=self.grid_coord["grid_x"], grid_y=self.grid_coord["grid_y"]),
-            self._get_forecast(grid_x=self.grid_coord["grid_x"], grid_y=self.grid_coord["grid_y"]),
-            self._get_particulate_matter(latitude=self.latitude, longitude=self.longitude)
-        )
+        address, is_sunrise, nowcast_model, forecast_model, particulate_matter = await self._gather()
         return WeatherModel(
             address=address,
             is_sunrise=is_sunrise,
             nowcast=nowcast_model,
             forecast=forecast_model,
-            particulate_matter=particulate_matter
+            particulate_matter=particulate_matter,
+            stale=self.stale,
+        )
+
+    async def get_encoded_weather(self, encoding: str) -> bytes:
+        """
+        WeatherModel 과 같은 JSON 을 encoding 으로 압축한 응답 본문 반환 메소드
+        모델 검증·직렬화·압축 없이 격자/측정소 단위로 미리 인코딩한 조각을 이어 붙여 생성
+        :param encoding: str (br, gzip, identity)
+        :return: bytes
+        """
+        address, is_sunrise, nowcast_model, forecast_model, particulate_matter = await self._gather()
+        return self.response_encoder.encode_weather(
+            address=address,
+            is_sunrise=is_sunrise,
+            grid_coord=self.grid_coord,
+            nowcast=nowcast_model,
+            forecast=forecast_model,
+            particulate_matter=particulate_matter,
+            encoding=encoding,
+            stale=self.stale,
+            versions=self.versions,
         )
 
+    async def _gather(self) -> tuple[str, bool, NowcastModel, list[ForecastModel], ParticulateMatterModel]:
+        """
+        응답 구성 요소를 동시에 조회하는 메소드 (단계별 처리 시간은 /metrics 로 노출)
+        stage_deadlines 가 있으면 제한 시간을 넘긴 단계는 격자의 마지막 정상 값으로 대체하고 self.stale 에 기록
+        use_snapshot 이면 격자 캐시에 없는 격자는 주소와 snapshot 문서만 조회하고, snapshot 이 없을 때만 나머지 단계 실행
+        :return: tuple
+        """
+        address: Awaitable = self.run_stage("address")
+        if self.use_snapshot and not self._is_cell_cached():
+            address_result, snapshot = await asyncio.gather(
+                address, timed("snapshot", self._get_snapshot(grid_x=self.grid_coord["grid_x"], grid_y=self.grid_coord["grid_y"]))
+            )
+            if snapshot is not None:
+                return (address_result,) + snapshot
+            address = asyncio.sleep(0, result=address_result)
+
+        result: tuple = await asyncio.gather(
+            address, *(self.run_stage(stage) for stage in ("sunrise", "nowcast", "forecast", "particulate_matter"))
+        )
+        if self.stale:
+            self.stale.sort()
+            self.versions["stale"] = tuple(self.stale)
+        return result
+
+    async def run_stage(self, stage: str) -> Any:
+        """
+        응답 구성 단계 하나를 단건 조회 경로(격자 파일·캐시, 동시 조회 합치기, 기상청 API 직접 조회, 단계별 제한 시간)로 실행하는 메소드
+        배치 조회(batch.py)에서 미리 조회하지 못한 단계도 같은 경로로 처리하도록 공개
+        :param stage: str ("address", "sunrise", "nowcast", "forecast", "particulate_matter")
+        :return: 단계 결과 (버전은 self.versions, 마지막 정상 값 사용 여부는 self.stale 에 기록)
+        """
+        cell: tuple[int, int] = (self.grid_coord["grid_x"], self.grid_coord["grid_y"])
+        if stage == "address":
+            return await self._stage(
+                "address", self._get_address_key(), self._with_version(self._get_address(latitude=self.latitude, longitude=self.longitude))
+            )
+        if stage == "sunrise":
+            return await timed("sunrise", self._is_sunrise(latitude=self.latitude, longitude=self.longitude))
+        if stage == "nowcast":
+            return await self._stage("nowcast", cell, self._get_nowcast(grid_x=cell[0], grid_y=cell[1]))
+        if stage == "forecast":
+            return await self._stage("forecast", cell, self._get_forecast(grid_x=cell[0], grid_y=cell[1]))
+        if stage == "particulate_matter":
+            return await self._stage(
+                "particulate_matter", cell, self._get_particulate_matter(latitude=self.latitude, longitude=self.longitude)
+            )
+        raise ValueError(f"Unknown stage: {stage}")
+
+    def _is_cell_cached(self) -> bool:
+        """
+        격자의 초단기실황·예보가 모두 격자 파일 또는 격자 캐시에 있는지 확인하는 메소드 (통계와 LRU 순서에 영향 없음)
+        :return: bool
+        """
+        now: datetime = datetime.now()
+        return self._peek_tm("nowcast", now) is not None and self._peek_tm("forecast", now) is not None
+
+    def _peek_tm(self, kind: str, now: datetime) -> datetime | None:
+        """
+        격자 파일(최신 발표분일 때) 또는 격자 캐시에 있는 격자 데이터의 발표 시각을 확인하는 메소드 (통계와 LRU 순서에 영향 없음)
+        :param kind: str ("nowcast", "forecast")
+        :param now: datetime
+        :return: datetime | None
+        """
+        cell: tuple[int, int] = (self.grid_coord["grid_x"], self.grid_coord["grid_y"])
+        if self.grid_file is not None:
+            tm: datetime | None = self.grid_file.get_tm(kind, grid_x=cell[0], grid_y=cell[1])
+            if tm is not None and self.is_latest(kind, tm, now):
+                return tm
+        cache: CellCache | None = self.nowcast_cache if kind == "nowcast" else self.forecast_cache
+        return cache.get_tm(cell, now=now) if cache is not None else None
+
     @staticmethod
-    async def _get_address(latitude: float, longitude: float) -> str:
+    def is_latest(kind: str, tm: datetime, now: datetime) -> bool:
+        """
+        발표 시각이 now 기준 최신 발표분인지 확인하는 메소드
+        :param kind: str ("nowcast", "forecast")
+        :param tm: datetime
+        :param now: datetime
+        :return: bool
+        """
+        release_minute: int = NOWCAST_RELEASE_MINUTE if kind == "nowcast" else FORECAST_RELEASE_MINUTE
+        return tm >= latest_base_time(now, release_minute)
+
+    async def _get_snapshot(self, grid_x: int, grid_y: int) -> tuple[bool, NowcastModel, list[ForecastModel], ParticulateMatterModel] | None:
+        """
+        snapshot 문서 한 번 조회로 일출 여부, 초단기실황, 초단기예보, 미세먼지를 읽는 메소드 (snapshot.py 참고)
+        읽은 초단기실황·예보는 격자 캐시에 저장해 이후 요청은 메모리에서 처리
+        조회가 snapshot 단계 제한 시간을 넘기거나 실패하면 None 을 반환해 단계별 조회(각 단계의 제한 시간과 마지막 정상 값)로 처리
+        :param grid_x: int
+        :param grid_y: int
+        :return: tuple | None snapshot 이 없거나, 미세먼지가 비어 있거나, 초단기실황·예보가 최신 발표분이 아니면 None
+        """
+        timeout: float | None = self.stage_deadlines.deadlines.get("snapshot") if self.stage_deadlines is not None else None
+        try:
+            document: dict | None = await asyncio.wait_for(
+                self.database.snapshot.find_one({"nx": grid_x, "ny": grid_y}, projection={"_id": 0}), timeout=timeout
+            )
+        except Exception:
+            return None
+        if document is None or document["particulate_matter"] is None:
+            return None
+
+        now: datetime = datetime.now()
+        # snapshot 갱신이 실패했거나 수집보다 늦으면 MongoDB 의 최신 발표분을 읽도록 단계별 조회로 처리 (격자 캐시에도 넣지 않음)
+        if not (self.is_latest("nowcast", document["nowcast_tm"], now) and self.is_latest("forecast", document["forecast_tm"], now)):
+            return None
+        if document["sunrise"].date() == now.date():
+            is_sunrise: bool = document["sunrise"] < now < document["sunset"]
+        else:
+            is_sunrise = sun.is_sunrise(latitude=self.latitude, longitude=self.longitude, grid_x=grid_x, grid_y=grid_y, now=now)
+        nowcast_model: NowcastModel = NowcastModel(**document["nowcast"])
+        forecast_model_list: list[ForecastModel] = [ForecastModel(**item) for item in document["forecast"]]
+        particulate_matter: ParticulateMatterModel = ParticulateMatterModel(**document["particulate_matter"])
+
+        if self.nowcast_cache is not None:
+            self.nowcast_cache.put((grid_x, grid_y), nowcast_model, tm=document["nowcast_tm"])
+        if self.forecast_cache is not None:
+            self.forecast_cache.put((grid_x, grid_y), forecast_model_list, tm=document["forecast_tm"])
+        self.versions.update({
+            "is_sunrise": is_sunrise,
+            "nowcast": document["nowcast_tm"],
+            "forecast": document["forecast_tm"],
+            "particulate_matter": tuple(document["particulate_matter_version"]),
+        })
+        return is_sunrise, nowcast_model, forecast_model_list, particulate_matter
+
+    async def _stage(self, stage: str, key: Hashable, awaitable: Awaitable[tuple[Any, Any]]) -> Any:
+        """
+        단계 하나를 실행하고 결과의 버전을 self.versions 에 기록하는 메소드 (stage 이름은 self.versions 키와 같음)
+        버전은 조회 결과와 함께 반환받은 값만 사용하므로, 제한 시간을 넘겨 백그라운드에서 끝난 조회가 응답 버전을 바꾸지 않음
+        :param stage: str
+        :param key: Hashable 마지막 정상 값 키 (값이 같아야 하는 범위, 주소는 양자화 좌표, 나머지는 격자)
+        :param awaitable: Awaitable 결과로 (값, 버전) 을 반환
+        :return: 단계 결과 또는 마지막 정상 값
+        """
+        if self.stage_deadlines is None:
+            value, version = await timed(stage, awaitable)
+        else:
+            value, version, is_stale = await self.stage_deadlines.run(stage, key, timed(stage, awaitable))
+            if is_stale:
+                self.stale.append(stage)
+        self.versions[stage] = version
+        return value
+
+    def _get_address_key(self) -> tuple[float, float]:
+        """
+        주소 단계의 마지막 정상 값 키 (격자 하나에 읍면동이 여러 개 있으므로 AddressIndex 캐시와 같은 양자화 좌표 사용)
+        :return: tuple[float, float]
+        """
+        precision: int = self.address_index.precision if self.address_index is not None else 4
+        return round(self.latitude, precision), round(self.longitude, precision)
+
+    @staticmethod
+    async def _with_version(awaitable: Awaitable) -> tuple[Any, Any]:
+        """
+        값 자체가 버전인 단계(주소)의 결과를 (값, 버전) 으로 반환하는 메소드
+        """
+        value: Any = await awaitable
+        return value, value
+
+    def check_cached_versions(self, now: datetime) -> bool:
+        """
+        MongoDB 조회 없이 메모리 자원(인덱스, 최신 미세먼지 뷰, 격자 파일·캐시)만으로 응답 구성 요소의 버전을 확인하는 메소드
+        하나라도 메모리에서 확인할 수 없으면 False (조건부 요청을 단계 실행 전에 처리할 수 있는지 여부)
+        :param now: datetime
+        :return: bool
+        """
+        if not all(resource is not None and resource.is_loaded for resource in (self.address_index, self.station_index, self.particulate_matter_view)):
+            return False
+        cell: tuple[int, int] = (self.grid_coord["grid_x"], self.grid_coord["grid_y"])
+        nowcast_tm: datetime | None = self._peek_tm("nowcast", now)
+        forecast_tm: datetime | None = self._peek_tm("forecast", now)
+        address: str | None = self.address_index.lookup(latitude=self.latitude, longitude=self.longitude)
+        if nowcast_tm is None or forecast_tm is None or address is None:
+            return False
+
+        near_station_list: list[str] | None = self.station_index.nearest_for_cell(grid_x=cell[0], grid_y=cell[1])
+        if near_station_list is None:
+            near_station_list = self.station_index.nearest(latitude=self.latitude, longitude=self.longitude)
+        particulate_matter: dict | None = self.particulate_matter_view.get(near_station_list)
+        if particulate_matter is None:
+            return False
+
+        self.versions = {
+            "address": address,
+            "is_sunrise": sun.is_sunrise(
+                latitude=self.latitude, longitude=self.longitude, grid_x=cell[0], grid_y=cell[1], now=now
+            ),
+            "nowcast": nowcast_tm,
+            "forecast": forecast_tm,
+            "particulate_matter": (particulate_matter["station_name"], particulate_matter["tm"]),
+        }
+        return True
+
+    def get_etag(self) -> str:
+        """
+        응답 구성 요소 버전으로 만든 약한 ETag 반환 메소드 (get_weather 실행 또는 check_cached_versions 이후 사용)
+        :return: str
+        """
+        digest: str = hashlib.blake2b(repr(sorted(self.versions.items())).encode(), digest_size=12).hexdigest()
+        return f'W/"{digest}"'
+
+    def get_max_age(self, now: datetime) -> int:
+        """
+        응답을 캐시해도 되는 시간(초) 반환 메소드
+        다음 초단기실황/초단기예보/미세먼지 발표 시각과 일출/일몰 시각 중 가장 이른 시각까지이며,
+        최신 발표분이 아직 수집되지 않은 데이터(근접 측정소의 이전 측정값 포함)가 포함되면 STALE_MAX_AGE_SECONDS,
+        마지막 정상 값으로 대체한 단계가 있으면 저하된 응답이 캐시되지 않도록 0
+        :param now: datetime
+        :return: int
+        """
+        releases: dict[str, int] = {
+            "nowcast": NOWCAST_RELEASE_MINUTE,
+            "forecast": FORECAST_RELEASE_MINUTE,
+            "particulate_matter": PM_RELEASE_MINUTE,
+        }
+        expires_at: datetime = min(next_release_time(now, release_minute) for release_minute in releases.values())
+        sunrise, sunset = sun.get_sun_times(
+            latitude=self.latitude, longitude=self.longitude,
+            grid_x=self.grid_coord["grid_x"], grid_y=self.grid_coord["grid_y"], day=now.date()
+        )
+        for sun_event in (sunrise, sunset, datetime(now.year, now.month, now.day) + timedelta(days=1)):
+            if sun_event > now:
+                expires_at = min(expires_at, sun_event)
+                break
+
+        if self.stale:
+            return 0
+        max_age: int = int((expires_at - now).total_seconds())
+        for name, release_minute in releases.items():
+            version = self.versions.get(name)
+            tm: datetime | None = version[1] if isinstance(version, tuple) else version
+            if tm is None or tm < latest_base_time(now, release_minute):
+                max_age = min(max_age, STALE_MAX_AGE_SECONDS)
+        return max(max_age, 0)
+
+    async def _get_address(self, latitude: float, longitude: float) -> str:
         """
         위경도 값으로 위치한 읍면동 위치를 확인하는 메소드
         :param latitude: float
         :param longitude: float
         :return: str
         """
-        async with Database() as db:
-            address: dict = await db.location.find_one({
-                "geometry": {
-                    "$geoIntersects": {
-                        "$geometry": {
-                            "type": "Point",
-                            "coordinates":
-                                [longitude, latitude],
-                        }
+        if self.address_index is not None and self.address_index.is_loaded:
+            location: str | None = self.address_index.lookup(latitude=latitude, longitude=longitude)
+            if location is None:
+                raise HTTPException(status_code=404, detail="Address not found for the coordinates.")
+            return location
+
+        address: dict | None = await self.database.location.find_one({
+            "geometry": {
+                "$geoIntersects": {
+                    "$geometry": {
+                        "type": "Point",
+                        "coordinates":
+                            [longitude, latitude],
                     }
                 }
-            })
+            }
+        })
+        if address is None:
+            raise HTTPException(status_code=404, detail="Address not found for the coordinates.")
         return address["location"]
 
     @staticmethod
-    def _is_valid_coordinates(latitude: float, longitude: float) -> None:
+    def is_valid_coordinates(latitude: float, longitude: float) -> None:
         """
         위경도가 기상청 동네예보 격자영역 내에 위치해있는지 확인하는 메소드
         """
@@ -75,85 +398,170 @@ class WeatherService:
             raise HTTPException(status_code=404, detail="Coordinates are outside the support area.")
 
     @staticmethod
-    def _get_grid_coordinates(latitude: float, longitude: float) -> dict:
+    def get_grid_coordinates(latitude: float, longitude: float) -> dict:
         """
         위경도를 기상청 동네예보에서 사용하는 격자 좌표로 변환하는 메소드
         :return: dict
         """
-        params: dict = {
-            "proj": "lcc",
-            "lat_1": 30.0,
-            "lat_2": 60.0,
-            "lat_0": 38.0,
-            "lon_0": 126.0,
-            "datum": "WGS84",
-            "units": "m"
-        }
-
-        x_meters, y_meters = Transformer.from_proj("EPSG:4326", Proj(params), always_xy=True).transform(longitude, latitude)
-
-        grid_x: int = int((x_meters / 5000) + 43)
-        grid_y: int = int((y_meters / 5000) + 136)
+        grid_x, grid_y = grid.to_grid(latitude=latitude, longitude=longitude)
 
         return {"grid_x": grid_x, "grid_y": grid_y}
 
-    @staticmethod
-    async def _is_sunrise(latitude: float, longitude: float) -> bool:
+    async def _is_sunrise(self, latitude: float, longitude: float) -> bool:
         """
-        위경도 값으로 일출 여부를 확인하는 메소드
+        위경도 값으로 일출 여부를 확인하는 메소드 (하루 한 번 계산한 격자별 일출/일몰 테이블 조회)
         :param latitude: float
         :param longitude: float
         :return: bool
         """
-        current_time: datetime = datetime.now()
-
-        observer: ephem = ephem.Observer()
-        observer.lat = latitude
-        observer.lon = longitude
-        observer.date = current_time
-
-        sun: ephem = ephem.Sun()
-        sunrise: datetime = observer.previous_rising(sun).datetime() + timedelta(hours=9)
-        sunset: datetime = observer.previous_setting(sun).datetime() + timedelta(hours=9)
-
-        if sunrise < current_time < sunset:
-            return True
-        else:
-            return False
+        is_sunrise: bool = sun.is_sunrise(
+            latitude=latitude,
+            longitude=longitude,
+            grid_x=self.grid_coord["grid_x"],
+            grid_y=self.grid_coord["grid_y"],
+            now=datetime.now()
+        )
+        self.versions["is_sunrise"] = is_sunrise
+        return is_sunrise
 
-    @staticmethod
-    async def _set_near_stations(latitude: float, longitude: float) -> list[str]:
+    async def _set_near_stations(self, latitude: float, longitude: float) -> list[str]:
         """
-        근접 측정소 조회 메소드
+        근접 측정소 조회 메소드 (측정소 인덱스가 있으면 격자별로 미리 계산한 목록 사용)
         :param latitude: float
         :param longitude: float
         :return: list[str]
         """
-        async with Database() as db:
-            near_stations: list[dict] = await db.pm_station.find({
-                "geometry": {
-                    "$near": {
-                        "$geometry": {
-                            "type": "Point",
-                            "coordinates": [longitude, latitude]
-                        },
-                    }
+        if self.station_index is not None and self.station_index.is_loaded:
+            cell_stations: list[str] | None = self.station_index.nearest_for_cell(
+                grid_x=self.grid_coord["grid_x"], grid_y=self.grid_coord["grid_y"]
+            )
+            if cell_stations is not None:
+                return cell_stations
+            return self.station_index.nearest(latitude=latitude, longitude=longitude)
+
+        near_stations: list[dict] = await self.database.pm_station.find({
+            "geometry": {
+                "$near": {
+                    "$geometry": {
+                        "type": "Point",
+                        "coordinates": [longitude, latitude]
+                    },
                 }
-            }).to_list(length=3)
+            }
+        }).to_list(length=3)
 
         near_station_list: list[str] = [station["station_name"] for station in near_stations]
         return near_station_list
 
-    @staticmethod
-    async def _get_nowcast(grid_x: int, grid_y: int) -> NowcastModel:
+    async def _get_nowcast(self, grid_x: int, grid_y: int) -> tuple[NowcastModel, datetime]:
         """
         초단기실황 데이터 조회 메소드
         :param grid_x: int
         :param grid_y: int
+        :return: tuple[NowcastModel, datetime] (모델, 발표 시각)
+        """
+        if self.grid_file is not None:
+            entry: tuple[NowcastModel, datetime] | None = self.grid_file.get_nowcast(grid_x=grid_x, grid_y=grid_y)
+            if entry is not None and self.is_latest("nowcast", entry[1], datetime.now()):
+                return entry
+
+        if self.nowcast_cache is not None:
+            cached: tuple[NowcastModel, datetime] | None = self.nowcast_cache.get_entry((grid_x, grid_y))
+            if cached is not None:
+                return cached
+
+        return await self._single_flight(
+            self.nowcast_flight, (grid_x, grid_y), lambda: self._load_nowcast(grid_x=grid_x, grid_y=grid_y)
+        )
+
+    async def _load_nowcast(self, grid_x: int, grid_y: int) -> tuple[NowcastModel, datetime]:
+        """
+        MongoDB(없으면 기상청 API)에서 초단기실황을 조회해 캐시에 저장하는 메소드
+        :param grid_x: int
+        :param grid_y: int
+        :return: tuple[NowcastModel, datetime] (모델, 발표 시각)
+        """
+        nowcast_data: dict | None = await self.database.nowcast.find_one({"nx": grid_x, "ny": grid_y}, sort=[("tm", -1)])
+        if nowcast_data is None:
+            nowcast_data = await self._get_from_upstream("nowcast", grid_x=grid_x, grid_y=grid_y)
+        nowcast_model: NowcastModel = self.to_nowcast_model(nowcast_data)
+
+        if self.nowcast_cache is not None:
+            self.nowcast_cache.put((grid_x, grid_y), nowcast_model, tm=nowcast_data["tm"])
+        return nowcast_model, nowcast_data["tm"]
+
+    async def _get_forecast(self, grid_x: int, grid_y: int) -> tuple[list[ForecastModel], datetime]:
+        """
+        초단기예보 데이터 조회 메소드
+        :param grid_x: int
+        :param grid_y: int
+        :return: tuple[list[ForecastModel], datetime] (모델 리스트, 발표 시각)
+        """
+        if self.grid_file is not None:
+            entry: tuple[list[ForecastModel], datetime] | None = self.grid_file.get_forecast(grid_x=grid_x, grid_y=grid_y)
+            if entry is not None and self.is_latest("forecast", entry[1], datetime.now()):
+                return entry
+
+        if self.forecast_cache is not None:
+            cached: tuple[list[ForecastModel], datetime] | None = self.forecast_cache.get_entry((grid_x, grid_y))
+            if cached is not None:
+                return cached
+
+        return await self._single_flight(
+            self.forecast_flight, (grid_x, grid_y), lambda: self._load_forecast(grid_x=grid_x, grid_y=grid_y)
+        )
+
+    async def _load_forecast(self, grid_x: int, grid_y: int) -> tuple[list[ForecastModel], datetime]:
+        """
+        MongoDB(없으면 기상청 API)에서 초단기예보를 조회해 캐시에 저장하는 메소드
+        :param grid_x: int
+        :param grid_y: int
+        :return: tuple[list[ForecastModel], datetime] (모델 리스트, 발표 시각)
+        """
+        forecast_data: dict | None = await self.database.forecast.find_one({"nx": grid_x, "ny": grid_y}, sort=[("tm", -1)])
+        if forecast_data is None:
+            forecast_data = await self._get_from_upstream("forecast", grid_x=grid_x, grid_y=grid_y)
+        forecast_model_list: list[ForecastModel] = self.to_forecast_models(forecast_data)
+
+        if self.forecast_cache is not None:
+            self.forecast_cache.put((grid_x, grid_y), forecast_model_list, tm=forecast_data["tm"])
+        return forecast_model_list, forecast_data["tm"]
+
+    @staticmethod
+    async def _single_flight(flight: SingleFlight | None, key: tuple, factory):
+        """
+        flight 가 있으면 같은 키의 동시 조회를 합치고, 없으면 바로 실행하는 메소드
+        :param flight: SingleFlight | None
+        :param key: tuple
+        :param factory: 코루틴을 반환하는 함수
+        :return: factory() 결과
+        """
+        if flight is None:
+            return await factory()
+        return await flight.do(key, factory)
+
+    async def _get_from_upstream(self, kind: str, grid_x: int, grid_y: int) -> dict:
+        """
+        MongoDB 에 없는 격자 데이터를 기상청 API 에서 직접 조회하는 메소드 (같은 격자의 동시 조회는 한 번만 호출)
+        :param kind: str ("nowcast", "forecast")
+        :param grid_x: int
+        :param grid_y: int
+        :return: dict nowcast/forecast 문서
+        """
+        if self.upstream_fallback is None:
+            raise HTTPException(status_code=404, detail="Weather data not found for the grid cell.")
+        try:
+            return await self.upstream_fallback.get(kind, grid_x=grid_x, grid_y=grid_y)
+        except UpstreamError:
+            raise HTTPException(status_code=503, detail="Weather data is temporarily unavailable.")
+
+    @staticmethod
+    def to_nowcast_model(nowcast_data: dict) -> NowcastModel:
+        """
+        초단기실황 문서를 기본값을 적용한 NowcastModel 로 변환하는 메소드
+        :param nowcast_data: dict
         :return: NowcastModel
         """
-        async with Database() as db:
-            nowcast_data: dict = await db.nowcast.find_one({"nx": grid_x, "ny": grid_y}, sort=[("tm", -1)])
         return NowcastModel(
             datetime=nowcast_data["tm"],
             PTY=nowcast_data["PTY"] if nowcast_data["PTY"] is not None else 0,
@@ -163,17 +571,13 @@ class WeatherService:
         )
 
     @staticmethod
-    async def _get_forecast(grid_x: int, grid_y: int) -> list[ForecastModel]:
+    def to_forecast_models(forecast_data: dict) -> list[ForecastModel]:
         """
-        초단기예보 데이터 조회 메소드
-        :param grid_x: int
-        :param grid_y: int
+        초단기예보 문서를 기본값을 적용한 ForecastModel 리스트로 변환하는 메소드
+        :param forecast_data: dict
         :return: list[ForecastModel]
         """
-        async with Database() as db:
-            forecast_data: dict = await db.forecast.find_one({"nx": grid_x, "ny": grid_y}, sort=[("tm", -1)])
-
-        forecast_model_list: list[ForecastModel] = [
+        return [
             ForecastModel(
                 datetime=data["effective_time"],
                 LGT=data["LGT"] if data["LGT"] is not None else 0,
@@ -184,46 +588,64 @@ class WeatherService:
             )
             for data in forecast_data["items"]
         ]
-        return forecast_model_list
 
-    @staticmethod
-    async def _get_particulate_matter(latitude: float, longitude: float) -> ParticulateMatterModel:
+    async def _get_particulate_matter(self, latitude: float, longitude: float) -> tuple[ParticulateMatterModel, tuple[str, datetime]]:
         """
         미세먼지 데이터 조회 메소드
+        근접 측정소 중 가장 최신 유효 데이터, 유효 데이터가 없으면 가장 최신 데이터를 반환
         :param latitude: float
         :param longitude: float
-        :return: ParticulateMatterModel
+        :return: tuple[ParticulateMatterModel, tuple[str, datetime]] (모델, (측정소, 측정 시각))
         """
-        async with Database() as db:
-            near_stations: list[dict] = await db.pm_station.find({
-                "geometry": {
-                    "$near": {
-                        "$geometry": {
-                            "type": "Point",
-                            "coordinates": [longitude, latitude]
-                        },
-                    }
-                }
-            }).to_list(length=3)
-            near_station_list: list[str] = [station["station_name"] for station in near_stations]
-            particulate_matter_list: list[dict] = await db.pm_data.find({"station_name": {"$in": near_station_list}}, sort=[("tm", -1)]).to_list(length=None)
-
-        for particulate_matter in particulate_matter_list:
-            if (particulate_matter.get("pm10Value") is not None) or (particulate_matter.get("pm25Value") is not None):
-                return ParticulateMatterModel(
-                    datetime=particulate_matter.get("dataTime"),
-                    station_name=particulate_matter.get("station_name"),
-                    pm10Value=particulate_matter.get("pm10Value"),
-                    pm10Grade=particulate_matter.get("pm10Grade1h"),
-                    pm25Value=particulate_matter.get("pm25Value"),
-                    pm25Grade=particulate_matter.get("pm25Grade1h")
-                )
+        near_station_list: list[str] = await self._set_near_stations(latitude=latitude, longitude=longitude)
+
+        if self.particulate_matter_view is not None and self.particulate_matter_view.is_loaded:
+            particulate_matter: dict | None = self.particulate_matter_view.get(near_station_list)
+            if particulate_matter is None:
+                raise HTTPException(status_code=404, detail="Particulate matter data not found.")
+        else:
+            particulate_matter = await self._single_flight(
+                self.particulate_matter_flight, tuple(near_station_list), lambda: self._load_particulate_matter(near_station_list)
+            )
 
+        return (
+            self.to_particulate_matter_model(particulate_matter),
+            (particulate_matter["station_name"], particulate_matter["tm"]),
+        )
+
+    async def _load_particulate_matter(self, near_station_list: list[str]) -> dict:
+        """
+        근접 측정소의 미세먼지 측정 문서를 MongoDB 에서 조회하는 메소드 (최신 미세먼지 뷰가 로드되기 전에 사용)
+        측정소마다 최신 데이터와 최신 유효 데이터를 {station_name, tm} 인덱스로 한 건씩만 읽어 측정소 이력 길이와 관계없이 조회량이 일정
+        :param near_station_list: list[str]
+        :return: dict 가장 최신 유효 데이터, 유효 데이터가 없으면 가장 최신 데이터
+        """
+        documents: list[dict | None] = await asyncio.gather(*(
+            self.database.pm_data.find_one({"station_name": station_name} | condition, sort=[("tm", -1)])
+            for station_name in near_station_list
+            for condition in ({}, VALID_READING_FILTER)
+        ))
+        view: ParticulateMatterView = ParticulateMatterView()
+        for document in documents:
+            if document is not None:
+                view.update(document)
+        particulate_matter: dict | None = view.get(near_station_list)
+        if particulate_matter is None:
+            raise HTTPException(status_code=404, detail="Particulate matter data not found.")
+        return particulate_matter
+
+    @staticmethod
+    def to_particulate_matter_model(particulate_matter: dict) -> ParticulateMatterModel:
+        """
+        미세먼지 측정 문서를 ParticulateMatterModel 로 변환하는 메소드
+        :param particulate_matter: dict
+        :return: ParticulateMatterModel
+        """
         return ParticulateMatterModel(
-            datetime=particulate_matter_list[0].get("dataTime"),
-            station_name=particulate_matter_list[0].get("station_name"),
-            pm10Value=particulate_matter_list[0].get("pm10Value"),
-            pm10Grade=particulate_matter_list[0].get("pm10Grade1h"),
-            pm25Value=particulate_matter_list[0].get("pm25Value"),
-            pm25Grade=particulate_matter_list[0].get("pm25Grade1h")
+            datetime=particulate_matter.get("dataTime"),
+            station_name=particulate_matter.get("station_name"),
+            pm10Value=particulate_matter.get("pm10Value"),
+            pm10Grade=particulate_matter.get("pm10Grade1h"),
+            pm25Value=particulate_matter.get("pm25Value"),
+            pm25Grade=particulate_matter.get("pm25Grade1h")
         )
@@ -0,0 +1,59 @@
+import asyncio
+from typing import Awaitable, Callable, Hashable
+from app.microweather.metrics import SINGLE_FLIGHT_CALLS
+
+
+class SingleFlight:
+    def __init__(self, name: str) -> None:
+        """
+        같은 키에 대한 동시 조회를 하나의 실행으로 합치는 클래스
+        먼저 들어온 요청이 작업을 시작하고, 작업이 끝나기 전에 들어온 같은 키의 요청은 그 결과(또는 예외)를 함께 사용
+        :param name: str 지표 라벨 (nowcast, forecast, particulate_matter 등)
+        """
+        self.name: str = name
+        self.calls: int = 0
+        self.coalesced: int = 0
+        self._in_flight: dict[Hashable, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable]):
+        """
+        key 로 진행 중인 작업이 있으면 그 결과를 기다리고, 없으면 factory() 를 실행하는 메소드
+        작업은 별도 Task 로 실행하므로 기다리던 요청 하나가 취소되어도 작업과 다른 요청에는 영향이 없음
+        :param key: Hashable
+        :param factory: 코루틴을 반환하는 함수 (작업을 시작할 때만 호출)
+        :return: factory() 결과
+        """
+        task: asyncio.Task | None = self._in_flight.get(key)
+        if task is None:
+            self.calls += 1
+            SINGLE_FLIGHT_CALLS.labels(group=self.name, role="leader").inc()
+            task = asyncio.ensure_future(factory())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.coalesced += 1
+            SINGLE_FLIGHT_CALLS.labels(group=self.name, role="coalesced").inc()
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # 기다리던 요청이 모두 취소된 뒤 실패한 작업의 예외가 미조회 경고로 남지 않도록 확인
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        """
+        실행 수와 합쳐진 요청 수 반환 메소드
+        :return: dict
+        """
+        requests: int = self.calls + self.coalesced
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+            "coalesced_ratio": self.coalesced / requests if requests else 0.0,
+        }
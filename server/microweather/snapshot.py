@@ -0,0 +1,168 @@
+import time
+import numpy as np
+from datetime import datetime
+from pymongo import UpdateOne
+from app.microweather import sun, grid, gridfile
+from app.microweather.database import Database
+from app.microweather.station import StationIndex
+from app.microweather.particulate import ParticulateMatterView
+from app.microweather.service import WeatherService
+from app.microweather.ingestion import NOWCAST_CATEGORIES, FORECAST_CATEGORIES
+from app.microweather.models import NowcastModel, ForecastModel
+
+
+async def find_latest_by_cell(collection) -> dict[tuple[int, int], dict]:
+    """
+    전체 격자의 최신(tm 기준) 문서를 {nx, ny, tm: -1} 인덱스 순서의 집계 쿼리 한 번으로 조회하는 함수
+    :param collection: nowcast 또는 forecast 컬렉션
+    :return: dict[tuple[int, int], dict]
+    """
+    documents: list[dict] = await collection.aggregate([
+        {"$sort": {"nx": 1, "ny": 1, "tm": -1}},
+        {"$group": {"_id": {"nx": "$nx", "ny": "$ny"}, "document": {"$first": "$$ROOT"}}},
+    ], allowDiskUse=True).to_list(length=None)
+    return {(document["_id"]["nx"], document["_id"]["ny"]): document["document"] for document in documents}
+
+
+def to_snapshot_document(
+    grid_x: int,
+    grid_y: int,
+    nowcast_data: dict,
+    forecast_data: dict,
+    particulate_matter: dict | None,
+    sun_times: tuple[datetime, datetime],
+    updated_at: datetime,
+) -> dict:
+    """
+    격자 하나의 응답 구성 요소(주소 제외)를 기본값을 적용한 형태로 묶은 snapshot 컬렉션 문서를 만드는 함수
+    :param grid_x: int
+    :param grid_y: int
+    :param nowcast_data: dict 격자의 최신 nowcast 문서
+    :param forecast_data: dict 격자의 최신 forecast 문서
+    :param particulate_matter: dict | None 격자 중심 근접 측정소의 최신(유효) pm_data 문서
+    :param sun_times: tuple[datetime, datetime] 오늘 일출/일몰 시각
+    :param updated_at: datetime
+    :return: dict
+    """
+    return {
+        "nx": grid_x,
+        "ny": grid_y,
+        "updated_at": updated_at,
+        "nowcast": WeatherService.to_nowcast_model(nowcast_data).model_dump(),
+        "nowcast_tm": nowcast_data["tm"],
+        "forecast": [model.model_dump() for model in WeatherService.to_forecast_models(forecast_data)],
+        "forecast_tm": forecast_data["tm"],
+        "particulate_matter": (
+            WeatherService.to_particulate_matter_model(particulate_matter).model_dump() if particulate_matter is not None else None
+        ),
+        "particulate_matter_version": (
+            [particulate_matter["station_name"], particulate_matter["tm"]] if particulate_matter is not None else None
+        ),
+        "sunrise": sun_times[0],
+        "sunset": sun_times[1],
+    }
+
+
+def to_grid_array(nowcasts: dict[tuple[int, int], dict], forecasts: dict[tuple[int, int], dict]) -> np.ndarray:
+    """
+    격자별 최신 nowcast/forecast 문서를 gridfile.GRID_DTYPE 배열로 변환하는 함수 (기본값은 WeatherService 변환과 동일)
+    :param nowcasts: dict[tuple[int, int], dict]
+    :param forecasts: dict[tuple[int, int], dict]
+    :return: np.ndarray shape (GRID_NX, GRID_NY)
+    """
+    array: np.ndarray = np.zeros((grid.GRID_NX, grid.GRID_NY), dtype=gridfile.GRID_DTYPE)
+    for (grid_x, grid_y), nowcast_data in nowcasts.items():
+        if not (1 <= grid_x <= grid.GRID_NX and 1 <= grid_y <= grid.GRID_NY):
+            continue
+        nowcast_model: NowcastModel = WeatherService.to_nowcast_model(nowcast_data)
+        record: np.void = array[grid_x - 1, grid_y - 1]
+        record["nowcast_tm"] = gridfile.to_minutes(nowcast_data["tm"])
+        record["nowcast"] = [getattr(nowcast_model, category) for category in NOWCAST_CATEGORIES]
+
+    for (grid_x, grid_y), forecast_data in forecasts.items():
+        if not (1 <= grid_x <= grid.GRID_NX and 1 <= grid_y <= grid.GRID_NY):
+            continue
+        forecast_model_list: list[ForecastModel] = WeatherService.to_forecast_models(forecast_data)[:gridfile.FORECAST_HOURS]
+        record: np.void = array[grid_x - 1, grid_y - 1]
+        record["forecast_tm"] = gridfile.to_minutes(forecast_data["tm"])
+        record["forecast_count"] = len(forecast_model_list)
+        for hour, forecast_model in enumerate(forecast_model_list):
+            record["forecast_time"][hour] = gridfile.to_minutes(forecast_model.datetime)
+            record["forecast"][hour] = [getattr(forecast_model, category) for category in FORECAST_CATEGORIES]
+    return array
+
+
+class SnapshotBuilder:
+    def __init__(self, database: Database, batch_size: int = 1000) -> None:
+        """
+        수집 직후 격자별 snapshot 문서(최신 초단기실황·예보, 근접 측정소 미세먼지, 오늘 일출/일몰)를 다시 만드는 클래스
+        요청 처리 시 주소를 제외한 응답 구성 요소를 (nx, ny) 인덱스 한 번 조회로 읽을 수 있게 함
+        :param database: Database
+        :param batch_size: int bulk_write 한 번에 보낼 문서 수
+        """
+        self.database: Database = database
+        self.batch_size: int = batch_size
+        self.station_index: StationIndex = StationIndex()
+        self.particulate_matter_view: ParticulateMatterView = ParticulateMatterView()
+
+    async def refresh(self, cells: list[tuple[int, int]], now: datetime | None = None) -> dict:
+        """
+        격자 목록의 snapshot 문서를 다시 만들어 upsert 하는 메소드 (초단기실황·예보가 없는 격자는 건너뜀)
+        :param cells: list[tuple[int, int]]
+        :param now: datetime
+        :return: dict 처리 결과
+        """
+        start: float = time.perf_counter()
+        now = now or datetime.now()
+        await self.station_index.load(self.database)
+        await self.particulate_matter_view.load(self.database)
+        nowcasts: dict[tuple[int, int], dict] = await find_latest_by_cell(self.database.nowcast)
+        forecasts: dict[tuple[int, int], dict] = await find_latest_by_cell(self.database.forecast)
+
+        cells = [cell for cell in cells if cell in nowcasts and cell in forecasts]
+        latitudes, longitudes = grid.from_grid_batch(
+            np.array([grid_x for grid_x, _ in cells]), np.array([grid_y for _, grid_y in cells])
+        )
+        operations: list[UpdateOne] = []
+        for (grid_x, grid_y), latitude, longitude in zip(cells, latitudes.tolist(), longitudes.tolist()):
+            particulate_matter: dict | None = None
+            if self.station_index.is_loaded:
+                station_names: list[str] | None = self.station_index.nearest_for_cell(grid_x=grid_x, grid_y=grid_y)
+                particulate_matter = self.particulate_matter_view.get(station_names or [])
+            document: dict = to_snapshot_document(
+                grid_x, grid_y, nowcasts[(grid_x, grid_y)], forecasts[(grid_x, grid_y)], particulate_matter,
+                sun.get_sun_times(latitude=latitude, longitude=longitude, grid_x=grid_x, grid_y=grid_y, day=now.date()),
+                updated_at=now,
+            )
+            operations.append(UpdateOne({"nx": grid_x, "ny": grid_y}, {"$set": document}, upsert=True))
+
+        for batch_start in range(0, len(operations), self.batch_size):
+            await self.database.snapshot.bulk_write(operations[batch_start:batch_start + self.batch_size], ordered=False)
+        return {"collection": "snapshot", "written": len(operations), "seconds": round(time.perf_counter() - start, 3)}
+
+
+class GridFileWriter:
+    def __init__(self, database: Database, path: str) -> None:
+        """
+        수집 직후 전체 격자의 최신 초단기실황·예보를 고정 레이아웃 파일로 다시 쓰는 클래스 (수집 프로세스 하나에서만 실행)
+        :param database: Database
+        :param path: str GridFile 이 매핑할 파일 경로
+        """
+        self.database: Database = database
+        self.path: str = path
+
+    async def refresh(self) -> dict:
+        """
+        격자 파일 갱신 메소드
+        :return: dict 처리 결과
+        """
+        start: float = time.perf_counter()
+        nowcasts: dict[tuple[int, int], dict] = await find_latest_by_cell(self.database.nowcast)
+        forecasts: dict[tuple[int, int], dict] = await find_latest_by_cell(self.database.forecast)
+        gridfile.write_grid_file(self.path, to_grid_array(nowcasts, forecasts))
+        return {
+            "file": self.path,
+            "nowcast_cells": len(nowcasts),
+            "forecast_cells": len(forecasts),
+            "seconds": round(time.perf_counter() - start, 3),
+        }
@@ -0,0 +1,113 @@
+import asyncio
+import numpy as np
+from scipy.spatial import cKDTree
+from app.microweather import grid
+from app.microweather.database import Database
+
+
+def _to_unit_vectors(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """
+    위경도를 단위 구 위의 3차원 좌표로 변환하는 함수
+    (현 길이 순서 = 구면 거리 순서이므로 MongoDB $near 와 같은 순서로 정렬됨)
+    :param latitudes: np.ndarray
+    :param longitudes: np.ndarray
+    :return: np.ndarray (N, 3)
+    """
+    latitudes = np.radians(np.asarray(latitudes, dtype=np.float64))
+    longitudes = np.radians(np.asarray(longitudes, dtype=np.float64))
+    cos_latitudes: np.ndarray = np.cos(latitudes)
+    return np.column_stack((cos_latitudes * np.cos(longitudes), cos_latitudes * np.sin(longitudes), np.sin(latitudes)))
+
+
+class StationIndex:
+    def __init__(self, k: int = 3) -> None:
+        """
+        미세먼지 측정소 위치 KD-tree 와 격자별 근접 측정소 테이블
+        :param k: int 격자별로 미리 계산할 근접 측정소 수
+        """
+        self.k: int = k
+        self.tree: cKDTree | None = None
+        self.station_names: np.ndarray = np.empty(0, dtype=object)
+        self.cell_stations: np.ndarray = np.empty((0, 0, 0), dtype=np.int64)
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.tree is not None
+
+    def _build(self, documents: list[dict]) -> tuple[cKDTree, np.ndarray, np.ndarray]:
+        """
+        측정소 문서 목록으로 KD-tree 와 격자별 근접 측정소 테이블을 생성하는 메소드 (워커 스레드에서 실행)
+        :param documents: list[dict]
+        :return: tuple[cKDTree, np.ndarray, np.ndarray]
+        """
+        longitudes: np.ndarray = np.array([document["geometry"]["coordinates"][0] for document in documents])
+        latitudes: np.ndarray = np.array([document["geometry"]["coordinates"][1] for document in documents])
+        station_names: np.ndarray = np.array([document["station_name"] for document in documents], dtype=object)
+        tree: cKDTree = cKDTree(_to_unit_vectors(latitudes, longitudes))
+
+        grid_x, grid_y = np.meshgrid(np.arange(1, grid.GRID_NX + 1), np.arange(1, grid.GRID_NY + 1), indexing="ij")
+        cell_latitudes, cell_longitudes = grid.from_grid_batch(grid_x.ravel(), grid_y.ravel())
+        k: int = min(self.k, len(documents))
+        _, indexes = tree.query(_to_unit_vectors(cell_latitudes, cell_longitudes), k=k)
+        cell_stations: np.ndarray = np.asarray(indexes).reshape(grid.GRID_NX, grid.GRID_NY, k)
+        return tree, station_names, cell_stations
+
+    async def load(self, database: Database) -> None:
+        """
+        pm_station 컬렉션을 불러와 인덱스를 새로 만드는 메소드 (완성 후 한 번에 교체)
+        :param database: Database
+        """
+        documents: list[dict] = await database.pm_station.find(
+            {}, projection={"_id": 0, "station_name": 1, "geometry": 1}
+        ).to_list(length=None)
+        if not documents:
+            return
+        self.tree, self.station_names, self.cell_stations = await asyncio.to_thread(self._build, documents)
+
+    async def watch(self, database: Database, interval: float) -> None:
+        """
+        interval 초마다 측정소 목록을 다시 불러오는 백그라운드 작업
+        :param database: Database
+        :param interval: float
+        """
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.load(database)
+            except Exception:
+                # 조회 실패 시 기존 인덱스를 유지하고 다음 주기에 다시 시도
+                continue
+
+    def nearest(self, latitude: float, longitude: float, k: int | None = None) -> list[str]:
+        """
+        위경도에서 가까운 순서로 측정소 이름 k 개를 반환하는 메소드
+        :param latitude: float
+        :param longitude: float
+        :param k: int (기본값 self.k)
+        :return: list[str]
+        """
+        return self.nearest_batch(np.array([latitude]), np.array([longitude]), k=k)[0]
+
+    def nearest_batch(self, latitudes: np.ndarray, longitudes: np.ndarray, k: int | None = None) -> list[list[str]]:
+        """
+        위경도 배열의 지점별 근접 측정소 이름 목록을 한 번에 반환하는 메소드
+        :param latitudes: np.ndarray
+        :param longitudes: np.ndarray
+        :param k: int (기본값 self.k)
+        :return: list[list[str]]
+        """
+        k = min(k if k is not None else self.k, len(self.station_names))
+        _, indexes = self.tree.query(_to_unit_vectors(latitudes, longitudes), k=k)
+        indexes = np.asarray(indexes).reshape(len(np.atleast_1d(latitudes)), k)
+        return self.station_names[indexes].tolist()
+
+    def nearest_for_cell(self, grid_x: int, grid_y: int) -> list[str] | None:
+        """
+        격자 중심 기준으로 미리 계산한 근접 측정소 이름 목록을 반환하는 메소드 (격자 범위 밖이면 None)
+        :param grid_x: int
+        :param grid_y: int
+        :return: list[str] | None
+        """
+        if not (1 <= grid_x <= grid.GRID_NX and 1 <= grid_y <= grid.GRID_NY):
+            return None
+        return self.station_names[self.cell_stations[grid_x - 1, grid_y - 1]].tolist()
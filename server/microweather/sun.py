@@ -0,0 +1,190 @@
+import math
+import asyncio
+import logging
+import numpy as np
+from datetime import date, datetime, timedelta
+from app.microweather import grid
+
+logger: logging.Logger = logging.getLogger("microweather.sun")
+
+KST_OFFSET: timedelta = timedelta(hours=9)
+ZENITH: float = 90.833  # 대기 굴절(34')과 태양 반지름(16')을 반영한 일출/일몰 천정각
+_JULIAN_DAY_UNIX_EPOCH: float = 2440587.5
+
+
+def _sun_event_minutes(day: date, latitudes: np.ndarray, longitudes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    NOAA 태양 위치 공식으로 일출/일몰 시각을 벡터 연산하는 함수
+    각 이벤트 시각에서 태양 적위와 균시차를 한 번 더 계산해 정밀도를 보정
+    :param day: date (KST 날짜)
+    :param latitudes: np.ndarray
+    :param longitudes: np.ndarray
+    :return: tuple[np.ndarray, np.ndarray] KST 자정 기준 일출/일몰 시각(분), 극야/백야 지점은 NaN
+    """
+    latitudes = np.radians(np.asarray(latitudes, dtype=np.float64))
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    midnight_kst: datetime = datetime(day.year, day.month, day.day)
+    # KST 자정 시각의 율리우스일 (UTC 기준)
+    julian_day: float = (midnight_kst - KST_OFFSET - datetime(1970, 1, 1)).total_seconds() / 86400 + _JULIAN_DAY_UNIX_EPOCH
+    kst_offset_minutes: float = KST_OFFSET.total_seconds() / 60
+
+    def solve(minutes: np.ndarray, sign: int) -> np.ndarray:
+        t: np.ndarray = (julian_day + minutes / 1440 - 2451545.0) / 36525
+        mean_longitude: np.ndarray = np.radians(np.mod(280.46646 + t * (36000.76983 + t * 0.0003032), 360))
+        mean_anomaly: np.ndarray = np.radians(357.52911 + t * (35999.05029 - 0.0001537 * t))
+        eccentricity: np.ndarray = 0.016708634 - t * (0.000042037 + 0.0000001267 * t)
+        center: np.ndarray = (
+            np.sin(mean_anomaly) * (1.914602 - t * (0.004817 + 0.000014 * t))
+            + np.sin(2 * mean_anomaly) * (0.019993 - 0.000101 * t)
+            + np.sin(3 * mean_anomaly) * 0.000289
+        )
+        omega: np.ndarray = np.radians(125.04 - 1934.136 * t)
+        apparent_longitude: np.ndarray = np.radians(np.degrees(mean_longitude) + center - 0.00569 - 0.00478 * np.sin(omega))
+        obliquity: np.ndarray = np.radians(
+            23 + (26 + (21.448 - t * (46.815 + t * (0.00059 - t * 0.001813))) / 60) / 60 + 0.00256 * np.cos(omega)
+        )
+        declination: np.ndarray = np.arcsin(np.sin(obliquity) * np.sin(apparent_longitude))
+
+        y: np.ndarray = np.tan(obliquity / 2) ** 2
+        equation_of_time: np.ndarray = 4 * np.degrees(
+            y * np.sin(2 * mean_longitude)
+            - 2 * eccentricity * np.sin(mean_anomaly)
+            + 4 * eccentricity * y * np.sin(mean_anomaly) * np.cos(2 * mean_longitude)
+            - 0.5 * y * y * np.sin(4 * mean_longitude)
+            - 1.25 * eccentricity * eccentricity * np.sin(2 * mean_anomaly)
+        )
+        with np.errstate(invalid="ignore"):
+            hour_angle: np.ndarray = np.arccos(
+                np.cos(math.radians(ZENITH)) / (np.cos(latitudes) * np.cos(declination))
+                - np.tan(latitudes) * np.tan(declination)
+            )
+        return 720 - 4 * longitudes - equation_of_time + sign * 4 * np.degrees(hour_angle) + kst_offset_minutes
+
+    noon: np.ndarray = np.full(np.broadcast(latitudes, longitudes).shape, 720.0)
+    sunrise: np.ndarray = solve(solve(noon, -1), -1)
+    sunset: np.ndarray = solve(solve(noon, 1), 1)
+    return sunrise, sunset
+
+
+class SunTable:
+    def __init__(self, day: date, sunrise: np.ndarray, sunset: np.ndarray) -> None:
+        """
+        하루 동안 사용하는 전체 격자의 일출/일몰 시각 테이블
+        :param day: date (KST 날짜)
+        :param sunrise: np.ndarray (GRID_NX, GRID_NY) KST 자정 기준 일출 시각(분)
+        :param sunset: np.ndarray (GRID_NX, GRID_NY) KST 자정 기준 일몰 시각(분)
+        """
+        self.day: date = day
+        self.sunrise: np.ndarray = sunrise
+        self.sunset: np.ndarray = sunset
+
+    @classmethod
+    def build(cls, day: date) -> "SunTable":
+        """
+        전체 격자 중심점의 일출/일몰 시각을 한 번에 계산해 테이블을 생성하는 메소드
+        :param day: date
+        :return: SunTable
+        """
+        grid_x, grid_y = np.meshgrid(np.arange(1, grid.GRID_NX + 1), np.arange(1, grid.GRID_NY + 1), indexing="ij")
+        latitudes, longitudes = grid.from_grid_batch(grid_x, grid_y)
+        sunrise, sunset = _sun_event_minutes(day, latitudes, longitudes)
+        return cls(day=day, sunrise=sunrise, sunset=sunset)
+
+    def get_minutes(self, grid_x: int, grid_y: int) -> tuple[float, float] | None:
+        """
+        격자의 일출/일몰 시각(분)을 O(1) 로 조회하는 메소드 (격자 범위 밖이면 None)
+        :param grid_x: int
+        :param grid_y: int
+        :return: tuple[float, float] | None
+        """
+        if not (1 <= grid_x <= grid.GRID_NX and 1 <= grid_y <= grid.GRID_NY):
+            return None
+        return float(self.sunrise[grid_x - 1, grid_y - 1]), float(self.sunset[grid_x - 1, grid_y - 1])
+
+
+_table: SunTable | None = None
+_next_table: SunTable | None = None  # refresh_daily 가 자정 전에 미리 계산한 다음 날 테이블
+
+
+def get_table(day: date) -> SunTable:
+    """
+    해당 날짜의 SunTable 을 반환하는 함수
+    날짜가 바뀌면 미리 계산된 다음 날 테이블로 교체하고, 아직 없으면 이벤트 루프에서 계산하지 않고 기존 테이블을 계속 사용
+    (하루 차이의 일출/일몰 시각 변화는 몇 분 이내), 테이블이 한 번도 만들어지지 않았을 때만 직접 계산
+    :param day: date
+    :return: SunTable
+    """
+    global _table, _next_table
+    if _table is not None and _table.day == day:
+        return _table
+    if _next_table is not None and _next_table.day == day:
+        _table, _next_table = _next_table, None
+    elif _table is None:
+        _table = SunTable.build(day)
+    return _table
+
+
+async def build_table(day: date) -> SunTable:
+    """
+    SunTable 을 워커 스레드에서 계산해 교체하는 함수
+    :param day: date
+    :return: SunTable
+    """
+    global _table
+    _table = await asyncio.to_thread(SunTable.build, day)
+    return _table
+
+
+async def refresh_daily(retry_seconds: float = 60) -> None:
+    """
+    다음 날 SunTable 을 자정(서버 시각, KST) 전에 워커 스레드에서 미리 계산해 두고, 자정에 교체하는 백그라운드 작업
+    자정 직후 요청이 이벤트 루프에서 테이블을 계산하지 않도록 함 (get_table 도 날짜가 바뀌면 미리 계산된 테이블로 교체)
+    :param retry_seconds: float 계산 실패 시 다시 시도할 간격(초)
+    """
+    global _next_table
+    while True:
+        now: datetime = datetime.now()
+        tomorrow: datetime = datetime(now.year, now.month, now.day) + timedelta(days=1)
+        if _next_table is None or _next_table.day != tomorrow.date():
+            try:
+                _next_table = await asyncio.to_thread(SunTable.build, tomorrow.date())
+            except Exception as e:
+                logger.error(f"다음 날 일출/일몰 테이블 계산 실패 : {e!r}")
+                await asyncio.sleep(retry_seconds)
+                continue
+        await asyncio.sleep(max((tomorrow - datetime.now()).total_seconds(), 0))
+        get_table(tomorrow.date())
+
+
+def get_sun_times(latitude: float, longitude: float, grid_x: int, grid_y: int, day: date) -> tuple[datetime, datetime]:
+    """
+    지점의 일출/일몰 시각(KST)을 반환하는 함수
+    격자 테이블에서 조회하고, 테이블 범위 밖 격자는 해당 위경도로 직접 계산
+    :param latitude: float
+    :param longitude: float
+    :param grid_x: int
+    :param grid_y: int
+    :param day: date (KST 날짜)
+    :return: tuple[datetime, datetime] (sunrise, sunset)
+    """
+    minutes: tuple[float, float] | None = get_table(day).get_minutes(grid_x, grid_y)
+    if minutes is None:
+        sunrise, sunset = _sun_event_minutes(day, np.array([latitude]), np.array([longitude]))
+        minutes = float(sunrise[0]), float(sunset[0])
+
+    midnight: datetime = datetime(day.year, day.month, day.day)
+    return midnight + timedelta(minutes=minutes[0]), midnight + timedelta(minutes=minutes[1])
+
+
+def is_sunrise(latitude: float, longitude: float, grid_x: int, grid_y: int, now: datetime) -> bool:
+    """
+    현재 시각(KST)이 오늘 일출과 일몰 사이인지 확인하는 함수
+    :param latitude: float
+    :param longitude: float
+    :param grid_x: int
+    :param grid_y: int
+    :param now: datetime
+    :return: bool
+    """
+    sunrise, sunset = get_sun_times(latitude=latitude, longitude=longitude, grid_x=grid_x, grid_y=grid_y, day=now.date())
+    return sunrise < now < sunset
@@ -0,0 +1,197 @@
+import os
+import json
+import time
+import asyncio
+import logging
+import numpy as np
+from typing import Awaitable, Callable
+from collections import Counter, deque
+from app.microweather import grid
+from app.microweather.metrics import WARMUP_SECONDS
+from app.microweather.cache import CellCache
+from app.microweather.gridfile import GridFile
+from app.microweather.database import Database
+from app.microweather.batch import BatchWeatherService
+from app.microweather.service import WeatherService
+
+logger: logging.Logger = logging.getLogger("microweather.warmup")
+
+# 접근 로그에 격자가 없을 때 합성 요청에 사용할 좌표 (서울시청)
+DEFAULT_COORDINATES: tuple[float, float] = (37.5666, 126.9784)
+
+
+def top_cells_from_logs(log_dir: str, limit: int, max_lines: int = 200000) -> list[tuple[int, int]]:
+    """
+    접근 로그(logger.py, server.log 와 회전된 파일)의 최근 max_lines 줄에서 요청이 많은 격자를 찾는 함수
+    :param log_dir: str
+    :param limit: int
+    :param max_lines: int
+    :return: list[tuple[int, int]] 요청 수 내림차순
+    """
+    try:
+        names: list[str] = [name for name in os.listdir(log_dir) if name.startswith("server.log")]
+    except FileNotFoundError:
+        return []
+
+    # server.log 가 가장 최신이고 회전된 파일은 server.log.YYYY-MM-DD, 최신 파일부터 max_lines 줄이 찰 때까지 끝부분만 읽음
+    names.sort(key=lambda name: (name == "server.log", name), reverse=True)
+    lines: list[str] = []
+    for name in names:
+        with open(os.path.join(log_dir, name), encoding="utf-8", errors="replace") as file:
+            lines.extend(deque(file, maxlen=max_lines - len(lines)))
+        if len(lines) >= max_lines:
+            break
+
+    counts: Counter[tuple[int, int]] = Counter()
+    for line in lines:
+        if '"grid_x"' not in line:
+            continue
+        try:
+            fields: dict = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(fields.get("grid_x"), int) and isinstance(fields.get("grid_y"), int):
+            counts[(fields["grid_x"], fields["grid_y"])] += 1
+    return [cell for cell, _ in counts.most_common(limit)]
+
+
+def parse_cells(value: str) -> list[tuple[int, int]]:
+    """
+    "60,127;61,125" 형식의 격자 목록 변환 함수
+    :param value: str
+    :return: list[tuple[int, int]]
+    """
+    cells: list[tuple[int, int]] = []
+    for item in value.split(";"):
+        if item.strip():
+            grid_x, grid_y = item.split(",")
+            cells.append((int(grid_x), int(grid_y)))
+    return cells
+
+
+class Warmup:
+    def __init__(self, started_at: float | None = None) -> None:
+        """
+        서버 시작 직후 첫 요청들이 느려지지 않도록 커넥션 풀, 격자 파일 페이지, 격자 캐시, 응답 생성 경로를 미리 준비하는 클래스
+        run 이 끝나면(단계 실패 포함) is_ready 가 True 가 되며 /ready 로 노출
+        :param started_at: float 서버 시작 시각 (time.perf_counter 기준, 준비 완료까지 걸린 시간 계산용)
+        """
+        self.started_at: float = started_at if started_at is not None else time.perf_counter()
+        self.is_ready: bool = False
+        self.phase: str = "pending"
+        self.steps: dict[str, float] = {}
+        self.errors: dict[str, str] = {}
+        self.cells: int = 0
+        self.ready_after: float | None = None
+
+    async def _step(self, name: str, awaitable: Awaitable) -> None:
+        """
+        단계 하나를 실행하고 소요 시간을 기록하는 메소드 (실패해도 다음 단계 진행)
+        :param name: str
+        :param awaitable: Awaitable
+        """
+        self.phase = name
+        start: float = time.perf_counter()
+        try:
+            await awaitable
+        except Exception as e:
+            self.errors[name] = repr(e)
+            logger.warning(f"시작 준비 단계 실패 ({name}) : {e!r}")
+        self.steps[name] = time.perf_counter() - start
+        WARMUP_SECONDS.labels(step=name).set(self.steps[name])
+
+    async def run(
+        self,
+        database: Database,
+        nowcast_cache: CellCache | None,
+        forecast_cache: CellCache | None,
+        grid_file: GridFile | None,
+        create_service: Callable[[float, float], WeatherService],
+        cells: list[tuple[int, int]] | None = None,
+        log_dir: str | None = None,
+        max_cells: int = 1000,
+        connections: int = 10,
+    ) -> None:
+        """
+        시작 준비 실행 메소드
+        :param database: Database
+        :param nowcast_cache: CellCache | None
+        :param forecast_cache: CellCache | None
+        :param grid_file: GridFile | None
+        :param create_service: 위경도로 요청 처리와 같은 자원을 쓰는 WeatherService 를 만드는 함수
+        :param cells: list[tuple[int, int]] | None 항상 미리 불러올 격자
+        :param log_dir: str | None 요청이 많은 격자를 찾을 접근 로그 디렉터리 (None 이면 cells 만 사용)
+        :param max_cells: int 미리 불러올 최대 격자 수 (격자 캐시 크기 이하)
+        :param connections: int 미리 열어 둘 MongoDB 연결 수 (동시에 보내는 ping 수)
+        """
+        await self._step("database", asyncio.gather(*(database.database.command("ping") for _ in range(connections))))
+        if grid_file is not None:
+            await self._step("grid_file", asyncio.to_thread(self._touch_grid_file, grid_file))
+
+        top_cells: list[tuple[int, int]] = list(cells or [])
+        if log_dir is not None:
+            async def read_log() -> None:
+                top_cells.extend(await asyncio.to_thread(top_cells_from_logs, log_dir, max_cells))
+            await self._step("access_log", read_log())
+        top_cells = list(dict.fromkeys(top_cells))[:max_cells]
+        if top_cells:
+            self.cells = len(top_cells)
+            await self._step("cells", self._load_cells(database, top_cells, nowcast_cache, forecast_cache, grid_file))
+        await self._step("request", self._request(top_cells, create_service))
+
+        self.ready_after = time.perf_counter() - self.started_at
+        WARMUP_SECONDS.labels(step="total").set(self.ready_after)
+        self.phase = "ready"
+        self.is_ready = True
+        logger.info(f"시작 준비 완료 : {self.stats()}")
+
+    @staticmethod
+    def _touch_grid_file(grid_file: GridFile) -> None:
+        """
+        격자 파일 전체를 한 번 읽어 페이지 캐시와 메모리 매핑 페이지를 채우는 메소드
+        """
+        region: np.ndarray | None = grid_file.get_region((1, grid.GRID_NX), (1, grid.GRID_NY))
+        if region is not None:
+            np.asarray(region).view(np.uint8).sum()
+
+    @staticmethod
+    async def _load_cells(
+        database: Database,
+        cells: list[tuple[int, int]],
+        nowcast_cache: CellCache | None,
+        forecast_cache: CellCache | None,
+        grid_file: GridFile | None,
+    ) -> None:
+        """
+        격자 목록의 초단기실황·예보를 배치 조회(격자 파일, 집계 쿼리 한 번)로 불러와 격자 캐시에 저장하는 메소드
+        """
+        batch: BatchWeatherService = BatchWeatherService(
+            database=database, coordinates=[], nowcast_cache=nowcast_cache, forecast_cache=forecast_cache, grid_file=grid_file
+        )
+        await asyncio.gather(batch.get_nowcasts(cells), batch.get_forecasts(cells))
+
+    @staticmethod
+    async def _request(cells: list[tuple[int, int]], create_service: Callable[[float, float], WeatherService]) -> None:
+        """
+        가장 요청이 많은 격자 중심(없으면 DEFAULT_COORDINATES)으로 요청 처리 경로 전체를 인코딩별로 한 번씩 실행하는 메소드
+        """
+        latitude, longitude = DEFAULT_COORDINATES
+        if cells:
+            latitudes, longitudes = grid.from_grid_batch(np.array([cells[0][0]]), np.array([cells[0][1]]))
+            latitude, longitude = float(latitudes[0]), float(longitudes[0])
+        for encoding in ("br", "gzip", "identity"):
+            await create_service(latitude, longitude).get_encoded_weather(encoding=encoding)
+
+    def stats(self) -> dict:
+        """
+        통계 반환 메소드
+        :return: dict
+        """
+        return {
+            "ready": self.is_ready,
+            "phase": self.phase,
+            "ready_after_seconds": self.ready_after,
+            "steps_seconds": self.steps,
+            "cells": self.cells,
+            "errors": self.errors,
+        }